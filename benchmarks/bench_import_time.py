@@ -0,0 +1,82 @@
+"""
+Benchmark package import time and guard against heavy dependencies being imported eagerly.
+
+Each module is imported in a fresh interpreter several times. The script exits
+with status 1 if a median import time exceeds --max-seconds, or if any of
+HEAVY_MODULES is loaded by the import, so it can run as a CI regression check.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --max-seconds 1.0 --runs 7
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "videoinstruct",
+    "videoinstruct.agents",
+    "videoinstruct.videoinstructor",
+    "videoinstruct.agents.ScreenshotAgent",
+]
+
+# Dependencies that must only be imported when the feature using them runs
+HEAVY_MODULES = [
+    "litellm",
+    "google.genai",
+    "google.generativeai",
+    "openai",
+    "moviepy",
+    "IPython",
+    "xhtml2pdf",
+    "PIL",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(module: str) -> dict:
+    """Import `module` in a fresh interpreter and return its import time and the heavy modules it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=1.5, help="Maximum median import time per module")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<40} {'median s':>9} {'max s':>7}  heavy modules loaded")
+    for module in MODULES:
+        samples = [measure(module) for _ in range(args.runs)]
+        seconds = [sample["seconds"] for sample in samples]
+        heavy = sorted({name for sample in samples for name in sample["heavy"]})
+        median = statistics.median(seconds)
+        print(f"{module:<40} {median:>9.3f} {max(seconds):>7.3f}  {', '.join(heavy) or '-'}")
+        if median > args.max_seconds or heavy:
+            failed = True
+
+    if failed:
+        print(f"\nFAILED: an import exceeded {args.max_seconds}s or loaded a heavy dependency eagerly")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Benchmark screenshot placeholder processing on documents with hundreds of placeholders.
+
+Compares the parse-once/render-once engine in videoinstruct.utils.placeholders
+with the previous approach of running per-placeholder regex searches and one
+`content.replace` per match, which is quadratic in document size x placeholder count.
+
+Usage:
+    python benchmarks/bench_placeholders.py --counts 100 300 1000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from videoinstruct.utils.placeholders import Placeholder, parse_placeholders, render_segments
+
+
+def build_document(placeholder_count: int) -> str:
+    """Build a markdown document with one step and one placeholder per section."""
+    sections = ["# Benchmark Guide\n"]
+    for idx in range(placeholder_count):
+        sections.append(
+            f"## Step {idx + 1}\n"
+            f"Click the button labelled 'Action {idx}' and wait for the dialog to open.\n"
+            "[SCREENSHOT_PLACEHOLDER]\n"
+            f"Name: step {idx} dialog\n"
+            f"Purpose: Shows the dialog opened in step {idx}\n"
+            f"Content: The dialog with the 'Action {idx}' options visible\n"
+            "Value: Helps the user confirm they opened the right dialog\n"
+            "[/SCREENSHOT_PLACEHOLDER]\n"
+        )
+    return "\n".join(sections)
+
+
+def process_with_replace(content: str) -> str:
+    """Previous approach: regex searches per placeholder and one content.replace per match."""
+    matches = re.findall(r'\[SCREENSHOT_PLACEHOLDER\](.*?)\[/SCREENSHOT_PLACEHOLDER\]', content, re.DOTALL)
+    for idx, placeholder_content in enumerate(matches):
+        name_match = re.search(r'Name:\s*(.*?)(?:\n|$)', placeholder_content)
+        purpose_match = re.search(r'Purpose:\s*(.*?)(?:\n|$)', placeholder_content)
+        content_match = re.search(r'Content:\s*(.*?)(?:\n|$)', placeholder_content)
+        value_match = re.search(r'Value:\s*(.*?)(?:\n|$)', placeholder_content)
+        description = " - ".join(m.group(1).strip() for m in (purpose_match, content_match, value_match) if m)
+        placeholder = f'[SCREENSHOT_PLACEHOLDER]{placeholder_content}[/SCREENSHOT_PLACEHOLDER]'
+        content = content.replace(placeholder, f'![{description}](screenshots/{name_match.group(1).strip()}.png)')
+    return content
+
+
+def process_with_segments(content: str) -> str:
+    """Parse-once/render-once engine."""
+    segments = parse_placeholders(content)
+    for segment in segments:
+        if isinstance(segment, Placeholder):
+            segment.replacement = f'![{segment.description}](screenshots/{segment.name}.png)'
+    return render_segments(segments)
+
+
+def time_call(function, content: str, repeats: int) -> float:
+    """Return the best wall-clock time of `repeats` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(content)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'placeholders':>12} {'doc KB':>8} {'replace ms':>11} {'segments ms':>12} {'speedup':>8}")
+    for count in args.counts:
+        document = build_document(count)
+        assert process_with_replace(document) == process_with_segments(document)
+        replace_ms = time_call(process_with_replace, document, args.repeats)
+        segments_ms = time_call(process_with_segments, document, args.repeats)
+        print(f"{count:>12} {len(document) / 1024:>8.1f} {replace_ms:>11.2f} {segments_ms:>12.2f} {replace_ms / segments_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
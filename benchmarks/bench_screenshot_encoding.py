@@ -0,0 +1,84 @@
+"""
+Benchmark screenshot encoding: bytes written and encode time per format.
+
+Frames are taken from a video when one is given, otherwise a synthetic 4K
+screen-recording-like frame (flat panels, text-like strokes and a photo area) is used.
+
+Usage:
+    python benchmarks/bench_screenshot_encoding.py
+    python benchmarks/bench_screenshot_encoding.py --video my_video.mp4 --times 5 30 60
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from videoinstruct.tools.video_screenshot import IMAGE_EXTENSIONS, VideoFrameReader, encode_screenshot
+
+# (label, encode_screenshot keyword arguments)
+ENCODINGS = [
+    ("png level 1", {"image_format": "png", "png_compress_level": 1}),
+    ("png level 6", {"image_format": "png", "png_compress_level": 6}),
+    ("png level 9", {"image_format": "png", "png_compress_level": 9}),
+    ("jpeg q85", {"image_format": "jpeg", "quality": 85}),
+    ("webp q80", {"image_format": "webp", "quality": 80}),
+    ("png level 6, 1920px", {"image_format": "png", "png_compress_level": 6, "max_width": 1920}),
+    ("jpeg q85, 1920px", {"image_format": "jpeg", "quality": 85, "max_width": 1920}),
+    ("webp q80, 1920px", {"image_format": "webp", "quality": 80, "max_width": 1920}),
+]
+
+
+def synthetic_frame(width: int = 3840, height: int = 2160, seed: int = 0) -> np.ndarray:
+    """Build a frame that compresses like a screen recording."""
+    rng = np.random.default_rng(seed)
+    frame = np.full((height, width, 3), 245, dtype=np.uint8)
+    frame[:, :width // 6] = (40, 44, 52)
+    frame[:height // 20] = (30, 90, 200)
+    # Rows of text-like strokes
+    for top in range(height // 10, height - 40, 36):
+        strokes = rng.random((18, width * 2 // 3)) < 0.25
+        frame[top:top + 18, width // 5:width // 5 + width * 2 // 3][strokes] = (20, 20, 20)
+    # A photo-like area
+    photo = rng.normal(128, 40, (height // 4, width // 4, 3)).clip(0, 255).astype(np.uint8)
+    frame[height // 2:height // 2 + height // 4, width * 2 // 3:width * 2 // 3 + width // 4] = photo
+    return frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--video", help="Video to take frames from")
+    parser.add_argument("--times", type=float, nargs="+", default=[5.0], help="Frame timestamps in seconds")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.video:
+        with VideoFrameReader(max_open=1) as reader:
+            frames = [frame for frame in reader.get_frames(args.video, args.times) if frame is not None]
+    else:
+        frames = [synthetic_frame()]
+    height, width = frames[0].shape[:2]
+    print(f"{len(frames)} frame(s) of {width}x{height}, best of {args.repeats} runs\n")
+
+    print(f"{'encoding':<22} {'KB/frame':>10} {'ms/frame':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for label, encoding in ENCODINGS:
+            output_path = os.path.join(temp_dir, f"frame.{IMAGE_EXTENSIONS[encoding['image_format']]}")
+            total_bytes = 0
+            best_seconds = float("inf")
+            for _ in range(args.repeats):
+                total_bytes = 0
+                start = time.perf_counter()
+                for frame in frames:
+                    encode_screenshot(frame, output_path, **encoding)
+                    total_bytes += os.path.getsize(output_path)
+                best_seconds = min(best_seconds, time.perf_counter() - start)
+            print(f"{label:<22} {total_bytes / len(frames) / 1024:>10.1f} {best_seconds / len(frames) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
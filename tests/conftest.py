@@ -0,0 +1,21 @@
+import subprocess
+
+import pytest
+
+
+def make_test_video(path, duration=3, size="320x240", rate=10):
+    """Render an ffmpeg test pattern clip, whose frames all differ, to `path`."""
+    from moviepy.config import FFMPEG_BINARY
+
+    subprocess.run(
+        [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-y",
+         "-f", "lavfi", "-i", f"testsrc=duration={duration}:size={size}:rate={rate}",
+         "-c:v", "libx264", "-g", str(rate), "-pix_fmt", "yuv420p", str(path)],
+        check=True
+    )
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def test_video(tmp_path_factory):
+    return make_test_video(tmp_path_factory.mktemp("videos") / "testsrc.mp4")
@@ -0,0 +1,200 @@
+"""
+In-process stand-in for the parts of the google-genai client used by VideoInterpreter.
+
+It lets the tests exercise the upload registry, context caching and retry
+logic without network access or an API key:
+
+    client = FakeGenaiClient(responses={"timestamp": "00:00:05"})
+    interpreter = VideoInterpreter(client=client)
+    interpreter.load_video("my_video.mp4")
+    assert client.files.upload_count == 1
+"""
+import datetime
+import functools
+import itertools
+import os
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+
+class FakeClientError(Exception):
+    """Raised for unknown files, mirroring the 404/403 errors of the real files API."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+
+class FakeFile:
+    """An uploaded file with the attributes VideoInterpreter reads."""
+
+    def __init__(self, name: str, display_name: str, size_bytes: int, lifetime: datetime.timedelta):
+        self.name = name
+        self.display_name = display_name
+        self.size_bytes = size_bytes
+        self.uri = f"https://fake.genai/{name}"
+        self.mime_type = "video/mp4"
+        self.create_time = datetime.datetime.now(datetime.timezone.utc)
+        self.expiration_time = self.create_time + lifetime
+        self.state = SimpleNamespace(name="PROCESSING")
+
+
+class FakeFiles:
+    """Fake `client.files`: upload, get, delete and list."""
+
+    def __init__(self, processing_polls: int = 0, lifetime: datetime.timedelta = datetime.timedelta(hours=48)):
+        self.processing_polls = processing_polls
+        self.lifetime = lifetime
+        self.upload_count = 0
+        self._files: Dict[str, FakeFile] = {}
+        self._polls: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+
+    def upload(self, file: str, **kwargs: Any) -> FakeFile:
+        """Store a file; it stays PROCESSING for `processing_polls` calls to `get`."""
+        uploaded = FakeFile(
+            name=f"files/fake-{next(self._ids)}",
+            display_name=os.path.basename(file),
+            size_bytes=os.path.getsize(file),
+            lifetime=self.lifetime
+        )
+        self.upload_count += 1
+        self._files[uploaded.name] = uploaded
+        self._polls[uploaded.name] = 0
+        self._advance(uploaded)
+        return uploaded
+
+    def get(self, name: str, **kwargs: Any) -> FakeFile:
+        if name not in self._files:
+            raise FakeClientError(404, f"File {name} not found")
+        self._polls[name] += 1
+        self._advance(self._files[name])
+        return self._files[name]
+
+    def delete(self, name: str, **kwargs: Any) -> None:
+        if self._files.pop(name, None) is None:
+            raise FakeClientError(404, f"File {name} not found")
+
+    def list(self, **kwargs: Any) -> List[FakeFile]:
+        return list(self._files.values())
+
+    def expire(self, name: str) -> None:
+        """Drop a file as if its lifetime had run out on the server."""
+        self._files.pop(name, None)
+
+    def _advance(self, uploaded: FakeFile) -> None:
+        if uploaded.state.name == "PROCESSING" and self._polls[uploaded.name] >= self.processing_polls:
+            uploaded.state = SimpleNamespace(name="ACTIVE")
+
+
+class FakeCachedContent:
+    """A context cache entry with the attributes VideoInterpreter reads."""
+
+    def __init__(self, name: str, model: str, display_name: Optional[str], contents: List[Any], ttl_seconds: float):
+        self.name = name
+        self.model = model
+        self.display_name = display_name
+        self.contents = contents
+        self.create_time = datetime.datetime.now(datetime.timezone.utc)
+        self.expire_time = self.create_time + datetime.timedelta(seconds=ttl_seconds)
+
+
+def _ttl_seconds(config: Any) -> float:
+    """Read a TTL such as "3600s" from a cache config object or dict, defaulting to one hour."""
+    ttl = config.get("ttl") if isinstance(config, dict) else getattr(config, "ttl", None)
+    return float(str(ttl).rstrip("s")) if ttl else 3600.0
+
+
+class FakeCaches:
+    """Fake `client.caches`: create, get, update, delete and list context caches."""
+
+    def __init__(self):
+        self.create_count = 0
+        self.update_count = 0
+        self._caches: Dict[str, FakeCachedContent] = {}
+        self._ids = itertools.count(1)
+
+    def create(self, model: str, config: Any = None, **kwargs: Any) -> FakeCachedContent:
+        config = config or {}
+        read = config.get if isinstance(config, dict) else functools.partial(getattr, config)
+        contents = list(read("contents", None) or [])
+        if read("system_instruction", None):
+            contents.append(read("system_instruction", None))
+        cache = FakeCachedContent(
+            name=f"cachedContents/fake-{next(self._ids)}",
+            model=model,
+            display_name=read("display_name", None),
+            contents=contents,
+            ttl_seconds=_ttl_seconds(config)
+        )
+        self.create_count += 1
+        self._caches[cache.name] = cache
+        return cache
+
+    def get(self, name: str, **kwargs: Any) -> FakeCachedContent:
+        cache = self._caches.get(name)
+        if cache is None or cache.expire_time <= datetime.datetime.now(datetime.timezone.utc):
+            self._caches.pop(name, None)
+            raise FakeClientError(403, f"CachedContent {name} not found (or permission denied)")
+        return cache
+
+    def update(self, name: str, config: Any = None, **kwargs: Any) -> FakeCachedContent:
+        cache = self.get(name)
+        cache.expire_time = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=_ttl_seconds(config or {}))
+        self.update_count += 1
+        return cache
+
+    def delete(self, name: str, **kwargs: Any) -> None:
+        if self._caches.pop(name, None) is None:
+            raise FakeClientError(404, f"CachedContent {name} not found")
+
+    def list(self, **kwargs: Any) -> List[FakeCachedContent]:
+        return list(self._caches.values())
+
+    def expire(self, name: str) -> None:
+        """Drop a cache as if its TTL had run out on the server."""
+        self._caches.pop(name, None)
+
+
+class FakeModels:
+    """Fake `client.models`: answers with the first canned response whose key occurs in the prompt."""
+
+    def __init__(
+        self,
+        responses: Optional[Dict[str, str]] = None,
+        default_response: str = "screenshot_not_available",
+        caches: Optional[FakeCaches] = None
+    ):
+        self.responses = responses or {}
+        self.default_response = default_response
+        self.caches = caches
+        # Every generate_content call as (model, contents, config)
+        self.calls: List[Any] = []
+
+    def generate_content(self, model: str, contents: Any, config: Any = None, **kwargs: Any) -> SimpleNamespace:
+        self.calls.append((model, contents, config))
+        contents = list(contents) if isinstance(contents, list) else [contents]
+        cached_content = getattr(config, "cached_content", None)
+        if cached_content is not None:
+            # Requests against a cache see its contents as a prefix of the prompt
+            contents = self.caches.get(cached_content).contents + contents
+        prompt = " ".join(str(part) for part in contents)
+        for key, text in self.responses.items():
+            if key in prompt:
+                return SimpleNamespace(text=text)
+        return SimpleNamespace(text=self.default_response)
+
+
+class FakeGenaiClient:
+    """Fake `google.genai.Client` exposing `files`, `caches` and `models`."""
+
+    def __init__(
+        self,
+        responses: Optional[Dict[str, str]] = None,
+        processing_polls: int = 0,
+        lifetime: datetime.timedelta = datetime.timedelta(hours=48)
+    ):
+        self.files = FakeFiles(processing_polls=processing_polls, lifetime=lifetime)
+        self.caches = FakeCaches()
+        self.models = FakeModels(responses=responses, caches=self.caches)
@@ -0,0 +1,40 @@
+import pytest
+from pydantic import ValidationError
+
+from videoinstruct.configs import ScreenshotAgentConfig, VideoInterpreterConfig
+
+
+def test_image_format_accepts_supported_formats():
+    for image_format in ("png", "jpeg", "webp"):
+        assert ScreenshotAgentConfig(image_format=image_format).image_format == image_format
+
+
+def test_image_format_rejects_unsupported_formats():
+    with pytest.raises(ValidationError):
+        ScreenshotAgentConfig(image_format="gif")
+
+
+@pytest.mark.parametrize("field, value", [
+    ("image_quality", 0),
+    ("image_quality", 101),
+    ("png_compress_level", -1),
+    ("png_compress_level", 10),
+])
+def test_encoding_settings_reject_out_of_range_values(field, value):
+    with pytest.raises(ValidationError):
+        ScreenshotAgentConfig(**{field: value})
+
+
+def test_encoding_settings_accept_their_bounds():
+    config = ScreenshotAgentConfig(image_quality=1, png_compress_level=9)
+
+    assert (config.image_quality, config.png_compress_level) == (1, 9)
+    assert ScreenshotAgentConfig(image_quality=100, png_compress_level=0).image_quality == 100
+
+
+def test_contact_sheet_query_types_are_validated():
+    config = VideoInterpreterConfig(contact_sheet_query_types=["description", "timestamp"])
+
+    assert config.contact_sheet_query_types == ["description", "timestamp"]
+    with pytest.raises(ValidationError):
+        VideoInterpreterConfig(contact_sheet_query_types=["summary"])
@@ -0,0 +1,96 @@
+from videoinstruct.utils.conversation_memory import (
+    SUMMARY_PREFIX,
+    ConversationMemory,
+    estimate_tokens,
+    summarize_turn,
+)
+
+
+def _word_count(text):
+    return len(text.split())
+
+
+def test_summarize_turn_keeps_role_and_first_sentence():
+    assert summarize_turn("assistant: The page opens at 00:42. Then the user scrolls.") == "assistant: The page opens at 00:42."
+    assert summarize_turn("no role here") == "no role here"
+    assert summarize_turn("user: " + "word " * 50, max_words=3) == "user: word word word ..."
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_without_budget_nothing_is_compacted():
+    memory = ConversationMemory(token_budget=None, keep_recent_turns=1)
+    for idx in range(20):
+        memory.append(f"user: question {idx}")
+
+    assert len(memory.turns) == 20
+    assert memory.summary_lines == []
+    assert memory.stats()["prompt_tokens"] is None
+    assert memory.render() == ", ".join(f"user: question {idx}" for idx in range(20))
+
+
+def test_old_turns_are_summarized_within_budget():
+    memory = ConversationMemory(token_budget=40, keep_recent_turns=2, token_counter=_word_count)
+    turns = [f"user: question number {idx} is here. It has a second sentence." for idx in range(6)]
+    for turn in turns:
+        memory.append(turn)
+
+    assert memory.turns == turns[-2:]
+    assert memory.prompt_tokens() <= 40
+    assert memory.summary_lines[-1] == "user: question number 3 is here."
+    rendered = memory.render()
+    assert rendered.startswith(SUMMARY_PREFIX)
+    assert rendered.endswith(", ".join(turns[-2:]))
+
+
+def test_recent_turns_are_kept_even_over_budget():
+    memory = ConversationMemory(token_budget=5, keep_recent_turns=2, token_counter=_word_count)
+    memory.append("user: " + "long " * 20)
+    memory.append("assistant: " + "long " * 20)
+
+    assert len(memory.turns) == 2
+    assert memory.summary_lines == []
+
+
+def test_oldest_summary_lines_are_dropped_when_the_summary_does_not_fit():
+    memory = ConversationMemory(
+        token_budget=12, keep_recent_turns=1, token_counter=_word_count, summarizer=lambda turn: turn
+    )
+    for idx in range(10):
+        memory.append(f"user: turn {idx}")
+
+    stats = memory.stats()
+    assert memory.prompt_tokens() <= 12
+    assert stats["summarized_turns"] == 9
+    assert stats["dropped_summary_lines"] > 0
+    assert memory.summary_lines[-1] == "user: turn 8"
+
+
+def test_render_records_tokens_sent_and_saved():
+    memory = ConversationMemory(token_budget=10, keep_recent_turns=1, token_counter=_word_count,
+                                summarizer=lambda turn: "s")
+    for idx in range(5):
+        memory.append(f"user: a b c {idx}")
+    memory.render()
+
+    stats = memory.stats()
+    assert stats["tokens_sent"] == memory.prompt_tokens()
+    assert stats["tokens_saved"] == memory.full_tokens - memory.prompt_tokens()
+    assert stats["tokens_saved"] > 0
+
+
+def test_clear_keeps_cumulative_metrics():
+    memory = ConversationMemory(token_budget=100, token_counter=_word_count)
+    memory.append("user: hello there")
+    memory.render()
+    sent = memory.tokens_sent
+
+    memory.clear()
+
+    assert memory.turns == [] and memory.summary_lines == []
+    assert memory.render() == ""
+    assert memory.tokens_sent == sent
@@ -0,0 +1,102 @@
+import json
+import threading
+
+from videoinstruct.utils.journaled_cache import JournaledCache
+
+
+def test_changes_persist_after_flush(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = JournaledCache(path)
+    cache["a"] = "1"
+    cache["b"] = "2"
+    del cache["a"]
+    cache.flush()
+
+    assert dict(JournaledCache(path)) == {"b": "2"}
+
+
+def test_unflushed_changes_are_not_persisted(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = JournaledCache(path)
+    cache["a"] = "1"
+
+    assert dict(JournaledCache(path)) == {}
+
+
+def test_flush_appends_to_journal_until_compaction(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = JournaledCache(str(path), compact_after=3)
+    for idx in range(3):
+        cache[f"key{idx}"] = idx
+        cache.flush()
+
+    assert not path.exists()
+    assert len((tmp_path / "cache.json.journal").read_text().splitlines()) == 3
+
+    cache["key3"] = 3
+    cache.flush()
+
+    assert json.loads(path.read_text()) == {"key0": 0, "key1": 1, "key2": 2, "key3": 3}
+    assert (tmp_path / "cache.json.journal").read_text() == ""
+    assert dict(JournaledCache(str(path))) == dict(cache)
+
+
+def test_flush_merges_other_writers(tmp_path):
+    path = str(tmp_path / "cache.json")
+    first = JournaledCache(path)
+    second = JournaledCache(path)
+    first["shared"] = "first"
+    first["only_first"] = 1
+    second["shared"] = "second"
+    second["only_second"] = 2
+
+    first.flush()
+    second.flush()
+    first.flush()
+
+    # The last flush of a key wins
+    expected = {"shared": "second", "only_first": 1, "only_second": 2}
+    assert dict(first) == expected
+    assert dict(second) == expected
+
+
+def test_torn_journal_line_is_skipped(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = JournaledCache(path)
+    cache["a"] = "1"
+    cache.flush()
+    with open(f"{path}.journal", "a") as f:
+        f.write('{"key": "b", "val')
+
+    reloaded = JournaledCache(path)
+    assert dict(reloaded) == {"a": "1"}
+
+    reloaded["c"] = "3"
+    reloaded.flush()
+    assert dict(JournaledCache(path)) == {"a": "1", "c": "3"}
+
+
+def test_plain_json_snapshot_loads(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text(json.dumps({"legacy": "value"}))
+
+    assert dict(JournaledCache(str(path))) == {"legacy": "value"}
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    path = str(tmp_path / "cache.json")
+    writers, keys_per_writer = 8, 25
+
+    def write(writer):
+        cache = JournaledCache(path, compact_after=10)
+        for idx in range(keys_per_writer):
+            cache[f"{writer}-{idx}"] = idx
+            cache.flush()
+
+    threads = [threading.Thread(target=write, args=(writer,)) for writer in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(JournaledCache(path)) == writers * keys_per_writer
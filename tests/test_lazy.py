@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+from videoinstruct.utils.lazy import lazy_module_attrs
+
+
+def test_attributes_are_imported_on_first_access(monkeypatch):
+    package = types.ModuleType("lazy_package")
+    monkeypatch.setitem(sys.modules, "lazy_package", package)
+    package.__getattr__, package.__dir__ = lazy_module_attrs("lazy_package", {"OrderedDict": "collections"})
+
+    value = package.__getattr__("OrderedDict")
+
+    assert value is sys.modules["collections"].OrderedDict
+    assert vars(package)["OrderedDict"] is value
+    assert "OrderedDict" in package.__dir__()
+    with pytest.raises(AttributeError):
+        package.__getattr__("missing")
+
+
+def test_importing_the_package_loads_no_heavy_dependency():
+    probe = (
+        "import sys, videoinstruct, videoinstruct.agents; "
+        "print([name for name in ('PIL', 'moviepy', 'litellm', 'google.genai') if name in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+
+    assert result.stdout.strip() == "[]"
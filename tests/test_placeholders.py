@@ -0,0 +1,80 @@
+from videoinstruct.utils.placeholders import (
+    Placeholder,
+    move_images_out_of_code_blocks,
+    parse_placeholders,
+    render_segments,
+)
+
+
+DOCUMENT = """# Setup
+
+Open the app.
+
+[SCREENSHOT_PLACEHOLDER]
+Name: Home screen
+Purpose: Show where to start
+Content: The home screen with the sidebar open
+Value: Orients the reader
+[/SCREENSHOT_PLACEHOLDER]
+
+Then click Settings.
+[SCREENSHOT_PLACEHOLDER]
+Name: Home screen
+[/SCREENSHOT_PLACEHOLDER]
+"""
+
+
+def test_unmodified_document_round_trips():
+    segments = parse_placeholders(DOCUMENT)
+
+    assert render_segments(segments) == DOCUMENT
+    assert sum(isinstance(segment, Placeholder) for segment in segments) == 2
+
+
+def test_document_without_placeholders_round_trips():
+    assert render_segments(parse_placeholders("plain text")) == "plain text"
+    assert parse_placeholders("") == []
+
+
+def test_fields_are_parsed():
+    first, second = [segment for segment in parse_placeholders(DOCUMENT) if isinstance(segment, Placeholder)]
+
+    assert first.name == "Home screen"
+    assert first.purpose == "Show where to start"
+    assert first.content == "The home screen with the sidebar open"
+    assert first.value == "Orients the reader"
+    assert first.has_additional_content
+    assert first.description == "Show where to start - The home screen with the sidebar open - Orients the reader"
+    assert second.name == "Home screen"
+    assert not second.has_additional_content
+    assert second.description == "Home screen"
+
+
+def test_signature_changes_with_any_field():
+    original = Placeholder("", "Name: A\nPurpose: B\n")
+    edited = Placeholder("", "Name: A\nPurpose: C\n")
+
+    assert original.signature == ("A", "B", "", "")
+    assert original.signature != edited.signature
+
+
+def test_replacements_are_rendered_in_place():
+    segments = parse_placeholders(DOCUMENT)
+    first, second = [segment for segment in segments if isinstance(segment, Placeholder)]
+    first.replacement = "![home](screenshots/home.png)"
+    second.replacement = ""
+
+    rendered = render_segments(segments)
+
+    assert "SCREENSHOT_PLACEHOLDER" not in rendered
+    assert "Open the app.\n\n![home](screenshots/home.png)\n\nThen click Settings.\n\n" in rendered
+
+
+def test_images_are_moved_out_of_code_blocks():
+    markdown = "```\ncode\n![shot](a.png)\n```\n"
+
+    moved = move_images_out_of_code_blocks(markdown)
+
+    assert "![shot](a.png)" in moved
+    code_block = moved[moved.index("```"):moved.rindex("```") + 3]
+    assert "![shot](a.png)" not in code_block
@@ -0,0 +1,185 @@
+import os
+
+from PIL import Image
+
+import videoinstruct.agents.ScreenshotAgent as screenshot_agent_module
+from videoinstruct.agents.ScreenshotAgent import ScreenshotAgent
+from videoinstruct.configs import ScreenshotAgentConfig
+
+
+DOCUMENT = """# Guide
+
+[SCREENSHOT_PLACEHOLDER]
+Name: Settings page
+Purpose: Show the settings page
+Content: The settings page with the theme toggle
+[/SCREENSHOT_PLACEHOLDER]
+"""
+
+
+class StubInterpreter:
+    """Answers every timestamp query with the next queued answer, raising queued exceptions."""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.queries = 0
+        self.route_queries = []
+
+    def query(self, question, query_type="question", route_queries=None):
+        self.queries += 1
+        self.route_queries.append(route_queries)
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+def _make_agent(tmp_path, interpreter):
+    config = ScreenshotAgentConfig(use_transcript_resolver=False)
+    return ScreenshotAgent(config=config, video_interpreter=interpreter, output_dir=str(tmp_path / "output"))
+
+
+def _write_document(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text(DOCUMENT)
+    return str(path)
+
+
+def test_explicit_not_available_is_cached(tmp_path):
+    interpreter = StubInterpreter(["screenshot_not_available"])
+    agent = _make_agent(tmp_path, interpreter)
+    document = _write_document(tmp_path)
+
+    agent.process_markdown_file(document)
+    agent.process_markdown_file(document)
+
+    assert interpreter.queries == 1
+    assert agent.unavailable_screenshots == ["Settings page"]
+
+
+def test_failed_lookup_is_retried(tmp_path):
+    interpreter = StubInterpreter([RuntimeError("quota exceeded"), "screenshot_not_available"])
+    agent = _make_agent(tmp_path, interpreter)
+    document = _write_document(tmp_path)
+
+    with open(agent.process_markdown_file(document)) as f:
+        assert "SCREENSHOT_PLACEHOLDER" not in f.read()
+    assert not agent.placeholder_resolutions
+
+    agent.process_markdown_file(document)
+    assert interpreter.queries == 2
+
+
+def test_unparsable_answer_is_retried(tmp_path):
+    interpreter = StubInterpreter(["I am not sure", "screenshot_not_available"])
+    agent = _make_agent(tmp_path, interpreter)
+    document = _write_document(tmp_path)
+
+    agent.process_markdown_file(document)
+    agent.process_markdown_file(document)
+
+    assert interpreter.queries == 2
+
+
+def test_missing_interpreter_is_not_cached(tmp_path):
+    agent = _make_agent(tmp_path, None)
+
+    agent.process_markdown_file(_write_document(tmp_path))
+
+    assert not agent.placeholder_resolutions
+    assert agent.unavailable_screenshots == ["Settings page"]
+
+
+def test_failed_screenshot_removes_deferred_placeholders(tmp_path):
+    interpreter = StubInterpreter(["00:00:05"])
+    agent = _make_agent(tmp_path, interpreter)
+    agent.take_screenshots = lambda requests: [None] * len(requests)
+    path = tmp_path / "doc.md"
+    path.write_text(DOCUMENT + "\nLater:\n" + DOCUMENT.split("\n", 2)[2])
+
+    with open(agent.process_markdown_file(str(path))) as f:
+        assert "SCREENSHOT_PLACEHOLDER" not in f.read()
+    assert agent.unavailable_screenshots == ["Settings page", "Settings page"]
+
+
+def test_one_bad_placeholder_does_not_abort_the_file(tmp_path):
+    interpreter = StubInterpreter(["00:00:05", "00:00:09"])
+    agent = _make_agent(tmp_path, interpreter)
+    agent.config.batch_timestamp_queries = False
+    screenshot = tmp_path / "shot.png"
+    screenshot.write_bytes(b"png")
+    agent.take_screenshots = lambda requests: [str(screenshot)] * len(requests)
+    snap = agent._snap_to_stable_frame
+
+    def failing_snap(timestamp_seconds):
+        if timestamp_seconds == 5:
+            raise RuntimeError("decoder failed")
+        return snap(timestamp_seconds)
+
+    agent._snap_to_stable_frame = failing_snap
+    path = tmp_path / "doc.md"
+    path.write_text(DOCUMENT + DOCUMENT.split("\n", 2)[2].replace("Settings page", "Theme toggle"))
+
+    enhanced_path = agent.process_markdown_file(str(path))
+
+    assert enhanced_path != str(path)
+    with open(enhanced_path) as f:
+        content = f.read()
+    assert "SCREENSHOT_PLACEHOLDER" not in content
+    assert content.count("](shot.png)") == 1
+    assert agent.unavailable_screenshots == ["Settings page"]
+
+
+def _fake_save_screenshots(colors):
+    """Return a save_screenshots replacement writing a solid image per timestamp."""
+    def save_screenshots(video_path, jobs, **kwargs):
+        for timestamp_seconds, output_paths in jobs:
+            for output_path in output_paths:
+                Image.new("RGB", (64, 64), colors[timestamp_seconds]).save(output_path)
+        return {}
+    return save_screenshots
+
+
+def test_dedupe_is_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(screenshot_agent_module, "save_screenshots", _fake_save_screenshots({1: "red", 2: "red"}))
+    agent = _make_agent(tmp_path, None)
+
+    paths = agent.take_screenshots([(1, "first"), (2, "second")])
+
+    assert paths[0] != paths[1]
+    assert all(os.path.exists(path) for path in paths)
+
+
+def test_dedupe_only_collapses_files_written_by_the_call(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        screenshot_agent_module, "save_screenshots", _fake_save_screenshots({1: "red", 2: "red", 3: "blue"})
+    )
+    agent = _make_agent(tmp_path, None)
+    agent.config.dedupe_screenshots = True
+
+    earlier_path = agent.take_screenshots([(1, "earlier")])[0]
+    first, second, third = agent.take_screenshots([(1, "first"), (2, "second"), (3, "third")])
+
+    # The screenshot of an earlier call is kept even though it looks the same
+    assert os.path.exists(earlier_path)
+    assert second == first
+    assert third != first
+    assert os.path.exists(first) and os.path.exists(third)
+    assert len(os.listdir(os.path.join(agent.output_dir, "screenshots"))) == 3
+
+
+def test_batched_lookup_routes_each_description(tmp_path):
+    interpreter = StubInterpreter(['{"settings_page": "00:00:05", "theme_toggle": "00:00:09"}'])
+    agent = _make_agent(tmp_path, interpreter)
+    agent.take_screenshots = lambda requests: [None] * len(requests)
+    path = tmp_path / "doc.md"
+    second = DOCUMENT.split("\n", 2)[2].replace("Settings page", "Theme toggle").replace("settings page", "theme toggle")
+    path.write_text(DOCUMENT + second)
+
+    agent.process_markdown_file(str(path))
+
+    assert interpreter.queries == 1
+    assert interpreter.route_queries == [[
+        "Show the settings page - The settings page with the theme toggle",
+        "Show the theme toggle - The theme toggle with the theme toggle",
+    ]]
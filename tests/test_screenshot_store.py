@@ -0,0 +1,102 @@
+import os
+import threading
+
+import pytest
+
+from videoinstruct.tools.screenshot_store import ScreenshotStore, fcntl
+
+
+def _write_image(path, size):
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+    return path
+
+
+def test_put_and_link_into_round_trip(tmp_path):
+    store = ScreenshotStore(root_dir=str(tmp_path / "store"))
+    key = store.make_key("video", 12, {"format": "png"})
+    source = _write_image(str(tmp_path / "source.png"), 100)
+
+    store.put(key, source)
+    destination = str(tmp_path / "copy.png")
+
+    assert store.link_into(key, destination)
+    with open(source, "rb") as original, open(destination, "rb") as linked:
+        assert original.read() == linked.read()
+
+
+def test_miss_returns_false(tmp_path):
+    store = ScreenshotStore(root_dir=str(tmp_path / "store"))
+
+    assert store.get("missing") is None
+    assert not store.link_into("missing", str(tmp_path / "out.png"))
+
+
+def test_make_key_depends_on_encoding():
+    assert ScreenshotStore.make_key("video", 1, {"format": "png"}) != ScreenshotStore.make_key(
+        "video", 1, {"format": "jpeg"}
+    )
+
+
+def test_flush_evicts_least_recently_used(tmp_path):
+    store = ScreenshotStore(root_dir=str(tmp_path / "store"), max_bytes=250)
+    keys = [store.make_key("video", second, {}) for second in range(3)]
+    for second, key in enumerate(keys):
+        store.put(key, _write_image(str(tmp_path / f"{second}.png"), 100))
+        store._entries[key]["last_access"] = second
+
+    # Touching the oldest image makes the second one the least recently used
+    store.get(keys[0])
+    store.flush()
+
+    assert store.total_bytes() <= 250
+    assert store.get(keys[0]) is not None
+    assert store.get(keys[1]) is None
+    assert store.get(keys[2]) is not None
+    assert not os.path.exists(os.path.join(store.root_dir, f"{keys[1]}.png"))
+
+
+def test_index_persists_across_instances(tmp_path):
+    root_dir = str(tmp_path / "store")
+    store = ScreenshotStore(root_dir=root_dir)
+    key = store.make_key("video", 5, {})
+    store.put(key, _write_image(str(tmp_path / "source.png"), 10))
+    store.flush()
+
+    assert ScreenshotStore(root_dir=root_dir).get(key) is not None
+
+
+@pytest.mark.skipif(fcntl is None, reason="file locks need fcntl")
+def test_flush_waits_for_the_store_lock(tmp_path):
+    root_dir = str(tmp_path / "store")
+    store = ScreenshotStore(root_dir=root_dir)
+    key = store.make_key("video", 5, {})
+    store.put(key, _write_image(str(tmp_path / "source.png"), 10))
+
+    # Another session holds the lock while it rewrites the index
+    with open(store.lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        flusher = threading.Thread(target=store.flush)
+        flusher.start()
+        flusher.join(timeout=0.3)
+        assert flusher.is_alive()
+        assert not os.path.exists(store.index_path)
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    flusher.join(timeout=5)
+
+    assert ScreenshotStore(root_dir=root_dir).get(key) is not None
+
+
+def test_concurrent_sessions_keep_each_others_entries(tmp_path):
+    root_dir = str(tmp_path / "store")
+    first, second = ScreenshotStore(root_dir=root_dir), ScreenshotStore(root_dir=root_dir)
+    first_key, second_key = first.make_key("video", 1, {}), second.make_key("video", 2, {})
+    first.put(first_key, _write_image(str(tmp_path / "first.png"), 10))
+    second.put(second_key, _write_image(str(tmp_path / "second.png"), 10))
+
+    first.flush()
+    second.flush()
+
+    reloaded = ScreenshotStore(root_dir=root_dir)
+    assert reloaded.get(first_key) is not None
+    assert reloaded.get(second_key) is not None
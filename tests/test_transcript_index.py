@@ -0,0 +1,64 @@
+from videoinstruct.tools.transcript_index import TranscriptIndex, TranscriptSegment, parse_transcript, tokenize
+
+
+TRANSCRIPTION = """[0:00:00]Welcome to this tutorial about the photo editor.
+[0:00:20]Open the export dialog from the file menu and choose a format.
+[0:00:40]Now we crop the picture with the crop tool.
+[0:01:00]Adjust the brightness slider until the sky looks right.
+[0:01:20]Finally we save the project.
+"""
+
+
+def test_parse_transcript_spans():
+    segments = parse_transcript(TRANSCRIPTION)
+
+    assert [segment.start_seconds for segment in segments] == [0, 20, 40, 60, 80]
+    assert segments[1].end_seconds == 40
+    # The last segment lasts as long as the one before it
+    assert segments[-1].end_seconds == 100
+
+
+def test_tokenize_drops_stopwords_and_stems():
+    assert tokenize("The user is clicking the Buttons") == ["click", "button"]
+
+
+def test_resolve_returns_middle_of_unambiguous_match():
+    index = TranscriptIndex.from_transcription(TRANSCRIPTION)
+
+    assert index.resolve("Export dialog with a format chosen", min_score=1.0) == 30
+
+
+def test_resolve_rejects_weak_match():
+    index = TranscriptIndex.from_transcription(TRANSCRIPTION)
+
+    assert index.resolve("Export dialog", min_score=100.0) is None
+    assert index.resolve("completely unrelated words", min_score=0.1) is None
+
+
+def test_resolve_rejects_match_without_margin():
+    index = TranscriptIndex([
+        TranscriptSegment(0, 10, "Open the settings dialog"),
+        TranscriptSegment(100, 110, "Open the settings dialog again"),
+        TranscriptSegment(200, 210, "Something else entirely"),
+    ])
+
+    assert index.resolve("settings dialog", min_score=0.1, min_margin=1.5) is None
+    assert index.resolve("settings dialog", min_score=0.1, min_margin=1.0) is not None
+
+
+def test_resolve_ignores_neighbouring_segments():
+    index = TranscriptIndex([
+        TranscriptSegment(0, 5, "Open the settings dialog"),
+        TranscriptSegment(5, 10, "The settings dialog lists every option"),
+        TranscriptSegment(200, 210, "Something else entirely"),
+    ])
+
+    assert index.resolve("settings dialog", min_score=0.1, min_margin=1.5, neighbor_seconds=10) is not None
+    assert index.resolve("settings dialog", min_score=0.1, min_margin=1.5, neighbor_seconds=0) is None
+
+
+def test_empty_index():
+    index = TranscriptIndex([])
+
+    assert index.search("anything") == []
+    assert index.resolve("anything") is None
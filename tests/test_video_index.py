@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+
+from videoinstruct.tools.video_index import VideoIndex
+
+
+def test_find_stable_time_moves_to_the_first_settled_second():
+    index = VideoIndex([0.0], [0.0, 0.01, 0.5, 0.3, 0.01, 0.0])
+
+    assert index.find_stable_time(1) == 1
+    assert index.find_stable_time(2) == 4
+    assert index.find_stable_time(2, max_shift=1) == 3
+    assert index.find_stable_time(10) == 10
+
+
+def test_find_stable_time_stops_at_the_end_of_the_signal():
+    index = VideoIndex([0.0], [0.0, 0.6, 0.4])
+
+    assert index.find_stable_time(1) == 2
+
+
+def test_has_keyframe_between_excludes_the_start():
+    index = VideoIndex([0.0, 2.0, 4.0], [])
+
+    assert index.has_keyframe_between(1.0, 2.0)
+    assert not index.has_keyframe_between(2.0, 3.9)
+    assert index.has_keyframe_between(-1.0, 0.0)
+    assert not index.has_keyframe_between(4.0, 10.0)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = VideoIndex([0.0, 1.5], [0.0, 0.123456, 0.5])
+    index_path = str(tmp_path / "nested" / "index.json")
+
+    index.save(index_path)
+    loaded = VideoIndex.load(index_path)
+
+    assert loaded.keyframes == [0.0, 1.5]
+    assert loaded.frame_differences.tolist() == [0.0, float(np.float32(0.12346)), 0.5]
+    assert os.listdir(tmp_path / "nested") == ["index.json"]
+
+
+def test_load_or_build_reuses_the_saved_index(test_video, tmp_path):
+    index_dir = str(tmp_path / "indexes")
+
+    built = VideoIndex.load_or_build(test_video, index_dir=index_dir)
+    loaded = VideoIndex.load_or_build(test_video, index_dir=index_dir)
+
+    assert built.keyframes[:3] == [0.0, 1.0, 2.0]
+    assert len(built.frame_differences) == 3
+    assert loaded.keyframes == built.keyframes
+    assert np.allclose(loaded.frame_differences, built.frame_differences, atol=1e-5)
+    assert len(os.listdir(index_dir)) == 1
@@ -0,0 +1,452 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from tests.fake_genai import FakeClientError, FakeGenaiClient
+from videoinstruct.agents.VideoInterpreter import VideoInterpreter
+from videoinstruct.configs import VideoInterpreterConfig
+from videoinstruct.utils.hashing import file_content_hash
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"not really a video" * 100)
+    return str(path)
+
+
+@pytest.fixture
+def make_interpreter(tmp_path):
+    def make(client, **config):
+        config.setdefault("upload_registry_path", str(tmp_path / "uploads.json"))
+        config.setdefault("poll_initial_interval", 0.001)
+        config.setdefault("poll_max_interval", 0.001)
+        return VideoInterpreter(config=VideoInterpreterConfig(api_key="test-key", **config), client=client)
+    return make
+
+
+def test_second_session_reuses_the_upload(make_interpreter, video_path):
+    client = FakeGenaiClient()
+    first = make_interpreter(client)
+    first.load_video(video_path)
+    second = make_interpreter(client)
+    second.load_video(video_path)
+
+    assert client.files.upload_count == 1
+    assert second.video_file.name == first.video_file.name
+
+
+def test_reuse_can_be_disabled(make_interpreter, video_path):
+    client = FakeGenaiClient()
+    make_interpreter(client, reuse_uploads=False).load_video(video_path)
+    make_interpreter(client, reuse_uploads=False).load_video(video_path)
+
+    assert client.files.upload_count == 2
+
+
+def test_upload_close_to_expiry_is_not_reused(make_interpreter, video_path):
+    client = FakeGenaiClient(lifetime=datetime.timedelta(minutes=30))
+    make_interpreter(client).load_video(video_path)
+    make_interpreter(client).load_video(video_path)
+
+    assert client.files.upload_count == 2
+
+
+def test_upload_gone_from_server_is_uploaded_again(make_interpreter, video_path):
+    client = FakeGenaiClient()
+    first = make_interpreter(client)
+    first.load_video(video_path)
+    client.files.expire(first.video_file.name)
+
+    second = make_interpreter(client)
+    second.load_video(video_path)
+
+    assert client.files.upload_count == 2
+    assert second.video_file.name != first.video_file.name
+    # The registry now points at the new upload
+    make_interpreter(client).load_video(video_path)
+    assert client.files.upload_count == 2
+
+
+def test_async_load_reuses_the_upload(make_interpreter, video_path):
+    client = FakeGenaiClient()
+    make_interpreter(client).load_video(video_path)
+    interpreter = make_interpreter(client)
+    interpreter.load_video_in_background(video_path).result()
+
+    assert client.files.upload_count == 1
+    assert interpreter.video_file.state.name == "ACTIVE"
+
+
+def test_delete_video_deletes_own_upload(make_interpreter, video_path):
+    client = FakeGenaiClient()
+    interpreter = make_interpreter(client)
+    interpreter.load_video(video_path)
+    name = interpreter.video_file.name
+
+    interpreter.delete_video()
+
+    assert client.files.list() == []
+    assert interpreter.video_file is None
+    # The registry no longer offers the deleted file
+    make_interpreter(client).load_video(video_path)
+    assert client.files.upload_count == 2
+    assert name not in [file.name for file in client.files.list()]
+
+
+def test_delete_video_keeps_reused_upload(make_interpreter, video_path):
+    client = FakeGenaiClient()
+    owner = make_interpreter(client)
+    owner.load_video(video_path)
+    reuser = make_interpreter(client)
+    reuser.load_video(video_path)
+
+    reuser.delete_video()
+
+    assert reuser.video_file is None
+    assert [file.name for file in client.files.list()] == [owner.video_file.name]
+    assert owner.query("What happens?") == "screenshot_not_available"
+
+
+def test_processing_is_polled_with_growing_jittered_delays(make_interpreter, video_path, monkeypatch):
+    delays = []
+    monkeypatch.setattr("videoinstruct.agents.VideoInterpreter.time.sleep", delays.append)
+    client = FakeGenaiClient(processing_polls=6)
+    interpreter = make_interpreter(client, poll_initial_interval=1.0, poll_max_interval=8.0, poll_backoff=2.0)
+
+    interpreter.load_video(video_path)
+
+    assert interpreter.video_file.state.name == "ACTIVE"
+    assert len(delays) == 6
+    for delay, base in zip(delays, [1.0, 2.0, 4.0, 8.0, 8.0, 8.0]):
+        assert 0.5 * base <= delay <= base
+
+
+def test_processing_timeout_raises(make_interpreter, video_path):
+    client = FakeGenaiClient(processing_polls=10 ** 6)
+    interpreter = make_interpreter(client, processing_timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        interpreter.load_video(video_path)
+
+
+def _fail_processing(client, monkeypatch):
+    upload = client.files.upload
+
+    def failing_upload(file, **kwargs):
+        uploaded = upload(file=file, **kwargs)
+        uploaded.state.name = "FAILED"
+        return uploaded
+
+    monkeypatch.setattr(client.files, "upload", failing_upload)
+
+
+def test_failed_processing_raises(make_interpreter, video_path, monkeypatch):
+    client = FakeGenaiClient(processing_polls=1)
+    _fail_processing(client, monkeypatch)
+    interpreter = make_interpreter(client)
+
+    with pytest.raises(ValueError):
+        interpreter.load_video(video_path)
+    assert client.files.list() == []
+
+
+def test_timed_out_upload_is_deleted(make_interpreter, video_path):
+    client = FakeGenaiClient(processing_polls=10 ** 6)
+    interpreter = make_interpreter(client, processing_timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        interpreter.load_video(video_path)
+
+    assert client.files.list() == []
+    assert interpreter.video_file is None
+    assert not interpreter._created_uploads
+    # The failed upload was not registered, so the next session uploads again
+    client.files.processing_polls = 0
+    make_interpreter(client).load_video(video_path)
+    assert client.files.upload_count == 2
+
+
+def test_failed_background_load_is_cleaned_up_and_keeps_raising(make_interpreter, video_path, monkeypatch):
+    client = FakeGenaiClient(processing_polls=1)
+    _fail_processing(client, monkeypatch)
+    interpreter = make_interpreter(client)
+
+    interpreter.load_video_in_background(video_path)
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="processing failed"):
+            interpreter.query("What happens?")
+    assert client.files.list() == []
+    assert interpreter.video_file is None
+    assert not interpreter._created_uploads
+    interpreter.delete_video()
+
+    # Loading another video clears the stored error
+    monkeypatch.undo()
+    interpreter.load_video(video_path)
+    assert interpreter.query("What happens?") == "screenshot_not_available"
+
+
+def test_async_load_waits_for_processing(make_interpreter, video_path):
+    client = FakeGenaiClient(processing_polls=3)
+    interpreter = make_interpreter(client)
+
+    interpreter.load_video_in_background(video_path)
+
+    # Questions wait for the background load
+    assert interpreter.query("What happens?") == "screenshot_not_available"
+    assert interpreter.video_file.state.name == "ACTIVE"
+
+
+def test_query_neither_reads_nor_writes_the_history(make_interpreter, video_path):
+    client = FakeGenaiClient(responses={"installer": "Click Next."}, processing_polls=0)
+    interpreter = make_interpreter(client)
+    interpreter.load_video(video_path)
+    interpreter.respond("What does the installer show?")
+    history = list(interpreter.conversation_history)
+    tokens_sent = interpreter.memory.tokens_sent
+
+    for question in ("When is the license shown?", "When does the install finish?", "When is the license shown?"):
+        interpreter.query(question, query_type="timestamp")
+
+    assert interpreter.conversation_history == history
+    assert interpreter.memory.tokens_sent == tokens_sent
+    query_requests = [contents for _, contents, _ in client.models.calls[1:]]
+    assert all(len(contents) == 2 and "user:" not in contents[-1] for contents in query_requests)
+    assert [contents[-1] for contents in query_requests] == ["When is the license shown?", "When does the install finish?", "When is the license shown?"]
+
+
+def _cached_requests(client):
+    return [config.cached_content for _, _, config in client.models.calls]
+
+
+def test_context_cache_is_created_once_and_used(make_interpreter, video_path):
+    client = FakeGenaiClient(responses={"opened": "00:00:42"})
+    interpreter = make_interpreter(client, use_context_cache=True)
+    interpreter.load_video(video_path)
+
+    assert interpreter.query("When is the page opened?") == "00:00:42"
+    assert interpreter.query("When is the page opened again?") == "00:00:42"
+
+    cache_name = interpreter.context_cache.name
+    assert client.caches.create_count == 1
+    assert _cached_requests(client) == [cache_name, cache_name]
+    # The video and system instruction are only sent as part of the cache
+    for _, contents, config in client.models.calls:
+        assert interpreter.video_file not in contents
+        assert config.system_instruction is None
+
+
+def test_context_cache_ttl_is_refreshed_before_expiry(make_interpreter, video_path):
+    client = FakeGenaiClient()
+    interpreter = make_interpreter(
+        client, use_context_cache=True, context_cache_ttl=600, context_cache_refresh_seconds=60
+    )
+    interpreter.load_video(video_path)
+    interpreter.query("first")
+    interpreter.query("second")
+    assert client.caches.update_count == 0
+
+    # Within the refresh margin of the expiry
+    interpreter._context_cache_expires_at -= 590
+    interpreter.query("third")
+
+    assert client.caches.update_count == 1
+    assert client.caches.create_count == 1
+
+
+def test_vanished_context_cache_falls_back_to_the_video(make_interpreter, video_path):
+    client = FakeGenaiClient(responses={"opened": "00:00:42"})
+    interpreter = make_interpreter(client, use_context_cache=True)
+    interpreter.load_video(video_path)
+    interpreter.query("When is the page opened?")
+    client.caches.expire(interpreter.context_cache.name)
+
+    assert interpreter.query("When is the page opened?") == "00:00:42"
+    _, contents, config = client.models.calls[-1]
+    assert interpreter.video_file in contents
+    assert config.cached_content is None
+
+    # The next question creates a new cache
+    interpreter.query("When is the page opened?")
+    assert client.caches.create_count == 2
+
+
+def test_failed_cache_creation_sends_the_video(make_interpreter, video_path, monkeypatch):
+    client = FakeGenaiClient()
+
+    def failing_create(model, config=None, **kwargs):
+        raise FakeClientError(400, "Cached content is too small")
+    monkeypatch.setattr(client.caches, "create", failing_create)
+    interpreter = make_interpreter(client, use_context_cache=True)
+    interpreter.load_video(video_path)
+
+    interpreter.query("first")
+    interpreter.query("second")
+
+    assert all(interpreter.video_file in contents for _, contents, _ in client.models.calls)
+
+
+def test_context_cache_is_deleted_with_the_video(make_interpreter, video_path):
+    client = FakeGenaiClient()
+    interpreter = make_interpreter(client, use_context_cache=True)
+    interpreter.load_video(video_path)
+    interpreter.query("first")
+
+    interpreter.delete_video()
+
+    assert client.caches.list() == []
+    assert interpreter.context_cache is None
+
+
+def test_context_cache_is_deleted_when_another_video_is_loaded(make_interpreter, video_path, tmp_path):
+    client = FakeGenaiClient()
+    interpreter = make_interpreter(client, use_context_cache=True)
+    interpreter.load_video(video_path)
+    interpreter.query("first")
+    old_cache_name = interpreter.context_cache.name
+    other_video = tmp_path / "other.mp4"
+    other_video.write_bytes(b"another video" * 100)
+
+    interpreter.load_video(str(other_video))
+
+    assert client.caches.list() == []
+    interpreter.query("second")
+    assert interpreter.context_cache.name != old_cache_name
+
+
+SEGMENTED_TRANSCRIPTION = """[0:00:10]Welcome to the photo editor.
+[0:07:00]Open the export dialog and choose a format.
+[0:07:20]That was quick.
+[0:15:00]Use the crop tool to crop the picture.
+[0:15:20]That was quick too.
+[0:24:00]Finally adjust the brightness slider.
+"""
+
+
+@pytest.fixture
+def segmented_interpreter(make_interpreter, video_path, monkeypatch):
+    monkeypatch.setattr("videoinstruct.agents.VideoInterpreter.get_video_duration", lambda path: 1800)
+    monkeypatch.setattr(
+        "videoinstruct.agents.VideoInterpreter.cut_segment", lambda path, segment, cache_dir=None: path
+    )
+    client = FakeGenaiClient(responses={"00:09:30": "00:00:10"})
+    interpreter = make_interpreter(
+        client, reuse_uploads=False, segment_min_duration=900, segment_route_min_score=1.0
+    )
+    interpreter.load_video(video_path)
+    interpreter.set_transcription(SEGMENTED_TRANSCRIPTION)
+    return interpreter
+
+
+def test_failed_segment_upload_deletes_the_other_segments(make_interpreter, video_path, monkeypatch):
+    monkeypatch.setattr("videoinstruct.agents.VideoInterpreter.get_video_duration", lambda path: 1800)
+    monkeypatch.setattr(
+        "videoinstruct.agents.VideoInterpreter.cut_segment",
+        lambda path, segment, cache_dir=None: f"{path}.{segment.index}"
+    )
+    for index in range(4):
+        with open(f"{video_path}.{index}", "wb") as f:
+            f.write(bytes([index]) * 100)
+    client = FakeGenaiClient()
+    upload = client.files.upload
+
+    def failing_upload(file, **kwargs):
+        if file.endswith(".2"):
+            raise FakeClientError(500, "Upload failed")
+        return upload(file=file, **kwargs)
+
+    monkeypatch.setattr(client.files, "upload", failing_upload)
+    interpreter = make_interpreter(client, segment_min_duration=900)
+
+    with pytest.raises(FakeClientError):
+        interpreter.load_video(video_path)
+
+    assert client.files.upload_count == 3
+    assert client.files.list() == []
+    assert interpreter.segment_files == []
+    assert not interpreter._created_uploads
+    # None of the deleted segments is offered for reuse
+    assert interpreter.upload_registry.get(
+        interpreter.upload_registry.make_key(file_content_hash(f"{video_path}.0"), interpreter.api_key)
+    ) is None
+
+
+def _asked_segment_files(client):
+    return [contents[0].name for _, contents, _ in client.models.calls]
+
+
+def test_segmented_question_is_routed_and_shifted(segmented_interpreter):
+    client = segmented_interpreter.client
+
+    answer = segmented_interpreter.query("When is the crop tool used on the picture?")
+
+    assert answer == "00:09:40"
+    assert _asked_segment_files(client) == [segmented_interpreter.segment_files[1][1].name]
+
+
+def test_segmented_timestamp_query_returns_a_bare_timestamp(segmented_interpreter):
+    segmented_interpreter.client.models.responses = {
+        "from 00:00:00": "screenshot_not_available.",
+        "from 00:09:30": "It appears at 00:01:30.",
+        "from 00:19:00": '"00:00:20"',
+    }
+
+    answer = segmented_interpreter.query("When does the splash screen flicker?", query_type="timestamp")
+
+    assert answer == "00:11:00"
+
+
+def test_batched_lookup_routes_each_description(segmented_interpreter):
+    client = segmented_interpreter.client
+    files = [uploaded.name for _, uploaded in segmented_interpreter.segment_files]
+
+    segmented_interpreter.query(
+        "Find the frames for these descriptions: ...", route_queries=["export dialog format", "crop tool picture"]
+    )
+
+    assert sorted(_asked_segment_files(client)) == sorted(files[:2])
+
+
+def test_segment_questions_use_a_bounded_pool(segmented_interpreter, monkeypatch):
+    pool_sizes = []
+
+    def recording_executor(max_workers=None, **kwargs):
+        pool_sizes.append(max_workers)
+        return ThreadPoolExecutor(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr("videoinstruct.agents.VideoInterpreter.ThreadPoolExecutor", recording_executor)
+    segmented_interpreter.config.segment_upload_workers = 2
+
+    segmented_interpreter.query("keyboard shortcuts")
+
+    assert pool_sizes == [2]
+    # Unmatched questions go to all four segments
+    assert len(segmented_interpreter.client.models.calls) == 4
+
+
+def test_contact_sheets_answer_configured_query_types(make_interpreter, video_path):
+    client = FakeGenaiClient(responses={"contact sheets": "The user opens the settings."})
+    interpreter = make_interpreter(client, contact_sheet_query_types=["description"])
+    interpreter.load_video(video_path)
+    interpreter.contact_sheets = [Image.new("RGB", (8, 8))]
+
+    assert interpreter.query("Describe the video", query_type="description") == "The user opens the settings."
+    interpreter.query("When are the settings opened?", query_type="timestamp")
+
+    # Only the description was answered from the sheets; the timestamp query was sent with the video
+    assert interpreter.contact_sheet_stats == {"answered": 1, "fallbacks": 0}
+    assert interpreter.video_file in client.models.calls[-1][1]
+
+
+def test_contact_sheet_answer_needing_the_video_falls_back(make_interpreter, video_path):
+    client = FakeGenaiClient(responses={"contact sheets": "needs_full_video", "When": "00:00:42"})
+    interpreter = make_interpreter(client, contact_sheet_query_types=["timestamp"])
+    interpreter.load_video(video_path)
+    interpreter.contact_sheets = [Image.new("RGB", (8, 8))]
+
+    assert interpreter.query("When are the settings opened?", query_type="timestamp") == "00:00:42"
+    assert interpreter.contact_sheet_stats == {"answered": 0, "fallbacks": 1}
@@ -0,0 +1,51 @@
+import os
+import subprocess
+
+import pytest
+
+from videoinstruct.tools.video_proxy import make_analysis_proxy
+
+
+@pytest.fixture(scope="module")
+def source_video(tmp_path_factory):
+    from moviepy.config import FFMPEG_BINARY
+
+    path = str(tmp_path_factory.mktemp("videos") / "source.mp4")
+    subprocess.run(
+        [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-y",
+         "-f", "lavfi", "-i", "testsrc=duration=2:size=1280x720:rate=30",
+         "-c:v", "libx264", "-b:v", "8M", "-pix_fmt", "yuv420p", path],
+        check=True
+    )
+    return path
+
+
+def test_proxy_is_smaller_and_cached(source_video, tmp_path):
+    cache_dir = str(tmp_path / "proxies")
+
+    proxy_path = make_analysis_proxy(source_video, cache_dir=cache_dir, max_height=360)
+
+    assert proxy_path != source_video
+    assert os.path.getsize(proxy_path) < os.path.getsize(source_video)
+    assert make_analysis_proxy(source_video, cache_dir=cache_dir, max_height=360) == proxy_path
+    assert os.listdir(cache_dir) == [os.path.basename(proxy_path)]
+
+
+def test_failed_transcode_falls_back_to_the_source(tmp_path):
+    broken_video = tmp_path / "broken.mp4"
+    broken_video.write_bytes(b"not a video")
+    cache_dir = tmp_path / "proxies"
+
+    assert make_analysis_proxy(str(broken_video), cache_dir=str(cache_dir)) == str(broken_video)
+    assert os.listdir(cache_dir) == []
+
+
+def test_missing_ffmpeg_falls_back_to_the_source(source_video, tmp_path, monkeypatch):
+    def missing_binary(command, **kwargs):
+        raise FileNotFoundError(2, "No such file or directory", command[0])
+
+    monkeypatch.setattr(subprocess, "run", missing_binary)
+    cache_dir = tmp_path / "proxies"
+
+    assert make_analysis_proxy(source_video, cache_dir=str(cache_dir)) == source_video
+    assert os.listdir(cache_dir) == []
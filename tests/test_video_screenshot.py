@@ -0,0 +1,277 @@
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image, ImageFilter
+
+from videoinstruct.tools.video_index import VideoIndex
+from videoinstruct.tools.video_screenshot import (
+    VideoFrameReader,
+    VideoScreenshotBatchTool,
+    VideoScreenshotTool,
+    find_changed_region,
+    save_screenshots,
+    save_screenshots_parallel,
+    score_frame_quality,
+)
+
+
+def _checkerboard(height, width, cell=16):
+    rows, columns = np.indices((height, width)) // cell
+    board = ((rows + columns) % 2 * 255).astype(np.uint8)
+    return np.repeat(board[:, :, None], 3, axis=2)
+
+
+def test_sharp_frame_scores_higher_than_blurred_copies():
+    sharp = _checkerboard(720, 1280)
+    blurred = np.asarray(Image.fromarray(sharp).filter(ImageFilter.GaussianBlur(3)))
+
+    scores = score_frame_quality([blurred, sharp, blurred])
+
+    assert scores.dtype == np.float32
+    assert int(np.argmax(scores)) == 1
+
+
+def test_frame_mid_transition_scores_lower():
+    still = _checkerboard(360, 640)
+    changing = 255 - still
+
+    scores = score_frame_quality([still, still, changing, still, still])
+
+    assert scores[2] < scores[0]
+
+
+def test_identical_frames_score_equally():
+    frame = _checkerboard(100, 100)
+
+    scores = score_frame_quality([frame, frame])
+
+    assert scores[0] == scores[1]
+
+
+def _single_decode(video_path, time_seconds):
+    """Decode one frame with a reader of its own, so no decoder state is shared."""
+    with VideoFrameReader(max_open=1) as reader:
+        return reader.get_frame(video_path, time_seconds)
+
+
+def test_pooled_decodes_match_single_decodes(test_video):
+    times = [0.0, 0.5, 2.5, 1.0, 1.0, 0.2]
+    expected = [_single_decode(test_video, time_seconds) for time_seconds in times]
+
+    with VideoFrameReader() as reader:
+        pooled = [reader.get_frame(test_video, time_seconds) for time_seconds in times]
+        batched = reader.get_frames(test_video, times)
+        streamed = dict(reader.iter_frames(test_video, times))
+
+    for time_seconds, frame, pooled_frame, batched_frame in zip(times, expected, pooled, batched):
+        assert np.array_equal(pooled_frame, frame)
+        assert np.array_equal(batched_frame, frame)
+        assert np.array_equal(streamed[time_seconds], frame)
+    assert not np.array_equal(expected[0], expected[1])
+
+
+def test_indexed_decodes_match_single_decodes(test_video, tmp_path):
+    times = [0.3, 2.8, 1.5]
+    expected = [_single_decode(test_video, time_seconds) for time_seconds in times]
+
+    with VideoFrameReader() as reader:
+        reader.attach_index(test_video, VideoIndex.load_or_build(test_video, index_dir=str(tmp_path)))
+        batched = reader.get_frames(test_video, times)
+
+    for frame, batched_frame in zip(expected, batched):
+        assert np.array_equal(batched_frame, frame)
+
+
+def test_least_recently_used_clip_is_evicted(test_video, tmp_path):
+    first_copy, second_copy = str(tmp_path / "first.mp4"), str(tmp_path / "second.mp4")
+    shutil.copy(test_video, first_copy)
+    shutil.copy(test_video, second_copy)
+
+    with VideoFrameReader(max_open=2) as reader:
+        reader.get_clip(test_video)
+        first_clip = reader.get_clip(first_copy)
+        reader.get_clip(test_video)
+        reader.get_clip(second_copy)
+
+        assert list(reader._clips) == [os.path.abspath(test_video), os.path.abspath(second_copy)]
+        assert first_clip.reader is None
+
+
+def test_sweeper_closes_idle_clips(test_video):
+    reader = VideoFrameReader(idle_timeout=0.1)
+    clip = reader.get_clip(test_video)
+
+    # The sweeper signals once it has emptied the pool
+    assert reader._closed.wait(5)
+    assert not reader._clips
+    assert clip.reader is None
+    reader._sweeper.join(timeout=5)
+    assert not reader._sweeper.is_alive()
+
+
+def test_close_releases_every_clip(test_video):
+    reader = VideoFrameReader()
+    clip = reader.get_clip(test_video)
+
+    reader.close()
+
+    assert not reader._clips
+    assert clip.reader is None
+
+
+def test_batch_screenshots_keep_request_order_and_duplicates(test_video):
+    time_strs = ["00:00:02", "00:00:00", "00:00:01", "00:00:00", "00:00:09", "00:00:02"]
+
+    screenshots = VideoScreenshotBatchTool(test_video, time_strs)
+
+    expected = {
+        time_str: np.asarray(VideoScreenshotTool(test_video, time_str))
+        for time_str in ("00:00:00", "00:00:01", "00:00:02")
+    }
+    assert screenshots[4] is None
+    for time_str, screenshot in zip(time_strs, screenshots):
+        if time_str in expected:
+            assert np.array_equal(np.asarray(screenshot), expected[time_str])
+
+
+def test_get_frames_returns_unsorted_times_in_request_order(test_video):
+    times = [2.0, 0.0, 1.0, 0.0]
+
+    with VideoFrameReader() as reader:
+        frames = reader.get_frames(test_video, times)
+        singles = [reader.get_frame(test_video, time_seconds) for time_seconds in times]
+
+    for frame, single in zip(frames, singles):
+        assert np.array_equal(frame, single)
+    assert np.array_equal(frames[1], frames[3])
+    assert not np.array_equal(frames[0], frames[1])
+
+
+class _FailingSecondSliceExecutor:
+    """Executor that runs slices in a spawn pool but fails the second one, like a crashed worker."""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        if self.submitted == 2:
+            future = Future()
+            future.set_exception(RuntimeError("worker died"))
+            return future
+        return self.executor.submit(fn, *args, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def spawn_executor():
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        yield executor
+
+
+def test_parallel_screenshots_map_every_job_to_its_frame(test_video, tmp_path, spawn_executor):
+    jobs = [
+        (2, [str(tmp_path / "two.png")]),
+        (0, [str(tmp_path / "zero.png"), str(tmp_path / "zero-copy.png")]),
+        (9, [str(tmp_path / "nine.png")]),
+        (1, [str(tmp_path / "one.png")]),
+    ]
+
+    errors = save_screenshots_parallel(test_video, jobs, spawn_executor, max_workers=2)
+
+    assert set(errors) == {path for _, paths in jobs for path in paths}
+    assert errors[str(tmp_path / "nine.png")] == "timestamp exceeds video duration"
+    for timestamp_seconds, paths in jobs:
+        if timestamp_seconds == 9:
+            continue
+        expected = np.asarray(VideoScreenshotTool(test_video, f"00:00:{timestamp_seconds:02d}"))
+        for path in paths:
+            assert errors[path] is None
+            assert np.array_equal(np.asarray(Image.open(path).convert("RGB")), expected)
+
+
+def test_failed_worker_marks_only_its_slice(test_video, tmp_path, spawn_executor):
+    jobs = [(timestamp_seconds, [str(tmp_path / f"{timestamp_seconds}.png")]) for timestamp_seconds in (2, 0, 1, 3)]
+
+    errors = save_screenshots_parallel(
+        test_video, jobs, _FailingSecondSliceExecutor(spawn_executor), max_workers=2
+    )
+
+    # Slices are contiguous time ranges, so the failed second slice holds seconds 2 and 3
+    assert errors == {
+        str(tmp_path / "0.png"): None,
+        str(tmp_path / "1.png"): None,
+        str(tmp_path / "2.png"): "worker died",
+        str(tmp_path / "3.png"): "worker died",
+    }
+    assert not os.path.exists(tmp_path / "2.png")
+
+
+def _gray_frame(height=480, width=640, value=128):
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+def test_identical_frames_are_not_cropped():
+    frame = _gray_frame()
+
+    assert find_changed_region(frame, [frame.copy(), frame.copy()]) is None
+    assert find_changed_region(frame, []) is None
+
+
+def test_small_change_is_padded_and_widened():
+    reference = _gray_frame()
+    frame = reference.copy()
+    frame[200:216, 304:320] = 255
+
+    top, bottom, left, right = find_changed_region(frame, [reference], padding=48, min_fraction=0.4)
+
+    assert top <= 200 - 48 and bottom >= 216 + 48
+    assert left <= 304 - 48 and right >= 320 + 48
+    assert (bottom - top, right - left) == (192, 256)
+
+
+def test_change_at_the_edge_is_clamped_to_the_frame():
+    reference = _gray_frame()
+    frame = reference.copy()
+    frame[464:480, 624:640] = 0
+
+    assert find_changed_region(frame, [reference], padding=48, min_fraction=0.4) == (288, 480, 384, 640)
+
+
+def test_full_frame_change_is_not_cropped():
+    assert find_changed_region(_gray_frame(value=0), [_gray_frame(value=255)]) is None
+
+
+class _SyntheticFrameReader:
+    """Frame reader stand-in that streams prepared frames keyed by second."""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def attach_index(self, video_path, video_index):
+        pass
+
+    def iter_frames(self, video_path, times):
+        for time_seconds in sorted(set(times)):
+            yield time_seconds, self.frames.get(time_seconds)
+
+
+def test_screenshot_is_cropped_to_the_changed_region(tmp_path):
+    still = _gray_frame()
+    changed = still.copy()
+    changed[200:216, 304:320] = 255
+    reader = _SyntheticFrameReader({0: still, 1: still, 2: changed})
+    cropped_path, full_path = str(tmp_path / "cropped.png"), str(tmp_path / "full.png")
+
+    errors = save_screenshots("video.mp4", [(2, [cropped_path])], frame_reader=reader, crop_lookback_seconds=2)
+    save_screenshots("video.mp4", [(2, [full_path])], frame_reader=reader)
+
+    assert errors == {cropped_path: None}
+    top, bottom, left, right = find_changed_region(changed, [still, still])
+    cropped = np.asarray(Image.open(cropped_path).convert("RGB"))
+    assert np.array_equal(cropped, changed[top:bottom, left:right])
+    assert Image.open(full_path).size == (640, 480)
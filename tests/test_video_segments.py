@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from videoinstruct.tools.transcript_index import TranscriptIndex
+from videoinstruct.tools.video_segments import (
+    VideoSegment,
+    format_timestamp,
+    merge_segment_answers,
+    plan_segments,
+    route_to_segments,
+    shift_timestamps,
+)
+
+
+def test_plan_segments_overlap_and_cover_the_video():
+    segments = plan_segments(1500, segment_seconds=600, overlap_seconds=30)
+
+    assert segments == [
+        VideoSegment(0, 0.0, 600),
+        VideoSegment(1, 570, 1170),
+        VideoSegment(2, 1140, 1500),
+    ]
+
+
+def test_plan_segments_short_video_is_one_segment():
+    assert plan_segments(90, segment_seconds=600, overlap_seconds=30) == [VideoSegment(0, 0.0, 90)]
+
+
+def test_plan_segments_rejects_overlap_longer_than_segments():
+    with pytest.raises(ValueError):
+        plan_segments(100, segment_seconds=30, overlap_seconds=30)
+
+
+def test_format_timestamp():
+    assert format_timestamp(3725.4) == "01:02:05"
+
+
+def test_shift_timestamps():
+    assert shift_timestamps("At 00:00:04 and 1:05, not 12:34:56:78", 600) == "At 00:10:04 and 00:11:05, not 12:34:56:78"
+    assert shift_timestamps("At 00:00:04", 0) == "At 00:00:04"
+
+
+SEGMENTS = [VideoSegment(0, 0.0, 600), VideoSegment(1, 570, 1170)]
+
+
+def test_merge_keeps_the_first_available_timestamp():
+    answer = merge_segment_answers([(SEGMENTS[1], "00:00:10"), (SEGMENTS[0], "00:01:00")])
+
+    assert answer == "00:09:40"
+
+
+def test_merge_drops_unavailable_answers():
+    answer = merge_segment_answers([(SEGMENTS[0], "screenshot_not_available"), (SEGMENTS[1], "00:00:10")])
+
+    assert answer == "00:09:40"
+    assert merge_segment_answers([(SEGMENTS[0], "screenshot_not_available")]) == "screenshot_not_available"
+
+
+def test_merge_json_objects_key_by_key():
+    answers = [
+        (SEGMENTS[0], json.dumps({"intro": "00:00:05", "export": "screenshot_not_available"})),
+        (SEGMENTS[1], json.dumps({"intro": "00:00:30", "export": "00:01:00"})),
+    ]
+
+    assert json.loads(merge_segment_answers(answers)) == {"intro": "00:00:05", "export": "00:10:30"}
+
+
+def test_merge_json_objects_ignores_plain_unavailable_answers():
+    answers = [
+        (SEGMENTS[0], json.dumps({"intro": "00:00:05"})),
+        (SEGMENTS[1], "screenshot_not_available"),
+        (VideoSegment(2, 1140, 1500), json.dumps({"export": "00:00:20"})),
+    ]
+
+    assert json.loads(merge_segment_answers(answers)) == {"intro": "00:00:05", "export": "00:19:20"}
+
+
+def test_merge_concatenates_free_text():
+    answer = merge_segment_answers([(SEGMENTS[0], "The user logs in."), (SEGMENTS[1], "The user logs out.")])
+
+    assert answer == "From 00:00:00 to 00:10:00:\nThe user logs in.\n\nFrom 00:09:30 to 00:19:30:\nThe user logs out."
+
+
+def test_merge_timestamp_query_extracts_the_first_timestamp():
+    answers = [
+        (SEGMENTS[0], "Screenshot_Not_Available."),
+        (SEGMENTS[1], "It appears at 00:01:30."),
+        (VideoSegment(2, 1140, 1500), '"00:00:20"'),
+    ]
+
+    assert merge_segment_answers(answers, query_type="timestamp") == "00:11:00"
+    assert merge_segment_answers(answers[::-1], query_type="timestamp") == "00:19:20"
+
+
+def test_merge_timestamp_query_normalizes_punctuated_answers():
+    answers = [(SEGMENTS[0], '"00:02:00".'), (SEGMENTS[1], "1:05")]
+
+    assert merge_segment_answers(answers, query_type="timestamp") == "00:02:00"
+    assert merge_segment_answers([(SEGMENTS[0], "2:05")], query_type="timestamp") == "00:02:05"
+
+
+def test_merge_timestamp_query_without_a_timestamp_is_unavailable():
+    answers = [(SEGMENTS[0], "'screenshot_not_available'"), (SEGMENTS[1], "The dialog is never shown.")]
+
+    assert merge_segment_answers(answers, query_type="timestamp") == "screenshot_not_available"
+    assert merge_segment_answers([(SEGMENTS[0], '"screenshot_not_available."')]) == "screenshot_not_available"
+
+
+def test_merge_timestamp_query_keeps_json_lookups():
+    answers = [
+        (SEGMENTS[0], "```json\n" + json.dumps({"intro": "00:00:05", "export": "Screenshot_not_available."}) + "\n```"),
+        (SEGMENTS[1], "The export dialog appears at 00:01:00."),
+        (VideoSegment(2, 1140, 1500), json.dumps({"export": "00:00:20"})),
+    ]
+
+    assert json.loads(merge_segment_answers(answers, query_type="timestamp")) == {
+        "intro": "00:00:05", "export": "00:19:20"
+    }
+
+
+TRANSCRIPTION = """[0:00:10]Welcome to the photo editor.
+[0:07:00]Open the export dialog and choose a format.
+[0:07:20]That was quick.
+[0:15:00]Use the crop tool to crop the picture.
+[0:15:20]That was quick too.
+[0:24:00]Finally adjust the brightness slider.
+"""
+
+
+def test_route_to_matching_segments():
+    segments = plan_segments(1800, segment_seconds=600, overlap_seconds=30)
+    index = TranscriptIndex.from_transcription(TRANSCRIPTION)
+
+    assert route_to_segments(segments, index, "export dialog format", min_score=1.0) == [segments[0]]
+    assert route_to_segments(segments, index, "crop tool picture", min_score=1.0) == [segments[1]]
+
+
+def test_route_unmatched_or_without_transcript_goes_everywhere():
+    segments = plan_segments(1800, segment_seconds=600, overlap_seconds=30)
+    index = TranscriptIndex.from_transcription(TRANSCRIPTION)
+
+    assert route_to_segments(segments, index, "keyboard shortcuts", min_score=1.0) == segments
+    assert route_to_segments(segments, None, "export dialog") == segments
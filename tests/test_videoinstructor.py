@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+from tests.fake_genai import FakeGenaiClient
+from videoinstruct.configs import VideoInstructorConfig, VideoInterpreterConfig
+from videoinstruct.videoinstructor import VideoInstructor
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"not really a video" * 100)
+    return str(path)
+
+
+@pytest.fixture
+def instructor(tmp_path):
+    config = VideoInstructorConfig(
+        output_dir=str(tmp_path / "output"),
+        temp_dir=str(tmp_path / "temp"),
+        video_interpreter_config=VideoInterpreterConfig(
+            api_key="test-key",
+            upload_registry_path=str(tmp_path / "uploads.json"),
+            poll_initial_interval=0.001,
+            poll_max_interval=0.001
+        )
+    )
+    instructor = VideoInstructor(config=config)
+    instructor.video_interpreter.client = FakeGenaiClient(responses={"step-by-step": "A detailed description"})
+    yield instructor
+    instructor.screenshot_agent.close()
+
+
+def _fail_transcription(instructor, monkeypatch):
+    def extract_transcription():
+        raise RuntimeError("transcription failed")
+    monkeypatch.setattr(instructor, "_extract_transcription", extract_transcription)
+
+
+def test_concurrent_startup_describes_the_video(instructor, video_path, monkeypatch):
+    monkeypatch.setattr(instructor, "_extract_transcription", lambda: None)
+
+    instructor.load_video(video_path)
+
+    assert instructor.video_interpreter.video_file is not None
+    assert instructor._initial_description.result() == "A detailed description"
+
+
+def test_transcription_failure_skips_the_description(instructor, video_path, monkeypatch):
+    _fail_transcription(instructor, monkeypatch)
+    client = instructor.video_interpreter.client
+    upload = client.files.upload
+
+    def slow_upload(file, **kwargs):
+        # Still uploading when the transcription fails
+        time.sleep(0.2)
+        return upload(file=file, **kwargs)
+    monkeypatch.setattr(client.files, "upload", slow_upload)
+
+    with pytest.raises(RuntimeError, match="transcription failed"):
+        instructor.load_video(video_path)
+
+    assert instructor._initial_description is None
+    assert client.files.upload_count == 1
+    assert client.models.calls == []
+
+
+def test_upload_error_surfaces_before_transcription_error(instructor, video_path, monkeypatch):
+    _fail_transcription(instructor, monkeypatch)
+
+    def failing_upload(file, **kwargs):
+        raise ConnectionError("upload failed")
+    monkeypatch.setattr(instructor.video_interpreter.client.files, "upload", failing_upload)
+
+    with pytest.raises(ConnectionError, match="upload failed"):
+        instructor.load_video(video_path)
+
+
+def test_upload_error_surfaces_from_load_video(instructor, video_path, monkeypatch):
+    monkeypatch.setattr(instructor, "_extract_transcription", lambda: None)
+
+    def failing_upload(file, **kwargs):
+        raise ConnectionError("upload failed")
+    monkeypatch.setattr(instructor.video_interpreter.client.files, "upload", failing_upload)
+
+    with pytest.raises(ConnectionError, match="upload failed"):
+        instructor.load_video(video_path)
+    assert instructor._initial_description is None
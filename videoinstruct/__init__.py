@@ -1,17 +1,27 @@
-from videoinstruct.videoinstructor import VideoInstructor, VideoInstructorConfig
-from videoinstruct.agents.DocGenerator import DocGenerator, DocGeneratorConfig
-from videoinstruct.agents.VideoInterpreter import VideoInterpreter, VideoInterpreterConfig
-from videoinstruct.agents.DocEvaluator import DocEvaluator, DocEvaluatorConfig
-from videoinstruct.agents.ScreenshotAgent import ScreenshotAgent, ScreenshotAgentConfig
-from videoinstruct.prompt_loader import (
-    DOC_GENERATOR_SYSTEM_PROMPT, 
-    DOC_EVALUATOR_SYSTEM_PROMPT,
-    SCREENSHOT_AGENT_SYSTEM_PROMPT
-)
+from videoinstruct.utils.lazy import lazy_module_attrs
 
 # Version of the package
 __version__ = "0.1.9"
 
+# Public attributes are imported on first access (PEP 562), so `import videoinstruct`
+# stays fast and only the agents that are actually used load their dependencies.
+# {attribute: module that defines it}
+_LAZY_ATTRIBUTES = {
+    'VideoInstructor': 'videoinstruct.videoinstructor',
+    'VideoInstructorConfig': 'videoinstruct.configs',
+    'DocGenerator': 'videoinstruct.agents.DocGenerator',
+    'DocGeneratorConfig': 'videoinstruct.configs',
+    'VideoInterpreter': 'videoinstruct.agents.VideoInterpreter',
+    'VideoInterpreterConfig': 'videoinstruct.configs',
+    'DocEvaluator': 'videoinstruct.agents.DocEvaluator',
+    'DocEvaluatorConfig': 'videoinstruct.configs',
+    'ScreenshotAgent': 'videoinstruct.agents.ScreenshotAgent',
+    'ScreenshotAgentConfig': 'videoinstruct.configs',
+    'DOC_GENERATOR_SYSTEM_PROMPT': 'videoinstruct.prompt_loader',
+    'DOC_EVALUATOR_SYSTEM_PROMPT': 'videoinstruct.prompt_loader',
+    'SCREENSHOT_AGENT_SYSTEM_PROMPT': 'videoinstruct.prompt_loader',
+}
+
 __all__ = [
     'VideoInstructor',
     'VideoInstructorConfig',
@@ -28,3 +38,5 @@ __all__ = [
     'SCREENSHOT_AGENT_SYSTEM_PROMPT',
     '__version__'
 ]
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_ATTRIBUTES, __all__)
@@ -1,7 +1,6 @@
 import os
 import re
 from typing import List, Optional, Dict, Tuple
-import litellm
 
 from videoinstruct.configs import DocEvaluatorConfig
 from videoinstruct.prompt_loader import DOC_EVALUATOR_SYSTEM_PROMPT
@@ -169,6 +168,8 @@ class DocEvaluator:
             generate_config["thinking"] = {"type": "enabled", "budget_tokens": 1024}
             generate_config["temperature"] = 1
         
+        import litellm
+        
         try:
             response = litellm.completion(
                 model=model_name,
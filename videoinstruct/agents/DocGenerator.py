@@ -1,14 +1,15 @@
 import os
 import time
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 import json
-import litellm
-from IPython.display import Markdown
 import re
 
 from videoinstruct.configs import DocGeneratorConfig
 from videoinstruct.prompt_loader import DOC_GENERATOR_SYSTEM_PROMPT
 
+if TYPE_CHECKING:
+    from IPython.display import Markdown
+
 
 class DocGenerator:
     """Generates documentation from video transcriptions using LLMs."""
@@ -107,6 +108,9 @@ class DocGenerator:
             system_message = {"role": "system", "content": self.config.system_instruction}
             messages = [system_message] + messages
         
+        # litellm takes seconds to import, so it is only loaded once a completion is needed
+        import litellm
+        
         try:
             response = litellm.completion(
                 model=model_name,
@@ -159,7 +163,7 @@ class DocGenerator:
         
         return file_path
     
-    def display_documentation(self) -> Markdown:
+    def display_documentation(self) -> "Markdown":
         """Display the latest documentation as Markdown."""
         if not self.conversation_history:
             raise ValueError("No documentation has been generated yet.")
@@ -182,6 +186,8 @@ class DocGenerator:
         if not latest_doc:
             raise ValueError("No documentation found in conversation history.")
         
+        from IPython.display import Markdown
+        
         return Markdown(latest_doc)
     
     def _extract_questions(self, text: str) -> List[str]:
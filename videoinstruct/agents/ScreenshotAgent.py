@@ -3,9 +3,9 @@ import re
 import sys
 import json
 import time
-from typing import Optional, Dict, Any
-from PIL import Image
-from google import generativeai as genai
+import multiprocessing
+from typing import Optional, Dict, Any, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
 
 # Add the parent directory to the Python path so we can import our modules
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,7 +15,14 @@ if parent_dir not in sys.path:
 
 from videoinstruct.configs import ScreenshotAgentConfig, VideoInterpreterConfig
 from videoinstruct.agents.VideoInterpreter import VideoInterpreter
-from videoinstruct.tools.video_screenshot import VideoScreenshotTool
+from videoinstruct.tools.video_screenshot import IMAGE_EXTENSIONS, VideoFrameReader, save_screenshots, save_screenshots_parallel
+from videoinstruct.tools.video_index import VideoIndex
+from videoinstruct.tools.screenshot_store import ScreenshotStore
+from videoinstruct.tools.transcript_index import TranscriptIndex
+from videoinstruct.tools.image_hash import PerceptualHashIndex, color_layout, dhash
+from videoinstruct.utils.hashing import file_content_hash
+from videoinstruct.utils.journaled_cache import JournaledCache
+from videoinstruct.utils.placeholders import Placeholder, parse_placeholders, render_segments, move_images_out_of_code_blocks
 
 
 class ScreenshotAgent:
@@ -34,62 +41,56 @@ class ScreenshotAgent:
         self.video_path = video_path
         self.output_dir = output_dir
         
+        # Pool of open video decoders shared by every screenshot of this session
+        self.frame_reader = VideoFrameReader()
+        # Worker processes for parallel screenshot extraction, created on first use
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Keyframe and scene-change index of the current video, built on first use
+        self.video_index: Optional[VideoIndex] = None
+        self._video_index_failed = False
+        
+        # Cross-session store of extracted screenshots, keyed by video content and timestamp
+        self.screenshot_store: Optional[ScreenshotStore] = None
+        if self.config.use_screenshot_store:
+            self.screenshot_store = ScreenshotStore(
+                root_dir=self.config.screenshot_store_dir,
+                max_bytes=self.config.screenshot_store_max_mb * 1024 * 1024
+            )
+        # Content hash of the current video, computed on first use
+        self._video_hash: Optional[str] = None
+        
+        # Index of the narration, used to resolve timestamps without asking the interpreter
+        self.transcript_index: Optional[TranscriptIndex] = None
+        # Timestamps resolved from the transcript (hits) and left to the interpreter (misses)
+        self.transcript_resolver_stats = {"hits": 0, "misses": 0}
+        
         # Cache file path for storing screenshot mappings
         self.cache_file = os.path.join(output_dir, "screenshot_cache.json")
-        # Screenshots cache: {normalized_name: screenshot_path}
+        # Screenshots cache: {normalized_name: screenshot_path}, journaled to disk once per processed file
         self.screenshot_cache = self._load_screenshot_cache()
         
         # List to track unavailable screenshots
         self.unavailable_screenshots = []
         
+        # Resolutions of placeholders from earlier documentation versions:
+        # {(name, purpose, content, value): screenshot_path, or None if it was not available}
+        self.placeholder_resolutions: Dict[Tuple[str, str, str, str], Optional[str]] = {}
+        
         # Get API key from config or environment variable
         self.api_key = self.config.api_key or os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
-            raise ValueError("API key must be provided in config or set as GEMINI_API_KEY environment variable")
-        
-        # Initialize Gemini client
-        genai.api_key = self.api_key
-        
-        # Configure the model with system instruction
-        generation_config = {
-            "temperature": self.config.temperature,
-        }
-        
-        if self.config.max_output_tokens:
-            generation_config["max_output_tokens"] = self.config.max_output_tokens
-        if self.config.top_p:
-            generation_config["top_p"] = self.config.top_p
-        if self.config.top_k:
-            generation_config["top_k"] = self.config.top_k
-        if self.config.seed:
-            generation_config["seed"] = self.config.seed
-        
-        self.model = genai.GenerativeModel(
-            model_name=self.config.model,
-            generation_config=generation_config,
-            system_instruction=self.config.system_instruction
-        )
         
         # Create output directory if it doesn't exist
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
     
-    def _load_screenshot_cache(self) -> Dict[str, str]:
-        """Load screenshot cache from JSON file."""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                print(f"Error loading screenshot cache from {self.cache_file}, creating new cache")
-                return {}
-        return {}
+    def _load_screenshot_cache(self) -> JournaledCache:
+        """Load screenshot cache from its JSON snapshot and journal."""
+        return JournaledCache(self.cache_file)
     
     def _save_screenshot_cache(self) -> None:
-        """Save screenshot cache to JSON file."""
+        """Append the screenshot cache changes to its journal, merging those of concurrent sessions."""
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.screenshot_cache, f, indent=2)
+            self.screenshot_cache.flush()
         except Exception as e:
             print(f"Error saving screenshot cache: {str(e)}")
     
@@ -107,8 +108,93 @@ class ScreenshotAgent:
     
     def set_video_path(self, video_path: str) -> None:
         """Set the video file path."""
+        if self.video_path and self.video_path != video_path:
+            self.frame_reader.close(self.video_path)
+            self.video_index = None
+            self._video_index_failed = False
+            self._video_hash = None
         self.video_path = video_path
     
+    def set_transcription(self, transcription: str) -> None:
+        """Set the timestamped transcription used to resolve screenshot timestamps locally."""
+        if not self.config.use_transcript_resolver:
+            return
+        self.transcript_index = TranscriptIndex.from_transcription(transcription)
+        if not len(self.transcript_index):
+            print("Transcription has no timestamped segments, screenshot timestamps will come from the interpreter")
+            self.transcript_index = None
+    
+    def close(self) -> None:
+        """Release the open video decoders and shut down the worker processes."""
+        self.frame_reader.close()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def _get_video_index(self) -> Optional[VideoIndex]:
+        """Return the index of the current video when indexing is enabled, building it on first use."""
+        if not self.config.use_video_index or self._video_index_failed or not self.video_path:
+            return None
+        if self.video_index is None:
+            try:
+                self.video_index = VideoIndex.load_or_build(self.video_path, self.config.video_index_dir)
+                self.frame_reader.attach_index(self.video_path, self.video_index)
+            except Exception as e:
+                print(f"Error building video index, continuing without it: {str(e)}")
+                self._video_index_failed = True
+                return None
+        return self.video_index
+    
+    def _snap_to_stable_frame(self, timestamp_seconds: int) -> int:
+        """Move a timestamp forward past any scene transition it falls into."""
+        video_index = self._get_video_index()
+        if video_index is None:
+            return timestamp_seconds
+        return video_index.find_stable_time(
+            timestamp_seconds,
+            threshold=self.config.stable_frame_threshold,
+            max_shift=self.config.stable_frame_max_shift
+        )
+    
+    def _image_encoding(self) -> Dict[str, Any]:
+        """Return the keyword arguments used to encode screenshot files."""
+        encoding: Dict[str, Any] = {"image_format": self.config.image_format, "max_width": self.config.max_image_width}
+        if self.config.image_format == "png":
+            encoding["png_compress_level"] = self.config.png_compress_level
+        else:
+            encoding["quality"] = self.config.image_quality
+        return encoding
+    
+    def _encoding_params(self) -> Dict[str, Any]:
+        """Return the parameters that determine the bytes of a saved screenshot."""
+        encoding = self._image_encoding()
+        if self.config.sharpest_frame_window > 0 and self.config.sharpest_frame_sample_fps > 0:
+            encoding["frame_window"] = self.config.sharpest_frame_window
+            encoding["frame_sample_fps"] = self.config.sharpest_frame_sample_fps
+        if self.config.crop_to_changes:
+            encoding["crop_lookback_seconds"] = self.config.crop_lookback_seconds
+            encoding["crop_padding"] = self.config.crop_padding
+            encoding["crop_min_fraction"] = self.config.crop_min_fraction
+        return encoding
+    
+    def _get_store_key(self, timestamp_seconds: int) -> Optional[str]:
+        """Return the screenshot store key for a timestamp of the current video, if the store is enabled."""
+        if self.screenshot_store is None:
+            return None
+        if self._video_hash is None:
+            self._video_hash = file_content_hash(self.video_path)
+        return self.screenshot_store.make_key(self._video_hash, timestamp_seconds, self._encoding_params())
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the process pool used for parallel screenshot extraction."""
+        if self._executor is None:
+            # Spawned workers start clean; forking would copy the lock state of running
+            # sweeper and upload threads into the children
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.config.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+    
     def set_video_interpreter(self, video_interpreter: VideoInterpreter) -> None:
         """Set the VideoInterpreter agent."""
         self.video_interpreter = video_interpreter
@@ -135,123 +221,160 @@ class ScreenshotAgent:
             content = re.sub(r'```(?:.*?)\s*\n(!\[.*?\]\(.*?\))\s*\n```', r'\1', content)
             content = re.sub(r'```(?:.*?)(!\[.*?\]\(.*?\))```', r'\1', content)
             
-            # Define regex pattern to identify screenshot placeholders
-            pattern = r'\[SCREENSHOT_PLACEHOLDER\](.*?)\[/SCREENSHOT_PLACEHOLDER\]'
+            # Parse the document once into text and placeholder segments
+            segments = parse_placeholders(content)
+            placeholders = [segment for segment in segments if isinstance(segment, Placeholder)]
             
-            # Find all matches
-            matches = re.findall(pattern, content, re.DOTALL)
+            # Placeholders resolved to an image: [(placeholder, screenshot_path)]
+            resolved: List[Tuple[Placeholder, str]] = []
+            # Placeholders waiting for a timestamp: [(placeholder, normalized_name)]
+            unresolved: List[Tuple[Placeholder, str]] = []
+            # Placeholders waiting for a new screenshot: [(placeholder, normalized_name, timestamp_seconds)]
+            pending: List[Tuple[Placeholder, str, int]] = []
+            # Placeholders reusing a screenshot that is still pending: [(placeholder, normalized_name)]
+            deferred: List[Tuple[Placeholder, str]] = []
+            pending_names = set()
+            # Screenshots taken for this file: {normalized_name: screenshot_path}
+            taken: Dict[str, str] = {}
+            reused_count = 0
             
-            # Process each match
-            for idx, placeholder_content in enumerate(matches):
+            # Collect the placeholders that need a new screenshot
+            for idx, placeholder in enumerate(placeholders):
                 try:
-                    # Extract the name from the placeholder
-                    name_match = re.search(r'Name:\s*(.*?)(?:\n|$)', placeholder_content)
-                    
-                    if not name_match:
+                    if placeholder.name is None:
                         print(f"Warning: Screenshot placeholder #{idx+1} does not have a Name attribute, skipping")
                         continue
                     
-                    # Get the original name for display
-                    screenshot_name_original = name_match.group(1).strip()
                     # Get the normalized name for cache lookup
-                    screenshot_name = self._normalize_name(screenshot_name_original)
+                    screenshot_name = self._normalize_name(placeholder.name)
                     
-                    # Build a description for the image alt text
-                    # First check if there's any content other than the name
-                    has_additional_content = bool(re.search(r'(Purpose|Content|Value):\s*(.*?)(?:\n|$)', placeholder_content))
+                    # Reuse a screenshot that an earlier placeholder in this file is about to take
+                    if screenshot_name in pending_names:
+                        deferred.append((placeholder, screenshot_name))
+                        continue
                     
-                    if has_additional_content:
-                        # Extract purpose, content, and value if available
-                        purpose_match = re.search(r'Purpose:\s*(.*?)(?:\n|$)', placeholder_content)
-                        content_match = re.search(r'Content:\s*(.*?)(?:\n|$)', placeholder_content)
-                        value_match = re.search(r'Value:\s*(.*?)(?:\n|$)', placeholder_content)
-                        
-                        # Combine the extracted information into a description
-                        description_parts = []
-                        if purpose_match:
-                            description_parts.append(purpose_match.group(1).strip())
-                        if content_match:
-                            description_parts.append(content_match.group(1).strip())
-                        if value_match:
-                            description_parts.append(value_match.group(1).strip())
-                        
-                        description = " - ".join(description_parts) if description_parts else screenshot_name_original
-                    else:
-                        # If there's only a name, use it as the description
-                        description = screenshot_name_original
+                    # Reuse the previous resolution of an unchanged placeholder without asking the interpreter again
+                    if placeholder.has_additional_content and not replace_existing and placeholder.signature in self.placeholder_resolutions:
+                        previous_path = self.placeholder_resolutions[placeholder.signature]
+                        if previous_path is None:
+                            self._mark_unavailable(placeholder)
+                            print(f"Unchanged screenshot '{placeholder.name}' was not available in the previous version, removing placeholder!")
+                            reused_count += 1
+                            continue
+                        if os.path.exists(previous_path):
+                            print(f"Reusing screenshot of unchanged placeholder '{placeholder.name}': {previous_path}")
+                            self.screenshot_cache[screenshot_name] = previous_path
+                            resolved.append((placeholder, previous_path))
+                            reused_count += 1
+                            continue
                     
-                    # Check if we already have this screenshot in our cache
-                    screenshot_path = None
-                    if not replace_existing and screenshot_name in self.screenshot_cache:
+                    # Placeholders with only a name refer to an existing screenshot in our cache
+                    if not placeholder.has_additional_content and not replace_existing and screenshot_name in self.screenshot_cache:
                         cached_path = self.screenshot_cache[screenshot_name]
                         if os.path.exists(cached_path):
-                            screenshot_path = cached_path
-                            print(f"Using cached screenshot for '{screenshot_name_original}' (normalized: '{screenshot_name}'): {screenshot_path}")
+                            print(f"Using cached screenshot for '{placeholder.name}' (normalized: '{screenshot_name}'): {cached_path}")
+                            resolved.append((placeholder, cached_path))
+                            continue
                     
                     # If the screenshot doesn't exist in cache or we're replacing existing ones,
                     # only generate a new one if there's additional content to use
-                    if screenshot_path is None:
-                        if has_additional_content:
-                            # Get timestamp from VideoInterpreter
-                            timestamp_hms = None
-                            if self.video_interpreter:
-                                try:
-                                    timestamp_hms = self._get_timestamp_from_interpreter(description)
-                                    print(f"Extracted timestamp for new screenshot '{screenshot_name_original}': {timestamp_hms}")
-                                except Exception as e:
-                                    print(f"Error getting timestamp for new screenshot '{screenshot_name_original}': {str(e)}")
-                            
-                            if timestamp_hms is None:
-                                # Screenshot is not available, add to list and remove placeholder
-                                self.unavailable_screenshots.append(screenshot_name_original)
-                                placeholder = f'[SCREENSHOT_PLACEHOLDER]{placeholder_content}[/SCREENSHOT_PLACEHOLDER]'
-                                content = content.replace(placeholder, '')
-                                print(f"Timestamp not available for screenshot: '{screenshot_name_original}', removing placeholder!")
-                                continue
-                            
-                            # Convert HH:MM:SS to seconds
-                            h, m, s = map(int, timestamp_hms.split(':'))
-                            timestamp_seconds = h * 3600 + m * 60 + s
-                            
-                            # Take screenshot
-                            screenshot_path = self.take_screenshot(timestamp_seconds, screenshot_name)
-                            
-                            if screenshot_path and os.path.exists(screenshot_path):
-                                # Add to cache
-                                self.screenshot_cache[screenshot_name] = screenshot_path
-                                self._save_screenshot_cache()
-                            else:
-                                # Screenshot failed to be taken, add to unavailable list
-                                self.unavailable_screenshots.append(screenshot_name_original)
-                                placeholder = f'[SCREENSHOT_PLACEHOLDER]{placeholder_content}[/SCREENSHOT_PLACEHOLDER]'
-                                content = content.replace(placeholder, '')
-                                print(f"Screenshot failed to be taken for screenshot: '{screenshot_name_original}', removing placeholder!")
-                                continue
+                    if placeholder.has_additional_content:
+                        unresolved.append((placeholder, screenshot_name))
+                        pending_names.add(screenshot_name)
+                except Exception as e:
+                    print(f"Error processing screenshot placeholder #{idx+1}: {str(e)}")
+                    self._mark_unavailable(placeholder)
+            
+            if reused_count:
+                print(f"Reused {reused_count} unchanged screenshot placeholders, resolving {len(unresolved)} new or edited ones")
+            
+            # Resolve the timestamps the narration pins down, then ask the VideoInterpreter for the rest
+            timestamps = self._get_timestamps_from_transcript(unresolved)
+            interpreter_requests = [
+                (placeholder, screenshot_name) for placeholder, screenshot_name in unresolved
+                if screenshot_name not in timestamps
+            ]
+            if interpreter_requests and self.video_interpreter:
+                timestamps.update(self._get_timestamps_from_interpreter(
+                    {screenshot_name: placeholder.description for placeholder, screenshot_name in interpreter_requests}
+                ))
+            
+            for placeholder, screenshot_name in unresolved:
+                try:
+                    if screenshot_name not in timestamps:
+                        # The lookup failed or could not run; leave it uncached so the next version retries it
+                        self._mark_unavailable(placeholder)
+                        print(f"Timestamp could not be resolved for screenshot: '{placeholder.name}', removing placeholder!")
+                        continue
+                    
+                    timestamp_hms = timestamps[screenshot_name]
+                    print(f"Extracted timestamp for new screenshot '{placeholder.name}': {timestamp_hms}")
+                    
+                    if timestamp_hms is None:
+                        # The interpreter answered screenshot_not_available, remember it for unchanged placeholders
+                        self.placeholder_resolutions[placeholder.signature] = None
+                        self._mark_unavailable(placeholder)
+                        print(f"Timestamp not available for screenshot: '{placeholder.name}', removing placeholder!")
+                        continue
+                    
+                    # Convert HH:MM:SS to seconds
+                    h, m, s = map(int, timestamp_hms.split(':'))
+                    timestamp_seconds = h * 3600 + m * 60 + s
+                    
+                    # Avoid capturing a frame in the middle of a transition
+                    stable_seconds = self._snap_to_stable_frame(timestamp_seconds)
+                    if stable_seconds != timestamp_seconds:
+                        print(f"Moved screenshot '{placeholder.name}' from {timestamp_seconds}s to stable frame at {stable_seconds}s")
+                        timestamp_seconds = stable_seconds
                     
+                    pending.append((placeholder, screenshot_name, timestamp_seconds))
+                except Exception as e:
+                    print(f"Error processing screenshot placeholder '{placeholder.name}': {str(e)}")
+                    self._mark_unavailable(placeholder)
+            
+            # Take every new screenshot in a single pass over the video
+            if pending:
+                screenshot_paths = self.take_screenshots(
+                    [(timestamp_seconds, screenshot_name) for _, screenshot_name, timestamp_seconds in pending]
+                )
+                for (placeholder, screenshot_name, _), screenshot_path in zip(pending, screenshot_paths):
+                    if screenshot_path and os.path.exists(screenshot_path):
+                        # Add to cache
+                        self.screenshot_cache[screenshot_name] = screenshot_path
+                        self.placeholder_resolutions[placeholder.signature] = screenshot_path
+                        taken[screenshot_name] = screenshot_path
+                        resolved.append((placeholder, screenshot_path))
+                    else:
+                        # Screenshot failed to be taken, add to unavailable list
+                        self._mark_unavailable(placeholder)
+                        print(f"Screenshot failed to be taken for screenshot: '{placeholder.name}', removing placeholder!")
+            
+            # Placeholders that referenced a screenshot taken above
+            for placeholder, screenshot_name in deferred:
+                if screenshot_name in taken:
+                    resolved.append((placeholder, taken[screenshot_name]))
+                else:
+                    # The screenshot it referenced could not be taken
+                    self._mark_unavailable(placeholder)
+                    print(f"Screenshot '{placeholder.name}' is not available, removing placeholder!")
+            
+            for placeholder, screenshot_path in resolved:
+                try:
                     if screenshot_path and os.path.exists(screenshot_path):
                         # Get relative path for markdown
                         rel_path = os.path.relpath(screenshot_path, os.path.dirname(file_path))
                         
                         # Replace placeholder with actual image in markdown
-                        placeholder = f'[SCREENSHOT_PLACEHOLDER]{placeholder_content}[/SCREENSHOT_PLACEHOLDER]'
-                        replacement = f'![{description}]({rel_path})'
-                        content = content.replace(placeholder, replacement)
+                        placeholder.replacement = f'![{placeholder.description}]({rel_path})'
                 except Exception as e:
-                    print(f"Error processing screenshot placeholder #{idx+1}: {str(e)}")
+                    print(f"Error processing screenshot placeholder '{placeholder.name}': {str(e)}")
+                    self._mark_unavailable(placeholder)
             
-            # Ensure images are not inside code blocks by moving them outside
-            code_blocks = re.finditer(r'```.*?```', content, re.DOTALL)
-            for block in code_blocks:
-                block_content = block.group(0)
-                # Check if there are any images in this code block
-                images = re.findall(r'!\[.*?\]\(.*?\)', block_content)
-                if images:
-                    # For each image found in the code block
-                    for img in images:
-                        # Remove the image from the code block
-                        new_block = block_content.replace(img, '')
-                        # Place the image after the code block
-                        content = content.replace(block_content, new_block + '\n\n' + img)
+            # Persist every cache change of this file at once
+            self._save_screenshot_cache()
+            
+            # Render the document once, then ensure images are not inside code blocks by moving them outside
+            content = move_images_out_of_code_blocks(render_segments(segments))
             
             # Save the updated markdown to a new file
             filename_without_ext = os.path.splitext(file_path)[0]
@@ -267,33 +390,117 @@ class ScreenshotAgent:
             print(f"Error in process_markdown_file: {str(e)}")
             return file_path  # Return original file path if processing fails
     
-    def _get_timestamp_from_interpreter(self, screenshot_description: str) -> Optional[str]:
-        """Get the timestamp for a screenshot from the VideoInterpreter."""
+    def _mark_unavailable(self, placeholder: Placeholder) -> None:
+        """Record a placeholder's screenshot as unavailable and drop it from the rendered document."""
+        self.unavailable_screenshots.append(placeholder.name)
+        placeholder.replacement = ''
+    
+    def _get_timestamps_from_transcript(self, placeholders: List[Tuple[Placeholder, str]]) -> Dict[str, Optional[str]]:
+        """Resolve the timestamps of placeholders that clearly match one moment of the narration.
+        
+        Placeholders without a confident match are left out of the result.
+        """
+        timestamps: Dict[str, Optional[str]] = {}
+        if self.transcript_index is None or not placeholders:
+            return timestamps
+        
+        hits = 0
+        for placeholder, screenshot_name in placeholders:
+            # The Value field describes why the screenshot helps, not what is on screen
+            query = " ".join(part for part in (placeholder.name, placeholder.purpose, placeholder.content) if part)
+            timestamp_seconds = self.transcript_index.resolve(
+                query,
+                min_score=self.config.transcript_min_score,
+                min_margin=self.config.transcript_min_margin
+            )
+            if timestamp_seconds is None:
+                continue
+            hours, remainder = divmod(timestamp_seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            timestamps[screenshot_name] = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+            print(f"Resolved timestamp for '{placeholder.name}' from the transcript: {timestamps[screenshot_name]}")
+            hits += 1
+        
+        misses = len(placeholders) - hits
+        self.transcript_resolver_stats["hits"] += hits
+        self.transcript_resolver_stats["misses"] += misses
+        print(f"Transcript resolver: {hits} hits, {misses} misses "
+              f"(session total: {self.transcript_resolver_stats['hits']} hits, {self.transcript_resolver_stats['misses']} misses)")
+        return timestamps
+    
+    def _get_timestamps_from_interpreter(self, screenshot_descriptions: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """Get timestamps for many screenshots, asking the VideoInterpreter for all of them in one request.
+        
+        Screenshots the interpreter reported as not available map to None; those whose lookup
+        failed are left out of the result.
+        """
+        timestamps: Dict[str, Optional[str]] = {}
+        if self.config.batch_timestamp_queries and len(screenshot_descriptions) > 1:
+            try:
+                timestamps = self._get_timestamps_from_interpreter_batch(screenshot_descriptions)
+            except Exception as e:
+                print(f"Error getting timestamps in a single request, falling back to one request per screenshot: {str(e)}")
+        
+        # Ask individually for every screenshot whose batch answer could not be parsed
+        for screenshot_name, description in screenshot_descriptions.items():
+            if screenshot_name in timestamps:
+                continue
+            try:
+                timestamps[screenshot_name] = self._get_timestamp_from_interpreter(description)
+            except Exception as e:
+                print(f"Error getting timestamp for new screenshot '{screenshot_name}': {str(e)}")
+        return timestamps
+    
+    def _get_timestamps_from_interpreter_batch(self, screenshot_descriptions: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """Send every screenshot description in one request and parse the JSON map of name to timestamp.
+        
+        Names whose answer is missing or malformed are left out of the result.
+        """
         prompt = f"""
-        I need to find a frame in the video that is relevant to the following description:
+        I need to find frames in the video that are relevant to each of the following screenshot descriptions.
+        The descriptions are given as a JSON object mapping a screenshot name to its description:
         
-        {screenshot_description}
+        {json.dumps(screenshot_descriptions, indent=2)}
         
         IMPORTANT RULES:
-        1. ONLY respond with either:
+        1. ONLY respond with a JSON object that maps EVERY screenshot name above to either:
            - A timestamp in HH:MM:SS format (e.g., "00:05:30") if you can find a relevant frame in the video
            - The exact text "screenshot_not_available" if you cannot find any relevant frames to the description
-        2. DO NOT include any explanations or additional text
+        2. DO NOT include any explanations or additional text outside the JSON object
         3. DO NOT use any other format for timestamps
         4. DO NOT provide partial or uncertain responses
         5. Return "screenshot_not_available" very sparingly and only for cases where you cannot find any relevant frames to the description.
         """
         
-        # Get response from VideoInterpreter
-        response = self.video_interpreter.respond(prompt)
-        
-        # Clean up any whitespace and get just the first line
-        response = response.strip().split('\n')[0].strip()
+        # Route each description to the segments of a long video on its own
+        response = self.video_interpreter.query(
+            prompt, query_type="timestamp", route_queries=list(screenshot_descriptions.values())
+        )
         
-        # Check if screenshot is not available
-        if response.lower() == 'screenshot_not_available':
-            return None
+        # Extract the JSON object, ignoring any code fences or surrounding text
+        json_start = response.find('{')
+        json_end = response.rfind('}')
+        if json_start == -1 or json_end < json_start:
+            raise ValueError("response does not contain a JSON object")
+        answers = json.loads(response[json_start:json_end + 1])
+        if not isinstance(answers, dict):
+            raise ValueError("response is not a JSON object")
         
+        timestamps: Dict[str, Optional[str]] = {}
+        for screenshot_name in screenshot_descriptions:
+            answer = answers.get(screenshot_name)
+            if not isinstance(answer, str):
+                continue
+            if answer.strip().lower() == 'screenshot_not_available':
+                timestamps[screenshot_name] = None
+                continue
+            timestamp_hms = self._parse_timestamp(answer)
+            if timestamp_hms is not None:
+                timestamps[screenshot_name] = timestamp_hms
+        return timestamps
+    
+    def _parse_timestamp(self, response: str) -> Optional[str]:
+        """Extract an HH:MM:SS timestamp from an interpreter answer."""
         # Extract timestamp using regex (looking for HH:MM:SS format)
         timestamp_pattern = r'(\d{1,2}):(\d{2}):(\d{2})'
         match = re.search(timestamp_pattern, response)
@@ -311,34 +518,158 @@ class ScreenshotAgent:
             # No valid timestamp found
             return None
     
+    def _get_timestamp_from_interpreter(self, screenshot_description: str) -> Optional[str]:
+        """Get the timestamp for a screenshot from the VideoInterpreter.
+        
+        Returns None if the interpreter reports the screenshot as not available, and raises
+        ValueError if its answer contains no timestamp.
+        """
+        prompt = f"""
+        I need to find a frame in the video that is relevant to the following description:
+        
+        {screenshot_description}
+        
+        IMPORTANT RULES:
+        1. ONLY respond with either:
+           - A timestamp in HH:MM:SS format (e.g., "00:05:30") if you can find a relevant frame in the video
+           - The exact text "screenshot_not_available" if you cannot find any relevant frames to the description
+        2. DO NOT include any explanations or additional text
+        3. DO NOT use any other format for timestamps
+        4. DO NOT provide partial or uncertain responses
+        5. Return "screenshot_not_available" very sparingly and only for cases where you cannot find any relevant frames to the description.
+        """
+        
+        # Get response from VideoInterpreter without adding it to the shared conversation history
+        response = self.video_interpreter.query(prompt, query_type="timestamp", route_queries=[screenshot_description])
+        
+        # Clean up any whitespace and get just the first line
+        response = response.strip().split('\n')[0].strip()
+        
+        # Check if screenshot is not available
+        if response.lower() == 'screenshot_not_available':
+            return None
+        
+        timestamp_hms = self._parse_timestamp(response)
+        if timestamp_hms is None:
+            raise ValueError(f"no timestamp in response: {response}")
+        return timestamp_hms
+    
     def take_screenshot(self, timestamp_seconds: int, screenshot_name: str) -> str:
         """Take a screenshot from the video at the specified timestamp and save it to disk."""
-        try:
-            # Convert seconds to HH:MM:SS format
-            hours = timestamp_seconds // 3600
-            minutes = (timestamp_seconds % 3600) // 60
-            seconds = timestamp_seconds % 60
-            timestamp_hms = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            
-            # Create a unique filename using the name and timestamp
-            screenshot_filename = f"screenshot_{screenshot_name}_{int(time.time())}.png"
-            
-            # Get the screenshot path
-            screenshots_dir = os.path.join(self.output_dir, "screenshots")
-            os.makedirs(screenshots_dir, exist_ok=True)
+        return self.take_screenshots([(timestamp_seconds, screenshot_name)])[0]
+    
+    def take_screenshots(self, requests: List[Tuple[int, str]]) -> List[Optional[str]]:
+        """Take screenshots for many (timestamp_seconds, screenshot_name) pairs in one pass over the video."""
+        screenshot_paths: List[Optional[str]] = [None] * len(requests)
+        if not requests:
+            return screenshot_paths
+        
+        # Get the screenshots directory
+        screenshots_dir = os.path.join(self.output_dir, "screenshots")
+        os.makedirs(screenshots_dir, exist_ok=True)
+        
+        # Assign an output path to every request and reuse stored images where possible
+        extension = IMAGE_EXTENSIONS[self.config.image_format]
+        jobs: Dict[int, List[str]] = {}
+        store_keys: Dict[str, str] = {}
+        reused_paths = set()
+        for idx, (timestamp_seconds, screenshot_name) in enumerate(requests):
+            # Name the file after the screenshot and its timestamp
+            screenshot_filename = f"screenshot_{screenshot_name}_{timestamp_seconds}s.{extension}"
             screenshot_path = os.path.join(screenshots_dir, screenshot_filename)
+            screenshot_paths[idx] = screenshot_path
             
-            # Extract the screenshot using VideoScreenshotTool
-            screenshot = VideoScreenshotTool(self.video_path, timestamp_hms)
-            
-            # Save the screenshot
-            screenshot.save(screenshot_path)
-            
-            print(f"Screenshot saved to {screenshot_path}")
+            try:
+                store_key = self._get_store_key(timestamp_seconds)
+            except OSError as e:
+                print(f"Error hashing video for the screenshot store: {str(e)}")
+                store_key = None
+            if store_key is not None and self.screenshot_store.link_into(store_key, screenshot_path):
+                reused_paths.add(screenshot_path)
+                continue
+            if store_key is not None:
+                store_keys[screenshot_path] = store_key
+            # Never write through an existing file, which may be a hard link into the store
+            if os.path.exists(screenshot_path):
+                os.remove(screenshot_path)
+            jobs.setdefault(timestamp_seconds, []).append(screenshot_path)
+        
+        # Decode and encode in worker processes when parallel mode is enabled
+        errors: Dict[str, Optional[str]] = {}
+        video_index = self._get_video_index() if jobs else None
+        # Pick the sharpest, most stable frame around each timestamp, optionally crop it to
+        # the region that changed, and encode it in the configured format
+        save_options = {
+            "window_seconds": self.config.sharpest_frame_window,
+            "sample_fps": self.config.sharpest_frame_sample_fps,
+            "encoding": self._image_encoding(),
+            "crop_lookback_seconds": self.config.crop_lookback_seconds if self.config.crop_to_changes else 0,
+            "crop_padding": self.config.crop_padding,
+            "crop_min_fraction": self.config.crop_min_fraction,
+        }
+        if self.config.max_workers > 1 and len(jobs) > 1:
+            errors = save_screenshots_parallel(
+                self.video_path, list(jobs.items()), self._get_executor(), self.config.max_workers,
+                video_index=video_index, **save_options
+            )
+        elif jobs:
+            errors = save_screenshots(
+                self.video_path, list(jobs.items()), frame_reader=self.frame_reader,
+                video_index=video_index, **save_options
+            )
+        
+        written_paths = set()
+        for idx, (timestamp_seconds, _) in enumerate(requests):
+            screenshot_path = screenshot_paths[idx]
+            error = errors.get(screenshot_path)
+            if screenshot_path in reused_paths:
+                print(f"Reused stored screenshot for {timestamp_seconds} seconds: {screenshot_path}")
+            elif error is None:
+                print(f"Screenshot saved to {screenshot_path}")
+                written_paths.add(screenshot_path)
+                if screenshot_path in store_keys:
+                    self.screenshot_store.put(store_keys.pop(screenshot_path), screenshot_path)
+            else:
+                print(f"Error taking screenshot at {timestamp_seconds} seconds: {error}")
+                screenshot_paths[idx] = None
+        
+        if self.screenshot_store is not None:
+            self.screenshot_store.flush()
+        
+        # Point near-identical screenshots written by this call at one file; files from earlier
+        # calls or the store may still be referenced elsewhere and are never removed
+        if self.config.dedupe_screenshots:
+            screenshot_hashes = PerceptualHashIndex()
+            deduplicated: Dict[str, str] = {}
+            for idx, screenshot_path in enumerate(screenshot_paths):
+                if screenshot_path not in written_paths:
+                    continue
+                if screenshot_path not in deduplicated:
+                    deduplicated[screenshot_path] = self._deduplicate_screenshot(screenshot_path, screenshot_hashes)
+                screenshot_paths[idx] = deduplicated[screenshot_path]
+        
+        return screenshot_paths
+    
+    def _deduplicate_screenshot(self, screenshot_path: str, screenshot_hashes: PerceptualHashIndex) -> str:
+        """Replace a screenshot with an earlier near-identical one in `screenshot_hashes`, returning the path to use."""
+        from PIL import Image
+        
+        try:
+            with Image.open(screenshot_path) as image:
+                image_hash = dhash(image)
+                colors = color_layout(image)
+        except OSError as e:
+            print(f"Error hashing screenshot {screenshot_path}: {str(e)}")
             return screenshot_path
-        except Exception as e:
-            print(f"Error taking screenshot at {timestamp_seconds} seconds: {str(e)}")
-            return None
+        
+        duplicate_path = screenshot_hashes.find(image_hash, colors, self.config.dedupe_max_distance)
+        if duplicate_path is not None and duplicate_path != screenshot_path and os.path.exists(duplicate_path):
+            os.remove(screenshot_path)
+            print(f"Screenshot {screenshot_path} is a near-duplicate of {duplicate_path}, reusing it")
+            return duplicate_path
+        
+        screenshot_hashes.add(image_hash, colors, screenshot_path)
+        return screenshot_path
 
     def get_unavailable_screenshots(self) -> list:
         """Get the list of screenshots that were not available in the last processed file."""
@@ -435,4 +766,6 @@ if __name__ == "__main__":
     print("\nScreenshot cache content:")
     print(f"Cache saved to: {screenshot_agent.cache_file}")
     for name, path in screenshot_agent.screenshot_cache.items():
-        print(f"  - '{name}': {path}")
\ No newline at end of file
+        print(f"  - '{name}': {path}")
+    
+    screenshot_agent.close()
\ No newline at end of file
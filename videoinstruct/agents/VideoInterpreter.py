@@ -1,11 +1,38 @@
-from google import genai
-from google.genai import types
-import time
+import asyncio
+import functools
 import os
-from typing import Optional, List, Dict, Any
-from IPython.display import Markdown
+import random
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Optional, Iterator, List, Dict, Any, Tuple
+
+from videoinstruct.configs import QueryType, VideoInterpreterConfig
+from videoinstruct.tools.contact_sheet import make_contact_sheets
+from videoinstruct.tools.transcript_index import TranscriptIndex
+from videoinstruct.tools.video_index import VideoIndex
+from videoinstruct.tools.video_proxy import make_analysis_proxy
+from videoinstruct.tools.video_screenshot import VideoFrameReader
+from videoinstruct.tools.video_segments import (
+    VideoSegment, cut_segment, format_timestamp, get_video_duration, merge_segment_answers, plan_segments,
+    route_to_segments
+)
+from videoinstruct.utils.clients import get_gemini_client
+from videoinstruct.utils.conversation_memory import ConversationMemory
+from videoinstruct.utils.hashing import file_content_hash
+from videoinstruct.utils.upload_registry import UploadRegistry
 
-from videoinstruct.configs import VideoInterpreterConfig
+if TYPE_CHECKING:
+    from google import genai
+    from IPython.display import Markdown
+    from PIL import Image
+
+# Sent with the contact sheets; answers containing a fallback marker are asked again against the full video
+CONTACT_SHEET_NOTE = (
+    "The images are contact sheets of frames sampled from the video at its scene changes, each labelled "
+    "with its HH:MM:SS timestamp. Answer from these frames, taking timestamps from the labels. "
+    "If the frames are not enough to answer, reply only with: needs_full_video"
+)
+FULL_VIDEO_MARKERS = ("needs_full_video", "screenshot_not_available")
 
 
 class VideoInterpreter:
@@ -14,47 +41,500 @@ class VideoInterpreter:
     def __init__(
         self,
         config: Optional[VideoInterpreterConfig] = None,
-        video_path: Optional[str] = None
+        video_path: Optional[str] = None,
+        client: Optional[Any] = None
     ) -> None:
-        """Initialize the VideoInterpreter with config and optional video."""
+        """Initialize the VideoInterpreter with config, optional video and optional client (e.g. a test double)."""
         self.config = config or VideoInterpreterConfig()
         
+        # The API key is only required once the client is first used
         self.api_key = self.config.api_key or os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
-            raise ValueError("API key must be provided in config or set as GEMINI_API_KEY environment variable")
-        
-        self.client = genai.Client(api_key=self.api_key)
+        self._client = client
         self.video_file = None
-        self.conversation_history: List[str] = []
+        # Local path of the loaded video, used to build contact sheets
+        self.video_path: Optional[str] = None
+        # Contact sheets of the loaded video, built on the first query type configured to use them
+        self.contact_sheets: Optional[List["Image.Image"]] = None
+        self._contact_sheets_failed = False
+        # Queries answered from the contact sheets, and those that needed the full video after all
+        self.contact_sheet_stats = {"answered": 0, "fallbacks": 0}
+        # Uploaded segments of a long video, used instead of video_file in segmented mode
+        self.segment_files: List[Tuple[VideoSegment, Any]] = []
+        # Transcript used to route questions to segments
+        self.transcript_index: Optional[TranscriptIndex] = None
+        # Background load started by load_video_in_background, waited for before the first question
+        self._pending_load: Optional[Future] = None
+        
+        # Context cache holding the video and system instruction, created on the first question when enabled
+        self.context_cache: Optional[Any] = None
+        self._context_cache_key: Optional[Tuple[str, Optional[str]]] = None
+        self._context_cache_expires_at = 0.0
+        self._context_cache_unavailable = False
+        
+        # Videos uploaded by earlier sessions, reused while the remote file is still live
+        self.upload_registry: Optional[UploadRegistry] = None
+        if self.config.reuse_uploads:
+            self.upload_registry = UploadRegistry(self.config.upload_registry_path)
+        # Names of the remote files this session uploaded; reused uploads may be in use by other sessions
+        self._created_uploads = set()
+        # Conversation resent with every question, compacted once it exceeds the token budget
+        self.memory = ConversationMemory(
+            token_budget=self.config.history_token_budget,
+            keep_recent_turns=self.config.history_recent_turns
+        )
         
         if video_path:
             self.load_video(video_path)
     
+    @property
+    def client(self) -> "genai.Client":
+        """The Gemini client, taken from the shared client registry on first use."""
+        if self._client is None:
+            self._client = get_gemini_client(self.api_key)
+        return self._client
+    
+    @client.setter
+    def client(self, client: "genai.Client") -> None:
+        self._client = client
+    
+    @property
+    def conversation_history(self) -> List[str]:
+        """The turns of the conversation kept verbatim; older turns are in `memory.summary_lines`."""
+        return self.memory.turns
+    
+    @conversation_history.setter
+    def conversation_history(self, turns: List[str]) -> None:
+        self.memory.clear()
+        for turn in turns:
+            self.memory.append(turn)
+    
     def load_video(self, video_path: str) -> None:
-        """Load a video file for interpretation."""
-        self.video_file = self.client.files.upload(file=video_path)
+        """Load a video file for interpretation, reusing a live earlier upload of the same video."""
+        self._delete_context_cache()
+        self._reset_video_state(video_path)
+        video_path = self._get_upload_path(video_path)
+        if not self._load_segments(video_path):
+            self.video_file = self._upload_file(video_path)
+        
+        print('Video loaded successfully')
+        self.memory.clear()
+    
+    async def aload_video(self, video_path: str) -> None:
+        """
+        Load a video file without blocking the event loop.
         
-        while self.video_file.state.name == "PROCESSING":
-            print('.', end='')
-            time.sleep(1)
-            self.video_file = self.client.files.get(name=self.video_file.name)
+        Hashing, uploading and every status request run in the default executor,
+        and the event loop sleeps between status requests with the same jittered
+        exponential backoff and timeout as load_video.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._delete_context_cache)
+        self._reset_video_state(video_path)
+        video_path = await loop.run_in_executor(None, self._get_upload_path, video_path)
+        if await loop.run_in_executor(None, self._load_segments, video_path):
+            print('Video loaded successfully')
+            self.memory.clear()
+            return
+        registry_key, self.video_file = await loop.run_in_executor(None, self._find_registered_upload, video_path)
         
-        if self.video_file.state.name == "FAILED":
-            raise ValueError(f"Video processing failed: {self.video_file.state.name}")
+        if self.video_file is None:
+            video_file = await loop.run_in_executor(None, functools.partial(self.client.files.upload, file=video_path))
+            self._created_uploads.add(video_file.name)
+            try:
+                deadline = self._processing_deadline()
+                for delay in self._poll_delays():
+                    if not self._is_processing(deadline, video_file):
+                        break
+                    await asyncio.sleep(delay)
+                    video_file = await loop.run_in_executor(
+                        None, functools.partial(self.client.files.get, name=video_file.name)
+                    )
+            except Exception:
+                await loop.run_in_executor(None, self._discard_upload, video_file.name)
+                raise
+            self.video_file = video_file
+            await loop.run_in_executor(None, self._register_upload, registry_key, self.video_file)
         
         print('Video loaded successfully')
-        self.conversation_history = []
+        self.memory.clear()
     
-    def respond(self, question: str) -> str:
-        """Respond to a question about the loaded video."""
-        if not self.video_file:
+    def load_video_in_background(self, video_path: str) -> Future:
+        """
+        Start loading a video on a background thread and return its Future.
+        
+        Call `.result()` on the handle, or `await asyncio.wrap_future(handle)`, to
+        wait for the upload. Questions asked before it finishes wait for it as well.
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="VideoInterpreter-upload")
+        self._pending_load = executor.submit(asyncio.run, self.aload_video(video_path))
+        executor.shutdown(wait=False)
+        return self._pending_load
+    
+    def _reset_video_state(self, video_path: Optional[str]) -> None:
+        """Forget the uploads and contact sheets of the previous video, and the error of a finished background load."""
+        if self._pending_load is not None and self._pending_load.done():
+            self._pending_load = None
+        self.video_file = None
+        self.segment_files = []
+        self.video_path = video_path
+        self.contact_sheets = None
+        self._contact_sheets_failed = False
+    
+    def _ensure_video_loaded(self) -> None:
+        """Wait for a background load, re-raising its error until another video is loaded, then check that a video is loaded."""
+        if self._pending_load is not None:
+            self._pending_load.result()
+        if not self.video_file and not self.segment_files:
             raise ValueError("No video loaded. Please load a video first using load_video().")
+    
+    def set_transcription(self, transcription: str) -> None:
+        """Set the timestamped transcription used to route questions to the segments of a long video."""
+        if self.config.segment_min_duration is None:
+            return
+        self.transcript_index = TranscriptIndex.from_transcription(transcription)
+        if not len(self.transcript_index):
+            self.transcript_index = None
+    
+    def _get_upload_path(self, video_path: str) -> str:
+        """Return the file to upload for a video: its analysis proxy when enabled, otherwise the video itself."""
+        if not self.config.use_analysis_proxy:
+            return video_path
+        
+        proxy_path = make_analysis_proxy(
+            video_path,
+            cache_dir=self.config.proxy_cache_dir,
+            max_height=self.config.proxy_max_height,
+            fps=self.config.proxy_fps,
+            video_bitrate=self.config.proxy_video_bitrate,
+            keep_audio=self.config.proxy_keep_audio,
+            audio_bitrate=self.config.proxy_audio_bitrate
+        )
+        if proxy_path != video_path:
+            print(
+                f"Uploading analysis proxy: {os.path.getsize(proxy_path) / 1e6:.1f} MB "
+                f"instead of {os.path.getsize(video_path) / 1e6:.1f} MB"
+            )
+        return proxy_path
+    
+    def _load_segments(self, video_path: str) -> bool:
+        """
+        Upload a long video as overlapping segments, concurrently.
+        
+        Returns False, uploading nothing, when segmented mode is off or the video is
+        shorter than `segment_min_duration`.
+        """
+        if self.config.segment_min_duration is None:
+            return False
+        duration = get_video_duration(video_path)
+        if duration < self.config.segment_min_duration:
+            return False
+        
+        segments = plan_segments(duration, self.config.segment_seconds, self.config.segment_overlap_seconds)
+        print(f"Video is {format_timestamp(duration)} long, uploading it as {len(segments)} segments")
         
-        self.conversation_history.append(f"user: {question}")
+        def load_segment(segment: VideoSegment) -> Tuple[VideoSegment, Any]:
+            segment_path = cut_segment(video_path, segment, self.config.segment_cache_dir)
+            return segment, self._upload_file(segment_path)
         
-        contents = [self.video_file]
-        if self.conversation_history:
-            contents.append(", ".join(self.conversation_history))
+        with ThreadPoolExecutor(
+            max_workers=self.config.segment_upload_workers, thread_name_prefix="VideoInterpreter-segment"
+        ) as executor:
+            futures = [executor.submit(load_segment, segment) for segment in segments]
+        
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            # Delete the segments this session uploaded, so a failed load leaves nothing behind on the server
+            for future in futures:
+                if future.exception() is None and future.result()[1].name in self._created_uploads:
+                    self._discard_upload(future.result()[1].name)
+            raise errors[0]
+        self.segment_files = [future.result() for future in futures]
+        return True
+    
+    def _upload_file(self, video_path: str) -> Any:
+        """Upload a video and wait until it is processed, reusing a live earlier upload of the same file."""
+        registry_key, video_file = self._find_registered_upload(video_path)
+        if video_file is None:
+            video_file = self.client.files.upload(file=video_path)
+            self._created_uploads.add(video_file.name)
+            try:
+                video_file = self._wait_for_file(video_file)
+            except Exception:
+                self._discard_upload(video_file.name)
+                raise
+            self._register_upload(registry_key, video_file)
+        return video_file
+    
+    def _discard_upload(self, name: str) -> None:
+        """Delete a file this session uploaded but could not use, e.g. because its processing failed."""
+        self._created_uploads.discard(name)
+        if self.upload_registry is not None:
+            self.upload_registry.remove_file(name)
+        try:
+            self.client.files.delete(name=name)
+        except Exception as e:
+            print(f"Error deleting unusable upload {name}: {str(e)}")
+    
+    def _find_registered_upload(self, video_path: str) -> Tuple[Optional[str], Optional[Any]]:
+        """Return the registry key of a video and its reusable earlier upload, if any."""
+        if self.upload_registry is None:
+            return None, None
+        registry_key = self.upload_registry.make_key(file_content_hash(video_path), self.api_key)
+        return registry_key, self._get_registered_upload(registry_key)
+    
+    def _register_upload(self, registry_key: Optional[str], video_file: Any) -> None:
+        """Record a freshly uploaded video in the registry."""
+        if registry_key is not None:
+            self.upload_registry.put(registry_key, video_file.name, self._expiration_timestamp(video_file))
+    
+    def _get_registered_upload(self, registry_key: str) -> Optional[Any]:
+        """Return the registered upload for a video if the remote file still exists and did not fail."""
+        entry = self.upload_registry.get(registry_key)
+        if entry is None:
+            return None
+        
+        try:
+            # Another session may have registered the file while it was still processing
+            video_file = self._wait_for_file(self.client.files.get(name=entry["name"]))
+        except Exception as e:
+            print(f"Earlier upload {entry['name']} cannot be reused, uploading the video again: {str(e)}")
+            self.upload_registry.remove(registry_key)
+            return None
+        
+        print(f"Reusing earlier upload of the video: {entry['name']}")
+        return video_file
+    
+    def _poll_delays(self) -> Iterator[float]:
+        """Yield the waits between status requests: exponential backoff with up to 50% jitter."""
+        delay = self.config.poll_initial_interval
+        while True:
+            yield delay * random.uniform(0.5, 1.0)
+            delay = min(delay * self.config.poll_backoff, self.config.poll_max_interval)
+    
+    def _processing_deadline(self) -> Optional[float]:
+        """Return the monotonic time by which processing must have finished, if a timeout is configured."""
+        if self.config.processing_timeout is None:
+            return None
+        return time.monotonic() + self.config.processing_timeout
+    
+    def _is_processing(self, deadline: Optional[float], video_file: Any) -> bool:
+        """Return True while an uploaded file is processing; raise if it failed or the deadline passed."""
+        state = video_file.state.name
+        if state == "FAILED":
+            raise ValueError(f"Video processing failed: {state}")
+        if state != "PROCESSING":
+            return False
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(
+                f"Video {video_file.name} was still processing after {self.config.processing_timeout} seconds"
+            )
+        return True
+    
+    def _wait_for_file(self, video_file: Any) -> Any:
+        """Poll an uploaded file until the files API has finished processing it, and return its final state."""
+        deadline = self._processing_deadline()
+        for delay in self._poll_delays():
+            if not self._is_processing(deadline, video_file):
+                break
+            time.sleep(delay)
+            video_file = self.client.files.get(name=video_file.name)
+        return video_file
+    
+    @staticmethod
+    def _expiration_timestamp(video_file: Any) -> Optional[float]:
+        """Return when an uploaded file expires as a Unix time, if the API reports it."""
+        expiration_time = getattr(video_file, "expiration_time", None)
+        return expiration_time.timestamp() if expiration_time is not None else None
+    
+    def respond(self, question: str, query_type: QueryType = "question") -> str:
+        """
+        Respond to a question about the loaded video.
+        
+        `query_type` ("description", "question" or "timestamp") selects whether the
+        question is first tried against the contact sheets, see `contact_sheet_query_types`.
+        """
+        self._ensure_video_loaded()
+        
+        self.memory.append(f"user: {question}")
+        
+        response_text = self._ask_by_query_type(self.memory.render(), query_type, route_queries=[question])
+        
+        self.memory.append(f"assistant: {response_text}")
+        
+        return response_text
+    
+    def query(self, question: str, query_type: QueryType = "question", route_queries: Optional[List[str]] = None) -> str:
+        """
+        Answer a one-off question about the loaded video without reading or writing the conversation history.
+        
+        For a long video, `route_queries` are matched against the transcript one by one to pick the
+        segments to ask, e.g. each screenshot description of a batched lookup; by default the question is.
+        """
+        self._ensure_video_loaded()
+        
+        return self._ask_by_query_type(question, query_type, route_queries)
+    
+    def _ask_by_query_type(self, prompt: str, query_type: QueryType, route_queries: Optional[List[str]] = None) -> str:
+        """Answer from the contact sheets if enabled for `query_type`, falling back to the full video when they are not enough."""
+        if query_type in self.config.contact_sheet_query_types:
+            contact_sheets = self._get_contact_sheets()
+            if contact_sheets:
+                answer = self._generate([*contact_sheets, CONTACT_SHEET_NOTE, prompt])
+                if not any(marker in answer.lower() for marker in FULL_VIDEO_MARKERS):
+                    self.contact_sheet_stats["answered"] += 1
+                    return answer
+                self.contact_sheet_stats["fallbacks"] += 1
+        return self._ask(prompt, route_queries, query_type)
+    
+    def _get_contact_sheets(self) -> List["Image.Image"]:
+        """Return the contact sheets of the loaded video, building them on first use; empty if they cannot be built."""
+        if self.contact_sheets is None and not self._contact_sheets_failed and self.video_path:
+            try:
+                with VideoFrameReader(max_open=1) as frame_reader:
+                    self.contact_sheets = make_contact_sheets(
+                        self.video_path,
+                        frame_reader,
+                        VideoIndex.load_or_build(self.video_path),
+                        max_frames=self.config.contact_sheet_max_frames,
+                        columns=self.config.contact_sheet_columns,
+                        rows=self.config.contact_sheet_rows,
+                        tile_width=self.config.contact_sheet_tile_width,
+                        threshold=self.config.contact_sheet_scene_threshold,
+                        max_interval_seconds=self.config.contact_sheet_max_interval
+                    )
+                print(f"Built {len(self.contact_sheets)} contact sheets of the video")
+            except Exception as e:
+                print(f"Error building contact sheets, using the full video instead: {str(e)}")
+                self._contact_sheets_failed = True
+        return self.contact_sheets or []
+    
+    def _ask(self, prompt: str, route_queries: Optional[List[str]] = None, query_type: QueryType = "question") -> str:
+        """Send a prompt about the loaded video, through the context cache when it is enabled."""
+        if self.segment_files:
+            return self._ask_segments(prompt, route_queries or [prompt], query_type)
+        
+        cache_name = self._get_context_cache_name()
+        if cache_name is None:
+            return self._generate([self.video_file, prompt])
+        
+        try:
+            return self._generate([prompt], cached_content=cache_name)
+        except Exception as e:
+            # The cache expired or was deleted on the server after the TTL check
+            if getattr(e, "code", None) not in (403, 404):
+                raise
+            print(f"Context cache {cache_name} is gone, sending the video directly: {str(e)}")
+            self.context_cache = None
+            return self._generate([self.video_file, prompt])
+    
+    def _ask_segments(self, prompt: str, route_queries: List[str], query_type: QueryType = "question") -> str:
+        """Ask the segments relevant to any of `route_queries` concurrently and merge their answers into full-video time."""
+        segment_files = dict(self.segment_files)
+        segments: List[VideoSegment] = []
+        for route_query in route_queries:
+            for segment in route_to_segments(
+                list(segment_files),
+                self.transcript_index,
+                route_query,
+                max_segments=self.config.segment_max_routed,
+                min_score=self.config.segment_route_min_score
+            ):
+                if segment not in segments:
+                    segments.append(segment)
+        
+        def ask_segment(segment: VideoSegment) -> str:
+            clip_note = (
+                f"This clip is the part of a longer video from {format_timestamp(segment.start_seconds)} "
+                f"to {format_timestamp(segment.end_seconds)}. Give every timestamp relative to the start of this clip."
+            )
+            return self._generate([segment_files[segment], clip_note, prompt])
+        
+        with ThreadPoolExecutor(
+            max_workers=min(len(segments), self.config.segment_upload_workers), thread_name_prefix="VideoInterpreter-ask"
+        ) as executor:
+            answers = list(executor.map(ask_segment, segments))
+        return merge_segment_answers(list(zip(segments, answers)), query_type=query_type)
+    
+    def _get_context_cache_name(self) -> Optional[str]:
+        """Return the name of a live context cache for the loaded video, creating or extending it as needed."""
+        if not self.config.use_context_cache or self._context_cache_unavailable:
+            return None
+        
+        cache_key = (self.video_file.name, self.config.system_instruction)
+        if self.context_cache is not None and self._context_cache_key != cache_key:
+            self._delete_context_cache()
+        
+        if self.context_cache is not None:
+            if self._context_cache_expires_at - time.time() < self.config.context_cache_refresh_seconds:
+                self._refresh_context_cache()
+        if self.context_cache is None:
+            self._create_context_cache(cache_key)
+        
+        return self.context_cache.name if self.context_cache is not None else None
+    
+    def _create_context_cache(self, cache_key: Tuple[str, Optional[str]]) -> None:
+        """Cache the video and system instruction; on failure, send the video with every request instead."""
+        from google.genai import types
+        
+        try:
+            self.context_cache = self.client.caches.create(
+                model=self.config.model,
+                config=types.CreateCachedContentConfig(
+                    display_name=f"videoinstruct-{self.video_file.name.split('/')[-1]}",
+                    contents=[self.video_file],
+                    system_instruction=self.config.system_instruction,
+                    ttl=f"{self.config.context_cache_ttl}s",
+                ),
+            )
+        except Exception as e:
+            # E.g. a model without caching support or a video below the minimum cacheable size
+            print(f"Context caching is unavailable, sending the video with every request: {str(e)}")
+            self._context_cache_unavailable = True
+            return
+        
+        self._context_cache_key = cache_key
+        self._context_cache_expires_at = self._cache_expiration_timestamp(self.context_cache)
+        print(f"Created context cache {self.context_cache.name}")
+    
+    def _refresh_context_cache(self) -> None:
+        """Extend the TTL of the context cache, dropping it if it no longer exists."""
+        from google.genai import types
+        
+        try:
+            self.context_cache = self.client.caches.update(
+                name=self.context_cache.name,
+                config=types.UpdateCachedContentConfig(ttl=f"{self.config.context_cache_ttl}s"),
+            )
+        except Exception as e:
+            print(f"Context cache {self.context_cache.name} could not be extended, creating a new one: {str(e)}")
+            self.context_cache = None
+            return
+        self._context_cache_expires_at = self._cache_expiration_timestamp(self.context_cache)
+    
+    def _delete_context_cache(self) -> None:
+        """Delete the context cache, if any, so it stops accruing storage time."""
+        self._context_cache_unavailable = False
+        if self.context_cache is None:
+            return
+        
+        cache_name, self.context_cache = self.context_cache.name, None
+        self._context_cache_key = None
+        try:
+            self.client.caches.delete(name=cache_name)
+        except Exception as e:
+            # The cache expires on its own after its TTL
+            print(f"Error deleting context cache {cache_name}: {str(e)}")
+    
+    def _cache_expiration_timestamp(self, cache: Any) -> float:
+        """Return when a context cache expires as a Unix time, assuming the configured TTL if the API does not say."""
+        expire_time = getattr(cache, "expire_time", None)
+        if expire_time is not None:
+            return expire_time.timestamp()
+        return time.time() + self.config.context_cache_ttl
+    
+    def _generate(self, contents: List[Any], cached_content: Optional[str] = None) -> str:
+        """Send contents to the model with the configured generation parameters, optionally against a context cache."""
+        from google.genai import types
         
         generate_config: Dict[str, Any] = {}
         
@@ -73,32 +553,57 @@ class VideoInterpreter:
             if getattr(self.config, param, None) is not None:
                 generate_config[config_key] = getattr(self.config, param)
         
+        if cached_content is not None:
+            # The system instruction is part of the cache and may not be sent again
+            generate_config.pop("system_instruction", None)
+            generate_config["cached_content"] = cached_content
+        
         response = self.client.models.generate_content(
             contents=contents,
             model=self.config.model,
             config=types.GenerateContentConfig(**generate_config),
         )
         
-        self.conversation_history.append(f"assistant: {response.text}")
-        
         return response.text
     
     def remove_memory(self) -> None:
         """Reset the conversation history while keeping the video loaded."""
-        self.conversation_history = []
+        self.memory.clear()
     
     def delete_video(self) -> None:
-        """Delete the loaded video and reset the conversation history."""
-        if not self.video_file:
+        """
+        Delete the loaded video and its context cache and reset the conversation history.
+        
+        Only files this session uploaded are deleted from the server; uploads reused
+        from the registry may be in use by other sessions and are just released.
+        """
+        if self._pending_load is not None:
+            # A failed load has already deleted its upload, so only its completion matters here
+            wait([self._pending_load])
+        self._delete_context_cache()
+        if not self.video_file and not self.segment_files:
             return
         
+        from google import genai
+        
         try:
-            self.client.files.delete(name=self.video_file.name)
+            uploaded_files = [self.video_file] if self.video_file else [file for _, file in self.segment_files]
+            for uploaded_file in uploaded_files:
+                if uploaded_file.name not in self._created_uploads:
+                    print(f"Keeping reused upload {uploaded_file.name}, other sessions may still use it")
+                    continue
+                self.client.files.delete(name=uploaded_file.name)
+                self._created_uploads.discard(uploaded_file.name)
+                if self.upload_registry is not None:
+                    self.upload_registry.remove_file(uploaded_file.name)
             self.video_file = None
-            self.conversation_history = []
+            self.segment_files = []
+            self.memory.clear()
         except genai.errors.ClientError as e:
             raise ValueError(f"Error deleting video: {e.message}")
     
-    def display_response(self, response_text: str) -> Markdown:
+    def display_response(self, response_text: str) -> "Markdown":
         """Display the response as Markdown."""
+        from IPython.display import Markdown
+        
         return Markdown(response_text)
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""
+Agents of the VideoInstruct pipeline.
+
+Agent classes are imported on first access (PEP 562), so importing this
+package does not load the provider SDKs and video libraries they depend on.
+"""
+from videoinstruct.utils.lazy import lazy_module_attrs
+
+# {attribute: module that defines it}
+_LAZY_ATTRIBUTES = {
+    'DocGenerator': 'videoinstruct.agents.DocGenerator',
+    'DocEvaluator': 'videoinstruct.agents.DocEvaluator',
+    'VideoInterpreter': 'videoinstruct.agents.VideoInterpreter',
+    'ScreenshotAgent': 'videoinstruct.agents.ScreenshotAgent',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_ATTRIBUTES, __all__)
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any, ClassVar
+from typing import List, Literal, Optional, Dict, Any, ClassVar
 from pydantic import BaseModel, Field
 
 from videoinstruct.prompt_loader import (
@@ -7,6 +7,9 @@ from videoinstruct.prompt_loader import (
     SCREENSHOT_AGENT_SYSTEM_PROMPT
 )
 
+# Kinds of VideoInterpreter requests, see VideoInterpreterConfig.contact_sheet_query_types
+QueryType = Literal["description", "question", "timestamp"]
+
 
 class VideoInterpreterConfig(BaseModel):
     """Configuration for the VideoInterpreter class.
@@ -25,6 +28,38 @@ class VideoInterpreterConfig(BaseModel):
         response_mime_type (Optional[str]): Expected MIME type of the response.
         stop_sequences (Optional[List[str]]): Sequences where the model should stop generating.
         seed (Optional[int]): Random seed for reproducible results.
+        reuse_uploads (bool): Reuse a live earlier upload of the same video instead of uploading it again.
+        upload_registry_path (Optional[str]): Registry of uploaded videos. If None, uses ~/.cache/videoinstruct/uploads.json.
+        poll_initial_interval (float): Seconds before the first upload status request.
+        poll_max_interval (float): Maximum seconds between upload status requests.
+        poll_backoff (float): Factor the wait between status requests grows by, with up to 50% random jitter.
+        processing_timeout (Optional[float]): Seconds to wait for an upload to finish processing. If None, waits indefinitely.
+        history_token_budget (Optional[int]): Tokens of conversation history sent with each question; older turns are summarized beyond it. If None, the full history is always sent.
+        history_recent_turns (int): Number of most recent turns always sent verbatim.
+        use_context_cache (bool): Cache the video and system instruction with the Gemini caching API once per video, so later requests do not resend them.
+        context_cache_ttl (int): Lifetime of the context cache in seconds.
+        context_cache_refresh_seconds (float): Extend the context cache before a request when it expires within this many seconds.
+        use_analysis_proxy (bool): Upload a low-bitrate transcode of the video instead of the original. Screenshots are still taken from the original.
+        proxy_cache_dir (Optional[str]): Directory of cached proxies. If None, uses ~/.cache/videoinstruct/proxies.
+        proxy_max_height (int): Maximum height of the proxy in pixels.
+        proxy_fps (float): Frame rate of the proxy.
+        proxy_video_bitrate (str): Video bitrate of the proxy, e.g. "500k".
+        proxy_keep_audio (bool): Keep a mono audio track in the proxy instead of muting it.
+        proxy_audio_bitrate (str): Audio bitrate of the proxy, e.g. "48k".
+        segment_min_duration (Optional[float]): Split videos at least this many seconds long into overlapping segments, uploaded concurrently, and ask each question only of the segments it concerns. If None, videos are never split.
+        segment_seconds (float): Length of each segment in seconds.
+        segment_overlap_seconds (float): Seconds shared by consecutive segments.
+        segment_upload_workers (int): Number of segments cut and uploaded, or asked a question, at the same time.
+        segment_max_routed (int): Maximum number of segments a question matched in the transcript is asked of.
+        segment_route_min_score (float): Transcript match score needed to route a question; weaker matches are asked of every segment.
+        segment_cache_dir (Optional[str]): Directory of cached segment files. If None, uses ~/.cache/videoinstruct/segments.
+        contact_sheet_query_types (List[QueryType]): Query types ("description", "question", "timestamp") first answered from contact sheets of frames sampled at scene changes instead of the full video. The full video is used when the sheets are not enough.
+        contact_sheet_max_frames (int): Maximum number of frames over all contact sheets.
+        contact_sheet_columns (int): Frames per row of a contact sheet.
+        contact_sheet_rows (int): Rows per contact sheet.
+        contact_sheet_tile_width (int): Width of each frame on a contact sheet in pixels.
+        contact_sheet_scene_threshold (float): Normalized per-second change that starts a new scene.
+        contact_sheet_max_interval (int): Maximum seconds between two sampled frames.
     """
     api_key: Optional[str] = None
     model: str = Field(default="gemini-2.0-flash")
@@ -36,6 +71,38 @@ class VideoInterpreterConfig(BaseModel):
     response_mime_type: Optional[str] = None
     stop_sequences: Optional[List[str]] = None
     seed: Optional[int] = None
+    reuse_uploads: bool = Field(default=True)
+    upload_registry_path: Optional[str] = None
+    poll_initial_interval: float = Field(default=1.0)
+    poll_max_interval: float = Field(default=15.0)
+    poll_backoff: float = Field(default=2.0)
+    processing_timeout: Optional[float] = Field(default=900.0)
+    history_token_budget: Optional[int] = Field(default=8000)
+    history_recent_turns: int = Field(default=6)
+    use_context_cache: bool = Field(default=False)
+    context_cache_ttl: int = Field(default=3600)
+    context_cache_refresh_seconds: float = Field(default=300.0)
+    use_analysis_proxy: bool = Field(default=False)
+    proxy_cache_dir: Optional[str] = None
+    proxy_max_height: int = Field(default=720)
+    proxy_fps: float = Field(default=5.0)
+    proxy_video_bitrate: str = Field(default="500k")
+    proxy_keep_audio: bool = Field(default=True)
+    proxy_audio_bitrate: str = Field(default="48k")
+    segment_min_duration: Optional[float] = None
+    segment_seconds: float = Field(default=600.0)
+    segment_overlap_seconds: float = Field(default=30.0)
+    segment_upload_workers: int = Field(default=4)
+    segment_max_routed: int = Field(default=2)
+    segment_route_min_score: float = Field(default=4.0)
+    segment_cache_dir: Optional[str] = None
+    contact_sheet_query_types: List[QueryType] = Field(default=[])
+    contact_sheet_max_frames: int = Field(default=48)
+    contact_sheet_columns: int = Field(default=4)
+    contact_sheet_rows: int = Field(default=3)
+    contact_sheet_tile_width: int = Field(default=480)
+    contact_sheet_scene_threshold: float = Field(default=0.05)
+    contact_sheet_max_interval: int = Field(default=60)
 
 
 class DocGeneratorConfig(BaseModel):
@@ -113,6 +180,30 @@ class ScreenshotAgentConfig(BaseModel):
         top_p (Optional[float]): Nucleus sampling parameter.
         top_k (Optional[int]): Top-k sampling parameter.
         seed (Optional[int]): Random seed for reproducible results.
+        max_workers (int): Worker processes for screenshot extraction and encoding (1 disables parallel mode).
+        use_video_index (bool): Build a keyframe/scene-change index to speed up seeks and avoid mid-transition frames.
+        video_index_dir (Optional[str]): Directory for on-disk video indexes. If None, uses ~/.cache/videoinstruct.
+        stable_frame_threshold (float): Maximum normalized frame change for a frame to count as stable.
+        stable_frame_max_shift (int): Maximum seconds a timestamp may be moved forward onto a stable frame.
+        use_screenshot_store (bool): Reuse screenshots across sessions through a content-addressed store on disk (off by default).
+        screenshot_store_dir (Optional[str]): Store directory. If None, uses ~/.cache/videoinstruct/screenshots.
+        screenshot_store_max_mb (int): Size cap of the store (default 2048 MB); least recently used images are evicted beyond it.
+        batch_timestamp_queries (bool): Resolve all screenshot timestamps of a document in one interpreter request.
+        use_transcript_resolver (bool): Resolve screenshot timestamps from the transcript when the match is unambiguous.
+        transcript_min_score (float): Minimum BM25 score of a transcript match.
+        transcript_min_margin (float): Minimum ratio between the best transcript match and the best match elsewhere in the video.
+        sharpest_frame_window (float): Seconds around each timestamp searched for the sharpest, most stable frame. 0 disables the search.
+        sharpest_frame_sample_fps (float): Candidate frames decoded per second within the window. 0 disables the search.
+        dedupe_screenshots (bool): Collapse visually near-identical screenshots taken for the same document onto one file (off by default).
+        dedupe_max_distance (int): Maximum number of differing bits (out of 256) between perceptual hashes of duplicates.
+        image_format (Literal["png", "jpeg", "webp"]): Screenshot file format.
+        image_quality (int): JPEG/WebP quality from 1 to 100.
+        max_image_width (Optional[int]): Screenshots wider than this are downscaled. If None, keeps the video resolution.
+        png_compress_level (int): PNG zlib compression level from 0 (fastest) to 9 (smallest).
+        crop_to_changes (bool): Crop screenshots to the region that changed during the preceding seconds.
+        crop_lookback_seconds (int): Seconds before the screenshot compared against to find the changed region.
+        crop_padding (int): Pixels kept around the changed region.
+        crop_min_fraction (float): Minimum crop size as a fraction of the frame's width and height.
     """
     api_key: Optional[str] = None
     model: str = Field(default="gemini-2.0-flash")
@@ -122,6 +213,30 @@ class ScreenshotAgentConfig(BaseModel):
     top_p: Optional[float] = None
     top_k: Optional[int] = None
     seed: Optional[int] = None
+    max_workers: int = Field(default=1)
+    use_video_index: bool = Field(default=False)
+    video_index_dir: Optional[str] = None
+    stable_frame_threshold: float = Field(default=0.02)
+    stable_frame_max_shift: int = Field(default=3)
+    use_screenshot_store: bool = Field(default=False)
+    screenshot_store_dir: Optional[str] = None
+    screenshot_store_max_mb: int = Field(default=2048)
+    batch_timestamp_queries: bool = Field(default=True)
+    use_transcript_resolver: bool = Field(default=True)
+    transcript_min_score: float = Field(default=4.0)
+    transcript_min_margin: float = Field(default=1.5)
+    sharpest_frame_window: float = Field(default=1.0)
+    sharpest_frame_sample_fps: float = Field(default=6.0)
+    dedupe_screenshots: bool = Field(default=False)
+    dedupe_max_distance: int = Field(default=4)
+    image_format: Literal["png", "jpeg", "webp"] = Field(default="png")
+    image_quality: int = Field(default=85, ge=1, le=100)
+    max_image_width: Optional[int] = None
+    png_compress_level: int = Field(default=6, ge=0, le=9)
+    crop_to_changes: bool = Field(default=False)
+    crop_lookback_seconds: int = Field(default=3)
+    crop_padding: int = Field(default=48)
+    crop_min_fraction: float = Field(default=0.4)
 
 
 class ResponseType(BaseModel):
@@ -153,6 +268,8 @@ class VideoInstructorConfig(BaseModel):
         output_dir (str): Directory for final documentation output (default: "output").
         temp_dir (str): Directory for temporary files (default: "temp").
         generate_pdf_for_all_versions (bool): Whether to generate PDFs for all doc versions.
+        concurrent_startup (bool): Upload the video and request its initial description while the
+            transcription is extracted, instead of running the three steps in sequence.
     """
     doc_generator_config: DocGeneratorConfig = Field(default_factory=DocGeneratorConfig)
     video_interpreter_config: VideoInterpreterConfig = Field(default_factory=VideoInterpreterConfig)
@@ -161,4 +278,5 @@ class VideoInstructorConfig(BaseModel):
     max_iterations: int = Field(default=10)
     output_dir: str = Field(default="output")
     temp_dir: str = Field(default="temp")
-    generate_pdf_for_all_versions: bool = Field(default=True)  # Whether to generate PDFs for all versions, not just final 
\ No newline at end of file
+    generate_pdf_for_all_versions: bool = Field(default=True)  # Whether to generate PDFs for all versions, not just final 
+    concurrent_startup: bool = Field(default=True)
\ No newline at end of file
@@ -0,0 +1,135 @@
+from typing import TYPE_CHECKING, List, Sequence
+
+import numpy as np
+
+from videoinstruct.tools.video_segments import format_timestamp
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+def select_scene_times(video_index, max_frames=48, threshold=0.05, min_gap_seconds=2, max_interval_seconds=60):
+    """
+    Pick the seconds of a video worth showing on a contact sheet.
+
+    A frame is taken at the start of the video and once the screen has settled
+    after every scene change (a per-second change above `threshold`). Changes
+    closer than `min_gap_seconds` to the previous one count as the same scene,
+    static stretches longer than `max_interval_seconds` get extra frames, and
+    if more than `max_frames` remain, evenly spaced ones are kept.
+
+    Args:
+        video_index (VideoIndex): Scene-change signal of the video
+        max_frames (int): Maximum number of frames
+        threshold (float): Normalized per-second change that starts a new scene
+        min_gap_seconds (int): Minimum seconds between two scene starts
+        max_interval_seconds (int): Maximum seconds between two consecutive frames
+
+    Returns:
+        List[int]: Frame times in seconds, ascending
+    """
+    signal = video_index.frame_differences
+    if not len(signal):
+        return [0]
+
+    scene_starts = [0]
+    for second in np.flatnonzero(signal > threshold):
+        if second - scene_starts[-1] >= min_gap_seconds:
+            scene_starts.append(int(second))
+
+    times = sorted({min(video_index.find_stable_time(second), len(signal) - 1) for second in scene_starts})
+    filled = []
+    for start, end in zip(times, times[1:] + [len(signal)]):
+        filled.extend(range(start, end, max_interval_seconds))
+
+    if len(filled) > max_frames:
+        keep = np.unique(np.linspace(0, len(filled) - 1, max_frames).round().astype(int))
+        filled = [filled[position] for position in keep]
+    return filled
+
+
+def _label_font(size):
+    """Return the default font at `size` pixels, or its fixed-size bitmap version on old Pillow releases."""
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def tile_contact_sheets(frames: Sequence[np.ndarray], times: Sequence[float], columns=4, rows=3, tile_width=480):
+    """
+    Tile frames into contact sheets, each frame labelled with its HH:MM:SS timestamp.
+
+    Args:
+        frames (Sequence[np.ndarray]): RGB frames of the same size
+        times (Sequence[float]): Timestamp of each frame in seconds
+        columns (int): Frames per row
+        rows (int): Rows per sheet
+        tile_width (int): Width of each frame on the sheet in pixels
+
+    Returns:
+        List[Image.Image]: The sheets, in timestamp order
+    """
+    if not frames:
+        return []
+
+    from PIL import Image, ImageDraw
+
+    height, width = frames[0].shape[:2]
+    tile_height = max(1, round(height * tile_width / width))
+    font = _label_font(max(12, tile_width // 20))
+    per_sheet = columns * rows
+
+    sheets = []
+    for first in range(0, len(frames), per_sheet):
+        sheet_frames = frames[first:first + per_sheet]
+        sheet_rows = -(-len(sheet_frames) // columns)
+        canvas = np.zeros((sheet_rows * tile_height, columns * tile_width, 3), dtype=np.uint8)
+        for position, frame in enumerate(sheet_frames):
+            tile = Image.fromarray(np.asarray(frame, dtype=np.uint8)).resize((tile_width, tile_height), Image.LANCZOS)
+            row, column = divmod(position, columns)
+            canvas[row * tile_height:(row + 1) * tile_height, column * tile_width:(column + 1) * tile_width] = tile
+
+        sheet = Image.fromarray(canvas)
+        draw = ImageDraw.Draw(sheet)
+        for position, time_seconds in enumerate(times[first:first + per_sheet]):
+            row, column = divmod(position, columns)
+            label = format_timestamp(time_seconds)
+            left, top = column * tile_width, row * tile_height
+            box = draw.textbbox((left + 4, top + 4), label, font=font)
+            draw.rectangle((box[0] - 4, box[1] - 4, box[2] + 4, box[3] + 4), fill=(0, 0, 0))
+            draw.text((left + 4, top + 4), label, fill=(255, 255, 0), font=font)
+        sheets.append(sheet)
+    return sheets
+
+
+def make_contact_sheets(video_path, frame_reader, video_index, max_frames=48, columns=4, rows=3, tile_width=480,
+                        threshold=0.05, max_interval_seconds=60) -> List["Image.Image"]:
+    """
+    Build labelled contact sheets of a video's scenes.
+
+    Args:
+        video_path (str): Path to the video file
+        frame_reader (VideoFrameReader): Reader used to decode the frames in one forward pass
+        video_index (VideoIndex): Scene-change signal of the video
+        max_frames (int): Maximum number of frames over all sheets
+        columns (int): Frames per row
+        rows (int): Rows per sheet
+        tile_width (int): Width of each frame on the sheet in pixels
+        threshold (float): Normalized per-second change that starts a new scene
+        max_interval_seconds (int): Maximum seconds between two consecutive frames
+
+    Returns:
+        List[Image.Image]: The sheets, in timestamp order
+    """
+    times = select_scene_times(
+        video_index, max_frames=max_frames, threshold=threshold, max_interval_seconds=max_interval_seconds
+    )
+    decoded = [(time_seconds, frame) for time_seconds, frame in zip(times, frame_reader.get_frames(video_path, times))
+               if frame is not None]
+    return tile_contact_sheets(
+        [frame for _, frame in decoded], [time_seconds for time_seconds, _ in decoded],
+        columns=columns, rows=rows, tile_width=tile_width
+    )
@@ -0,0 +1,112 @@
+from typing import List, Optional
+
+import numpy as np
+
+
+def dhash(image, hash_size=16):
+    """
+    Compute the difference hash of an image.
+
+    The image is reduced to a (hash_size, hash_size + 1) grayscale thumbnail and
+    every bit records whether a pixel is brighter than its right-hand neighbour,
+    so re-encoding, scaling and small brightness shifts leave the hash unchanged
+    while different screens flip many bits.
+
+    Args:
+        image (PIL.Image | np.ndarray): Image or RGB/grayscale array
+        hash_size (int): Rows of the thumbnail; the hash has hash_size * hash_size bits
+
+    Returns:
+        np.ndarray: Packed hash bits as a uint8 array of length hash_size * hash_size / 8
+    """
+    from PIL import Image
+
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(np.asarray(image, dtype=np.uint8))
+    thumbnail = np.asarray(image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS), dtype=np.int16)
+    return np.packbits(thumbnail[:, 1:] > thumbnail[:, :-1])
+
+
+def color_layout(image, grid_size=4):
+    """
+    Reduce an image to a (grid_size, grid_size) RGB thumbnail.
+
+    The difference hash ignores absolute brightness and color, so screens that
+    differ only in color (e.g. a highlighted row, or two flat backgrounds) need
+    this second signature to be told apart.
+
+    Args:
+        image (PIL.Image | np.ndarray): Image or RGB/grayscale array
+        grid_size (int): Rows and columns of the thumbnail
+
+    Returns:
+        np.ndarray: float32 array of length grid_size * grid_size * 3
+    """
+    from PIL import Image
+
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(np.asarray(image, dtype=np.uint8))
+    thumbnail = image.convert("RGB").resize((grid_size, grid_size), Image.BOX)
+    return np.asarray(thumbnail, dtype=np.float32).ravel()
+
+
+class PerceptualHashIndex:
+    """
+    In-memory index of image hashes for near-duplicate lookups by Hamming distance.
+
+    Hashes are kept in one packed uint8 matrix and color layouts in one float
+    matrix, so a lookup is a single vectorized XOR and bit count plus one
+    mean absolute difference over every indexed image.
+
+    Example:
+        index = PerceptualHashIndex()
+        duplicate_path = index.find(dhash(image), color_layout(image), max_distance=4)
+        if duplicate_path is None:
+            index.add(dhash(image), color_layout(image), "screenshots/step.png")
+    """
+
+    def __init__(self):
+        self.paths: List[str] = []
+        self._hashes: Optional[np.ndarray] = None
+        self._colors: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def add(self, image_hash: np.ndarray, colors: np.ndarray, path: str) -> None:
+        """Index the signatures of the image at `path`, replacing any earlier ones of that path."""
+        if path in self.paths:
+            row = self.paths.index(path)
+            self._hashes[row] = image_hash
+            self._colors[row] = colors
+            return
+        self.paths.append(path)
+        if self._hashes is None:
+            self._hashes = image_hash[np.newaxis, :].copy()
+            self._colors = colors[np.newaxis, :].copy()
+        else:
+            self._hashes = np.vstack([self._hashes, image_hash])
+            self._colors = np.vstack([self._colors, colors])
+
+    def find(
+        self,
+        image_hash: np.ndarray,
+        colors: np.ndarray,
+        max_distance: int,
+        max_color_difference: float = 8.0
+    ) -> Optional[str]:
+        """
+        Return the path of the closest near-duplicate, or None.
+
+        An indexed image is a near-duplicate when its hash differs in at most
+        `max_distance` bits and its color layout differs by at most
+        `max_color_difference` (0-255) on average.
+        """
+        if self._hashes is None:
+            return None
+        distances = np.unpackbits(np.bitwise_xor(self._hashes, image_hash), axis=1).sum(axis=1)
+        color_differences = np.abs(self._colors - colors).mean(axis=1)
+        candidates = np.flatnonzero((distances <= max_distance) & (color_differences <= max_color_difference))
+        if not len(candidates):
+            return None
+        return self.paths[int(candidates[np.argmin(distances[candidates])])]
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: flushes in one process are still serialized by the thread lock
+    fcntl = None
+
+
+# Default location of the cross-session screenshot store
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "videoinstruct", "screenshots")
+
+
+def _link_or_copy(source_path, destination_path):
+    """Hard-link `source_path` to `destination_path`, copying when linking is not possible."""
+    temp_path = f"{destination_path}.{os.getpid()}.tmp"
+    try:
+        os.link(source_path, temp_path)
+    except OSError:
+        shutil.copy2(source_path, temp_path)
+    os.replace(temp_path, destination_path)
+
+
+class ScreenshotStore:
+    """
+    Content-addressed screenshot store shared by every session on the machine.
+
+    Images are keyed by (video content hash, timestamp, encoding parameters), so
+    a frame extracted once is reused by later runs on the same video instead of
+    being decoded and encoded again. Sessions receive a hard link to the stored
+    file (or a copy on filesystems without hard links). When the store grows past
+    `max_bytes`, the least recently used images are evicted; session links keep
+    their own reference to the data.
+
+    Args:
+        root_dir (str, optional): Store directory. Defaults to ~/.cache/videoinstruct/screenshots
+        max_bytes (int): Maximum total size of stored images
+
+    Example:
+        store = ScreenshotStore()
+        key = store.make_key(video_hash, 42, {"format": "png"})
+        if not store.link_into(key, "session/screenshots/step.png"):
+            ...  # extract the frame, then
+            store.put(key, "session/screenshots/step.png")
+        store.flush()
+    """
+
+    INDEX_FILENAME = "index.json"
+    LOCK_FILENAME = "index.lock"
+
+    def __init__(self, root_dir: Optional[str] = None, max_bytes: int = 2 * 1024 ** 3):
+        self.root_dir = root_dir or DEFAULT_STORE_DIR
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.root_dir, self.INDEX_FILENAME)
+        self.lock_path = os.path.join(self.root_dir, self.LOCK_FILENAME)
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        # {key: {"file": filename, "size": bytes, "last_access": unix_time}}
+        self._entries: Dict[str, Dict[str, Any]] = self._read_index()
+        self._dirty = False
+
+    @staticmethod
+    def make_key(video_hash: str, timestamp_seconds: float, encoding: Dict[str, Any]) -> str:
+        """Build the content address of a screenshot."""
+        identity = json.dumps(
+            {"video": video_hash, "timestamp": timestamp_seconds, "encoding": encoding},
+            sort_keys=True
+        )
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored image path for `key`, or None if it is not in the store."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_path = os.path.join(self.root_dir, entry["file"])
+            if not os.path.exists(stored_path):
+                del self._entries[key]
+                self._dirty = True
+                return None
+            entry["last_access"] = time.time()
+            self._dirty = True
+            return stored_path
+
+    def link_into(self, key: str, destination_path: str) -> bool:
+        """Place the stored image for `key` at `destination_path`; return False on a miss."""
+        stored_path = self.get(key)
+        if stored_path is None:
+            return False
+        try:
+            _link_or_copy(stored_path, destination_path)
+        except OSError as e:
+            print(f"Error linking stored screenshot into {destination_path}: {str(e)}")
+            return False
+        return True
+
+    def put(self, key: str, source_path: str) -> None:
+        """Add an image to the store under `key`."""
+        extension = os.path.splitext(source_path)[1]
+        filename = f"{key}{extension}"
+        stored_path = os.path.join(self.root_dir, filename)
+        try:
+            if not os.path.exists(stored_path):
+                _link_or_copy(source_path, stored_path)
+        except OSError as e:
+            print(f"Error adding screenshot to store: {str(e)}")
+            return
+        with self._lock:
+            self._entries[key] = {
+                "file": filename,
+                "size": os.path.getsize(stored_path),
+                "last_access": time.time(),
+            }
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Evict least recently used images beyond the size cap and persist the index."""
+        with self._lock:
+            if not self._dirty:
+                return
+            # The file lock keeps concurrent sessions from dropping each other's entries between read and replace
+            with self._file_lock():
+                # Merge entries written by concurrent sessions since we last read the index
+                for key, entry in self._read_index().items():
+                    current = self._entries.get(key)
+                    if current is None or entry["last_access"] > current["last_access"]:
+                        self._entries[key] = entry
+                self._evict()
+                temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+                with open(temp_path, "w") as f:
+                    json.dump(self._entries, f)
+                os.replace(temp_path, self.index_path)
+            self._dirty = False
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock shared by every process using this store."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def total_bytes(self) -> int:
+        """Return the total size of the stored images."""
+        with self._lock:
+            return sum(entry["size"] for entry in self._entries.values())
+
+    def _evict(self) -> None:
+        """Remove least recently used images until the store fits in `max_bytes`."""
+        total_bytes = self.total_bytes()
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1]["last_access"]):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.root_dir, entry["file"]))
+            except FileNotFoundError:
+                pass
+            total_bytes -= entry["size"]
+            del self._entries[key]
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """Read the on-disk index, returning an empty one if it is missing or corrupt."""
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            print(f"Error loading screenshot store index from {self.index_path}, starting a new one")
+            return {}
@@ -0,0 +1,188 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+# Words that carry no information about where in the video something happens
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his how
+i if in into is it its itself just me more most my no nor not now of off on once only or other our ours out over own
+same she should so some such than that the their theirs them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you your yours
+shows show showing screen screenshot user users helps help page view displayed visible see seen
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+LINE_PATTERN = re.compile(r"^\[(\d+):(\d{1,2}):(\d{1,2})\](.*)$")
+
+
+class TranscriptSegment(NamedTuple):
+    """A line of narration and the span of the video it covers, in seconds."""
+    start_seconds: int
+    end_seconds: int
+    text: str
+
+
+def _stem(token):
+    """Strip common English suffixes so that e.g. 'clicking' and 'clicked' match 'click'."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text):
+    """
+    Split text into lowercase, stemmed tokens without stopwords.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        List[str]: Tokens in order of appearance
+    """
+    return [_stem(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def parse_transcript(transcription):
+    """
+    Parse a transcription in the `[H:MM:SS]text` format written by utils/transcription.py.
+
+    Each segment ends where the next one starts; the last segment is assumed to
+    last as long as the one before it.
+
+    Args:
+        transcription (str): Transcription text, one segment per line
+
+    Returns:
+        List[TranscriptSegment]: Segments sorted by start time
+    """
+    starts_and_texts = []
+    for line in transcription.splitlines():
+        match = LINE_PATTERN.match(line.strip())
+        if match:
+            hours, minutes, seconds, text = match.groups()
+            starts_and_texts.append((int(hours) * 3600 + int(minutes) * 60 + int(seconds), text.strip()))
+    starts_and_texts.sort(key=lambda item: item[0])
+
+    segments = []
+    for idx, (start_seconds, text) in enumerate(starts_and_texts):
+        if idx + 1 < len(starts_and_texts):
+            end_seconds = starts_and_texts[idx + 1][0]
+        elif segments:
+            end_seconds = start_seconds + (segments[-1].end_seconds - segments[-1].start_seconds)
+        else:
+            end_seconds = start_seconds
+        segments.append(TranscriptSegment(start_seconds, max(end_seconds, start_seconds), text))
+    return segments
+
+
+class TranscriptIndex:
+    """
+    BM25 inverted index over the segments of a timestamped transcript.
+
+    In narrated screencasts the narrator usually describes what is on screen,
+    so a screenshot description can often be matched to the segment where it is
+    spoken without asking the video model. A match is only trusted when it
+    scores well on its own and clearly beats every segment elsewhere in the
+    video; anything ambiguous is left to the caller.
+
+    Args:
+        segments (List[TranscriptSegment]): Transcript segments sorted by start time
+        k1 (float): BM25 term-frequency saturation
+        b (float): BM25 length normalization
+
+    Example:
+        index = TranscriptIndex.from_transcription(transcription)
+        timestamp_seconds = index.resolve("Settings dialog with the privacy tab open")
+    """
+
+    def __init__(self, segments: List[TranscriptSegment], k1: float = 1.5, b: float = 0.75):
+        self.segments = list(segments)
+        self.k1 = k1
+        self.b = b
+        # {token: [(segment_idx, term_frequency)]}
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+        for segment_idx, segment in enumerate(self.segments):
+            term_frequencies = Counter(tokenize(segment.text))
+            self._lengths.append(sum(term_frequencies.values()))
+            for token, frequency in term_frequencies.items():
+                self._postings.setdefault(token, []).append((segment_idx, frequency))
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+    @classmethod
+    def from_transcription(cls, transcription: str) -> "TranscriptIndex":
+        """Build an index from a `[H:MM:SS]text` transcription."""
+        return cls(parse_transcript(transcription))
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def _idf(self, token: str) -> float:
+        """Inverse document frequency of a token, never negative."""
+        document_frequency = len(self._postings.get(token, ()))
+        return math.log(1 + (len(self.segments) - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[TranscriptSegment, float]]:
+        """
+        Score every segment against a query.
+
+        Args:
+            query (str): Free-text query, e.g. a screenshot description
+            top_k (int): Maximum number of results
+
+        Returns:
+            List[Tuple[TranscriptSegment, float]]: Best segments and their BM25 scores, highest first
+        """
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = self._idf(token)
+            for segment_idx, frequency in postings:
+                length_ratio = self._lengths[segment_idx] / self._average_length if self._average_length else 1.0
+                saturation = frequency * (self.k1 + 1) / (frequency + self.k1 * (1 - self.b + self.b * length_ratio))
+                scores[segment_idx] = scores.get(segment_idx, 0.0) + idf * saturation
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+        return [(self.segments[segment_idx], score) for segment_idx, score in ranked]
+
+    def resolve(
+        self,
+        query: str,
+        min_score: float = 4.0,
+        min_margin: float = 1.5,
+        neighbor_seconds: int = 10
+    ) -> Optional[int]:
+        """
+        Return the timestamp a query most likely refers to, or None if the match is ambiguous.
+
+        The best segment is accepted when its score is at least `min_score` and at
+        least `min_margin` times the best score of any segment more than
+        `neighbor_seconds` away from it. Nearby segments are not competitors, since
+        they describe the same moment of the video.
+
+        Args:
+            query (str): Free-text query, e.g. a screenshot description
+            min_score (float): Minimum BM25 score of the best segment
+            min_margin (float): Minimum ratio between the best score and the best competing score
+            neighbor_seconds (int): Segments starting within this distance of the best one are not competitors
+
+        Returns:
+            Optional[int]: Middle of the best segment in seconds, or None
+        """
+        results = self.search(query, top_k=len(self.segments))
+        if not results:
+            return None
+        best_segment, best_score = results[0]
+        if best_score < min_score:
+            return None
+        for segment, score in results[1:]:
+            if abs(segment.start_seconds - best_segment.start_seconds) > neighbor_seconds:
+                if best_score < min_margin * score:
+                    return None
+                break
+        return (best_segment.start_seconds + best_segment.end_seconds) // 2
@@ -0,0 +1,200 @@
+import bisect
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+from typing import List, Optional
+
+import numpy as np
+
+
+# Size of the grayscale thumbnails used for the scene-change signal
+SIGNAL_FRAME_WIDTH = 96
+SIGNAL_FRAME_HEIGHT = 54
+
+# Default location of the on-disk index files
+DEFAULT_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".cache", "videoinstruct", "video_index")
+
+
+def _probe_keyframes(video_path):
+    """
+    List the presentation times of every keyframe in a video.
+
+    Only keyframes are decoded (`-skip_frame nokey`), so this is much faster
+    than a full decode.
+
+    Args:
+        video_path (str): Path to the video file
+
+    Returns:
+        List[float]: Keyframe times in seconds, sorted ascending
+    """
+    from moviepy.config import FFMPEG_BINARY
+
+    command = [
+        FFMPEG_BINARY, "-hide_banner", "-nostats",
+        "-skip_frame", "nokey", "-i", video_path,
+        "-an", "-vf", "showinfo", "-f", "null", "-",
+    ]
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+    stderr = result.stderr.decode("utf-8", errors="replace")
+    keyframes = [float(match) for match in re.findall(r"pts_time:\s*([0-9.]+)", stderr)]
+    return sorted(set(keyframes))
+
+
+def _sample_gray_frames(video_path, sample_fps=1):
+    """
+    Decode one downsampled grayscale frame per 1/`sample_fps` seconds.
+
+    Scaling and grayscale conversion happen inside ffmpeg, so only a few
+    kilobytes per sample cross the pipe.
+
+    Args:
+        video_path (str): Path to the video file
+        sample_fps (float): Samples per second
+
+    Returns:
+        np.ndarray: uint8 array of shape (samples, SIGNAL_FRAME_HEIGHT, SIGNAL_FRAME_WIDTH)
+    """
+    from moviepy.config import FFMPEG_BINARY
+
+    command = [
+        FFMPEG_BINARY, "-hide_banner", "-nostats", "-loglevel", "error",
+        "-i", video_path, "-an",
+        "-vf", f"fps={sample_fps},scale={SIGNAL_FRAME_WIDTH}:{SIGNAL_FRAME_HEIGHT}",
+        "-f", "rawvideo", "-pix_fmt", "gray", "-",
+    ]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    frame_size = SIGNAL_FRAME_WIDTH * SIGNAL_FRAME_HEIGHT
+    sample_count = len(result.stdout) // frame_size
+    frames = np.frombuffer(result.stdout[:sample_count * frame_size], dtype=np.uint8)
+    return frames.reshape(sample_count, SIGNAL_FRAME_HEIGHT, SIGNAL_FRAME_WIDTH)
+
+
+def compute_frame_differences(frames):
+    """
+    Compute the mean absolute difference between consecutive frames.
+
+    Args:
+        frames (np.ndarray): Array of shape (n, height, width) or (n, height, width, channels)
+
+    Returns:
+        np.ndarray: float32 array of length n, where entry i is the normalized (0-1)
+        change from frame i-1 to frame i, and entry 0 is 0
+    """
+    if len(frames) == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = frames.astype(np.float32, copy=False)
+    pixel_axes = tuple(range(1, frames.ndim))
+    differences = np.abs(np.diff(frames, axis=0)).mean(axis=pixel_axes) / 255.0
+    return np.concatenate([np.zeros(1, dtype=np.float32), differences.astype(np.float32)])
+
+
+def _index_key(video_path):
+    """Build a cache key from the video's absolute path, size and modification time."""
+    stat = os.stat(video_path)
+    identity = f"{os.path.abspath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+
+class VideoIndex:
+    """
+    Precomputed keyframe positions and per-second scene-change signal for a video.
+
+    The keyframe list lets frame readers decide whether seeking (which restarts
+    decoding at the previous keyframe) or reading forward is cheaper. The
+    scene-change signal, `frame_differences[i]` being the change from second
+    i-1 to second i, is used to move timestamps off mid-transition frames.
+
+    Args:
+        keyframes (List[float]): Keyframe times in seconds, sorted ascending
+        frame_differences (List[float]): Normalized change per second of video
+
+    Example:
+        index = VideoIndex.load_or_build("my_video.mp4")
+        stable_second = index.find_stable_time(42)
+    """
+
+    def __init__(self, keyframes: List[float], frame_differences: List[float]):
+        self.keyframes = list(keyframes)
+        self.frame_differences = np.asarray(frame_differences, dtype=np.float32)
+
+    @classmethod
+    def build(cls, video_path: str) -> "VideoIndex":
+        """Scan a video and build its index."""
+        if not os.path.exists(video_path):
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+        keyframes = _probe_keyframes(video_path)
+        frame_differences = compute_frame_differences(_sample_gray_frames(video_path))
+        return cls(keyframes, frame_differences)
+
+    @classmethod
+    def load(cls, index_path: str) -> "VideoIndex":
+        """Load an index from a JSON file."""
+        with open(index_path, "r") as f:
+            data = json.load(f)
+        return cls(data["keyframes"], data["frame_differences"])
+
+    def save(self, index_path: str) -> None:
+        """Save the index to a JSON file."""
+        index_dir = os.path.dirname(index_path) or "."
+        os.makedirs(index_dir, exist_ok=True)
+        data = {
+            "keyframes": self.keyframes,
+            "frame_differences": [round(float(value), 5) for value in self.frame_differences],
+        }
+        # A unique temporary file keeps concurrent writers of the same index from clobbering each other
+        with tempfile.NamedTemporaryFile("w", dir=index_dir, suffix=".tmp", delete=False) as f:
+            json.dump(data, f)
+        try:
+            os.replace(f.name, index_path)
+        except OSError:
+            os.remove(f.name)
+            raise
+
+    @classmethod
+    def load_or_build(cls, video_path: str, index_dir: Optional[str] = None) -> "VideoIndex":
+        """Load the on-disk index for a video, building and saving it on first use."""
+        index_path = os.path.join(index_dir or DEFAULT_INDEX_DIR, f"{_index_key(video_path)}.json")
+        if os.path.exists(index_path):
+            try:
+                return cls.load(index_path)
+            except (ValueError, KeyError):
+                print(f"Error loading video index from {index_path}, rebuilding it")
+        index = cls.build(video_path)
+        index.save(index_path)
+        return index
+
+    def has_keyframe_between(self, start_seconds: float, end_seconds: float) -> bool:
+        """Return True if a keyframe lies in the interval (start_seconds, end_seconds]."""
+        position = bisect.bisect_right(self.keyframes, start_seconds)
+        return position < len(self.keyframes) and self.keyframes[position] <= end_seconds
+
+    def find_stable_time(self, time_seconds: int, threshold: float = 0.02, max_shift: int = 3) -> int:
+        """
+        Move a timestamp forward onto the first frame that is not mid-transition.
+
+        A second is stable when the change into it from the previous second does
+        not exceed `threshold`, i.e. the screen had settled by then. If no stable
+        second exists within `max_shift` seconds, the calmest second in that
+        window is returned instead.
+
+        Args:
+            time_seconds (int): Requested timestamp in seconds
+            threshold (float): Maximum normalized change for a stable second
+            max_shift (int): Maximum number of seconds to move forward
+
+        Returns:
+            int: Adjusted timestamp in seconds
+        """
+        signal = self.frame_differences
+        if time_seconds >= len(signal):
+            return time_seconds
+
+        window = signal[time_seconds:min(time_seconds + max_shift, len(signal) - 1) + 1]
+        stable = np.flatnonzero(window <= threshold)
+        if len(stable):
+            return time_seconds + int(stable[0])
+        return time_seconds + int(np.argmin(window))
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import subprocess
+
+from videoinstruct.utils.hashing import file_content_hash
+
+
+# Default location of the cached analysis proxies
+DEFAULT_PROXY_DIR = os.path.join(os.path.expanduser("~"), ".cache", "videoinstruct", "proxies")
+
+
+def _proxy_path(video_path, cache_dir, params):
+    """Return the cache path of a proxy, keyed by the source contents and the encoding parameters."""
+    params_hash = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{file_content_hash(video_path)}-{params_hash}.mp4")
+
+
+def make_analysis_proxy(
+    video_path,
+    cache_dir=None,
+    max_height=720,
+    fps=5.0,
+    video_bitrate="500k",
+    keep_audio=True,
+    audio_bitrate="48k"
+):
+    """
+    Transcode a video into a small proxy for uploading to the model.
+
+    The proxy keeps the timeline of the source, so timestamps the model reads
+    off the proxy are valid for the original, which is still used for
+    screenshots. Proxies are cached by the source's content hash and the
+    encoding parameters, and written atomically, so repeated runs on the same
+    video transcode it once.
+
+    Args:
+        video_path (str): Path to the source video
+        cache_dir (str, optional): Directory of cached proxies. Defaults to ~/.cache/videoinstruct/proxies
+        max_height (int): Maximum height in pixels; smaller videos are not upscaled
+        fps (float): Frame rate of the proxy
+        video_bitrate (str): Target H.264 bitrate, e.g. "500k"
+        keep_audio (bool): Keep a mono AAC audio track; False produces a silent proxy
+        audio_bitrate (str): Target audio bitrate, e.g. "48k"
+
+    Returns:
+        str: Path of the proxy, or of the source video if the proxy would not be smaller
+        or ffmpeg cannot transcode it
+    """
+    from moviepy.config import FFMPEG_BINARY
+
+    cache_dir = cache_dir or DEFAULT_PROXY_DIR
+    params = {
+        "max_height": max_height,
+        "fps": fps,
+        "video_bitrate": video_bitrate,
+        "audio_bitrate": audio_bitrate if keep_audio else None,
+    }
+    proxy_path = _proxy_path(video_path, cache_dir, params)
+
+    if not os.path.exists(proxy_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{proxy_path}.{os.getpid()}.tmp.mp4"
+        audio_options = ["-c:a", "aac", "-b:a", audio_bitrate, "-ac", "1"] if keep_audio else ["-an"]
+        command = [
+            FFMPEG_BINARY, "-hide_banner", "-nostats", "-loglevel", "error", "-y",
+            "-i", video_path,
+            # -2 keeps the width even, as required by yuv420p
+            "-vf", f"fps={fps},scale=-2:'min({max_height},ih)'",
+            "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+            "-b:v", video_bitrate, "-maxrate", video_bitrate, "-bufsize", video_bitrate,
+            *audio_options,
+            "-movflags", "+faststart",
+            temp_path,
+        ]
+        try:
+            subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+            os.replace(temp_path, proxy_path)
+        except (subprocess.CalledProcessError, OSError) as e:
+            # OSError covers a missing or non-executable ffmpeg binary and a failed rename
+            stderr = getattr(e, "stderr", None)
+            error = stderr.decode("utf-8", errors="replace").strip() if stderr else str(e)
+            print(f"Error creating analysis proxy, uploading the source video instead: {error}")
+            return video_path
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    # Already-small sources can come out larger after re-encoding
+    if os.path.getsize(proxy_path) >= os.path.getsize(video_path):
+        return video_path
+    return proxy_path
@@ -1,20 +1,276 @@
+from collections import OrderedDict
 from contextlib import redirect_stdout, redirect_stderr
-from moviepy.video.io.VideoFileClip import VideoFileClip
 import numpy as np
 import os
-from PIL import Image
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-def VideoScreenshotTool(video_path, time_str):
+from videoinstruct.tools.video_index import compute_frame_differences
+
+if TYPE_CHECKING:
+    from moviepy.video.io.VideoFileClip import VideoFileClip
+    from PIL import Image
+
+
+def _parse_time_str(time_str):
+    """Convert a "HH:MM:SS" or "MM:SS" timestamp into seconds."""
+    try:
+        time_parts = time_str.split(':')
+        if len(time_parts) == 3:
+            hours, minutes, seconds = map(int, time_parts)
+            return hours * 3600 + minutes * 60 + seconds
+        elif len(time_parts) == 2:
+            # For backward compatibility, still support MM:SS format
+            minutes, seconds = map(int, time_parts)
+            return minutes * 60 + seconds
+        else:
+            raise ValueError("Time must be in 'HH:MM:SS' or 'MM:SS' format")
+    except ValueError:
+        raise ValueError("Time must be in 'HH:MM:SS' or 'MM:SS' format")
+
+
+def _format_duration(duration):
+    """Format a duration in seconds as "HH:MM:SS"."""
+    duration_hours = int(duration // 3600)
+    duration_minutes = int((duration % 3600) // 60)
+    duration_seconds = int(duration % 60)
+    return f"{duration_hours:02d}:{duration_minutes:02d}:{duration_seconds:02d}"
+
+
+# File extension of every supported screenshot format
+IMAGE_EXTENSIONS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+
+
+def _open_clip(video_path):
+    """Open a video file silently."""
+    from moviepy.video.io.VideoFileClip import VideoFileClip
+
+    with open(os.devnull, 'w') as devnull:
+        with redirect_stdout(devnull), redirect_stderr(devnull):
+            return VideoFileClip(video_path)
+
+
+class VideoFrameReader:
+    """
+    Reusable frame reader that keeps a small pool of open video decoders.
+
+    Opening a VideoFileClip spawns ffmpeg and probes the container, which
+    dominates the cost of grabbing a single frame. The reader keeps decoders
+    open per video path, closes the least recently used one when the pool is
+    full, and closes decoders that have been idle for longer than
+    `idle_timeout` seconds.
+
+    Args:
+        max_open (int): Maximum number of decoders kept open at once
+        idle_timeout (float): Seconds after which an unused decoder is closed
+
+    Example:
+        with VideoFrameReader() as reader:
+            first = reader.get_screenshot("my_video.mp4", "00:00:05")
+            second = reader.get_screenshot("my_video.mp4", "00:01:10")
+    """
+
+    def __init__(self, max_open: int = 2, idle_timeout: float = 300.0):
+        self.max_open = max(1, max_open)
+        self.idle_timeout = idle_timeout
+        # {absolute_video_path: [clip, last_used_time]}
+        self._clips = OrderedDict()
+        # {absolute_video_path: VideoIndex} used to choose between seeking and reading forward
+        self._indexes = {}
+        self._lock = threading.RLock()
+        self._sweeper = None
+        self._closed = threading.Event()
+
+    def get_clip(self, video_path: str) -> "VideoFileClip":
+        """Return an open clip for the video, opening it on first use."""
+        if not os.path.exists(video_path):
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+
+        key = os.path.abspath(video_path)
+        with self._lock:
+            self._evict_idle(keep=key)
+            entry = self._clips.get(key)
+            if entry is None:
+                entry = [_open_clip(key), time.monotonic()]
+                self._clips[key] = entry
+                while len(self._clips) > self.max_open:
+                    _, (old_clip, _) = self._clips.popitem(last=False)
+                    old_clip.close()
+                self._start_sweeper()
+            else:
+                entry[1] = time.monotonic()
+                self._clips.move_to_end(key)
+            return entry[0]
+
+    def attach_index(self, video_path: str, video_index) -> None:
+        """Use a VideoIndex's keyframe positions when seeking within `video_path`."""
+        with self._lock:
+            self._indexes[os.path.abspath(video_path)] = video_index
+
+    def _decode(self, clip: "VideoFileClip", video_path: str, time_seconds: float) -> np.ndarray:
+        """
+        Decode one frame, seeking only when a keyframe lies between the decoder and the target.
+
+        Seeking restarts decoding at the keyframe before the target, so when no
+        keyframe lies in between, reading forward from the current position is
+        always cheaper, even across long gaps where moviepy would re-seek.
+        """
+        video_index = self._indexes.get(os.path.abspath(video_path))
+        reader = getattr(clip, "reader", None)
+        if video_index is not None and reader is not None and reader.proc is not None:
+            target_pos = reader.get_frame_number(time_seconds) + 1
+            if target_pos > reader.pos + 1:
+                current_seconds = (reader.pos - 1) / reader.fps
+                if video_index.has_keyframe_between(current_seconds, time_seconds):
+                    reader.initialize(time_seconds)
+                else:
+                    reader.skip_frames(target_pos - reader.pos - 1)
+        return clip.get_frame(time_seconds)
+
+    def get_frame(self, video_path: str, time_seconds: float) -> np.ndarray:
+        """Decode the frame at `time_seconds` as an RGB array."""
+        with self._lock:
+            clip = self.get_clip(video_path)
+
+            # Check if the requested time exceeds video duration
+            if time_seconds > clip.duration:
+                raise ValueError(
+                    f"Requested time {_format_duration(time_seconds)} exceeds video duration of {_format_duration(clip.duration)}"
+                )
+
+            with open(os.devnull, 'w') as devnull:
+                with redirect_stdout(devnull), redirect_stderr(devnull):
+                    return self._decode(clip, video_path, time_seconds)
+
+    def iter_frames(self, video_path: str, times_seconds: Iterable[float]) -> Iterator[Tuple[float, Optional[np.ndarray]]]:
+        """
+        Decode frames for many timestamps in one forward pass over the video.
+
+        Timestamps are sorted and de-duplicated so the decoder only ever moves
+        forward: nearby frames are reached by reading on from the previous one,
+        and ffmpeg only re-seeks when the next timestamp is far ahead (or, with an
+        attached VideoIndex, when a keyframe lies in between). Frames
+        are yielded as they are decoded so callers never hold more than one.
+
+        Args:
+            video_path (str): Path to the video file
+            times_seconds (Iterable[float]): Timestamps in seconds, in any order
+
+        Yields:
+            Tuple[float, Optional[np.ndarray]]: (timestamp, frame) in ascending timestamp
+            order, with None as the frame for timestamps beyond the end of the video
+        """
+        with self._lock:
+            clip = self.get_clip(video_path)
+            for time_seconds in sorted(set(times_seconds)):
+                if time_seconds > clip.duration:
+                    yield time_seconds, None
+                    continue
+                with open(os.devnull, 'w') as devnull:
+                    with redirect_stdout(devnull), redirect_stderr(devnull):
+                        frame = self._decode(clip, video_path, time_seconds)
+                yield time_seconds, frame
+
+    def get_frames(self, video_path: str, times_seconds: Sequence[float]) -> List[Optional[np.ndarray]]:
+        """Decode frames for many timestamps in one forward pass, returned in input order."""
+        frames_by_time = dict(self.iter_frames(video_path, times_seconds))
+        return [frames_by_time[time_seconds] for time_seconds in times_seconds]
+
+    def get_screenshot(self, video_path: str, time_str: str) -> "Image.Image":
+        """Extract a screenshot at a "HH:MM:SS" timestamp."""
+        from PIL import Image
+
+        time_seconds = _parse_time_str(time_str)
+        frame = self.get_frame(video_path, time_seconds)
+        return Image.fromarray(np.asarray(frame, dtype=np.uint8))
+
+    def evict_idle(self) -> None:
+        """Close every decoder that has been idle for longer than the timeout."""
+        with self._lock:
+            self._evict_idle()
+
+    def close(self, video_path: Optional[str] = None) -> None:
+        """Close the decoder for `video_path`, or every decoder if no path is given."""
+        with self._lock:
+            if video_path is None:
+                keys = list(self._clips)
+            else:
+                keys = [os.path.abspath(video_path)]
+            for key in keys:
+                entry = self._clips.pop(key, None)
+                if entry is not None:
+                    entry[0].close()
+            if not self._clips:
+                self._closed.set()
+
+    def _evict_idle(self, keep: Optional[str] = None) -> None:
+        """Close idle decoders; the caller must hold the lock."""
+        now = time.monotonic()
+        for key in list(self._clips):
+            clip, last_used = self._clips[key]
+            if key != keep and now - last_used > self.idle_timeout:
+                del self._clips[key]
+                clip.close()
+
+    def _start_sweeper(self) -> None:
+        """Start the background thread that closes idle decoders."""
+        self._closed.clear()
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        # The thread only holds a weak reference, so an unused reader is still garbage collected and closed
+        self._sweeper = threading.Thread(
+            target=_sweep_idle_decoders,
+            args=(weakref.ref(self), self._closed, max(1.0, self.idle_timeout / 2)),
+            name="VideoFrameReader-sweeper",
+            daemon=True
+        )
+        self._sweeper.start()
+
+    def _sweep_once(self) -> None:
+        """Evict idle decoders, signalling the sweeper to stop once the pool is empty."""
+        with self._lock:
+            self._evict_idle()
+            if not self._clips:
+                self._closed.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def _sweep_idle_decoders(reader_ref, closed, interval):
+    """Periodically evict idle decoders of a reader until its pool is empty or the reader is gone."""
+    while not closed.wait(interval):
+        reader = reader_ref()
+        if reader is None:
+            return
+        reader._sweep_once()
+        del reader
+
+
+def VideoScreenshotTool(video_path, time_str, frame_reader=None):
     """
     Extract a screenshot from a video at a specific timestamp.
-    
+
     Args:
         video_path (str): Path to the MP4 video file
         time_str (str): Timestamp in "HH:MM:SS" format
-        
+        frame_reader (VideoFrameReader, optional): Reader whose open decoders should be
+            reused. If omitted, the video is opened and closed for this call only.
+
     Returns:
         PIL.Image: Screenshot image at the specified timestamp
-        
+
     Example:
         screenshot = get_video_screenshot("my_video.mp4", "01:02:45")
         screenshot.save("screenshot.jpg")
@@ -22,48 +278,398 @@ def VideoScreenshotTool(video_path, time_str):
     # Check if file exists
     if not os.path.exists(video_path):
         raise FileNotFoundError(f"Video file not found: {video_path}")
-    
-    # Parse the time string to get seconds
+
+    # Parse the time string to validate it before opening the video
+    _parse_time_str(time_str)
+
     try:
-        time_parts = time_str.split(':')
-        if len(time_parts) == 3:
-            hours, minutes, seconds = map(int, time_parts)
-            time_seconds = hours * 3600 + minutes * 60 + seconds
-        elif len(time_parts) == 2:
-            # For backward compatibility, still support MM:SS format
-            minutes, seconds = map(int, time_parts)
-            time_seconds = minutes * 60 + seconds
+        if frame_reader is not None:
+            return frame_reader.get_screenshot(video_path, time_str)
+
+        # Load the video silently, take the frame and close it again
+        with VideoFrameReader(max_open=1) as reader:
+            return reader.get_screenshot(video_path, time_str)
+
+    except Exception as e:
+        raise Exception(f"Error extracting screenshot: {str(e)}")
+
+
+def VideoScreenshotBatchTool(video_path, time_strs, frame_reader=None):
+    """
+    Extract screenshots for many timestamps with a single forward decode pass.
+
+    Args:
+        video_path (str): Path to the MP4 video file
+        time_strs (List[str]): Timestamps in "HH:MM:SS" format, in any order
+        frame_reader (VideoFrameReader, optional): Reader whose open decoders should be
+            reused. If omitted, the video is opened and closed for this call only.
+
+    Returns:
+        List[Optional[PIL.Image]]: Screenshots in the order of `time_strs`, with None for
+        timestamps beyond the end of the video
+
+    Example:
+        first, second = VideoScreenshotBatchTool("my_video.mp4", ["00:01:10", "00:00:05"])
+    """
+    # Check if file exists
+    if not os.path.exists(video_path):
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+
+    times_seconds = [_parse_time_str(time_str) for time_str in time_strs]
+
+    from PIL import Image
+
+    try:
+        if frame_reader is not None:
+            frames = frame_reader.get_frames(video_path, times_seconds)
         else:
-            raise ValueError("Time must be in 'HH:MM:SS' or 'MM:SS' format")
-    except ValueError:
-        raise ValueError("Time must be in 'HH:MM:SS' or 'MM:SS' format")
-    
+            with VideoFrameReader(max_open=1) as reader:
+                frames = reader.get_frames(video_path, times_seconds)
+
+        return [Image.fromarray(np.asarray(frame, dtype=np.uint8)) if frame is not None else None for frame in frames]
+
+    except Exception as e:
+        raise Exception(f"Error extracting screenshots: {str(e)}")
+
+
+def encode_screenshot(frame, output_path, image_format="png", quality=85, max_width=None, png_compress_level=6):
+    """
+    Encode a decoded frame and write it to disk.
+
+    Decoded frames are already uint8, so they are wrapped without a copy.
+
+    Args:
+        frame (np.ndarray): RGB frame
+        output_path (str): Path of the image file to write
+        image_format (str): "png", "jpeg" or "webp"
+        quality (int): JPEG/WebP quality from 1 to 100
+        max_width (int, optional): Frames wider than this are downscaled, keeping the aspect ratio
+        png_compress_level (int): zlib compression level of PNG files from 0 (fastest) to 9 (smallest)
+    """
+    if image_format not in IMAGE_EXTENSIONS:
+        raise ValueError(f"Unsupported screenshot format '{image_format}', expected one of {sorted(IMAGE_EXTENSIONS)}")
+
+    from PIL import Image
+
+    image = Image.fromarray(np.asarray(frame, dtype=np.uint8))
+    if max_width and image.width > max_width:
+        image = image.resize((max_width, max(1, round(image.height * max_width / image.width))), Image.LANCZOS)
+
+    if image_format == "png":
+        image.save(output_path, format="PNG", compress_level=png_compress_level)
+    elif image_format == "jpeg":
+        image.save(output_path, format="JPEG", quality=quality, optimize=True)
+    else:
+        image.save(output_path, format="WEBP", quality=quality)
+
+
+def _scoring_luminance(frame, max_width):
+    """Return a frame's luminance as uint8, downscaled to at most `max_width` pixels wide."""
+    from PIL import Image
+
+    image = Image.fromarray(np.asarray(frame, dtype=np.uint8)).convert("L")
+    if image.width > max_width:
+        image = image.resize((max_width, max(1, round(image.height * max_width / image.width))), Image.BILINEAR)
+    return np.asarray(image)
+
+
+def score_frame_quality(frames, max_width=640):
+    """
+    Score candidate frames by sharpness and stability.
+
+    Sharpness is the variance of the Laplacian of each frame's luminance, which
+    drops for motion-blurred or half-rendered frames. Instability is the mean
+    absolute change to the neighbouring candidates, which is high mid-scroll or
+    mid-transition. Both are normalized across the candidates so the score
+    does not depend on the content of the video. Frames are scored on a
+    downscaled uint8 grayscale copy, so memory stays small at any resolution.
+
+    Args:
+        frames (Sequence[np.ndarray]): RGB frames of the same size
+        max_width (int): Width the luminance is downscaled to before scoring
+
+    Returns:
+        np.ndarray: float32 array of length n, higher is better
+    """
+    luminance = np.stack([_scoring_luminance(frame, max_width) for frame in frames])
+    # int16 holds the Laplacian of uint8 images (-1020 to 1020) at half the memory of float32
+    widened = luminance.astype(np.int16)
+    laplacian = (
+        4 * widened[:, 1:-1, 1:-1]
+        - widened[:, :-2, 1:-1] - widened[:, 2:, 1:-1]
+        - widened[:, 1:-1, :-2] - widened[:, 1:-1, 2:]
+    )
+    sharpness = laplacian.reshape(len(frames), -1).var(axis=1, dtype=np.float64).astype(np.float32)
+
+    # Change into each candidate and out of it, whichever is larger
+    differences = compute_frame_differences(luminance)
+    instability = np.maximum(differences, np.append(differences[1:], 0))
+
+    sharpness_range = sharpness.max()
+    instability_range = instability.max()
+    score = sharpness / sharpness_range if sharpness_range > 0 else np.zeros(len(frames), dtype=np.float32)
+    if instability_range > 0:
+        score = score - instability / instability_range
+    return score.astype(np.float32)
+
+
+def _candidate_times(timestamp_seconds, window_seconds, sample_fps):
+    """List the sample times within `window_seconds` centred on a timestamp."""
+    if window_seconds <= 0 or sample_fps <= 0:
+        return [timestamp_seconds]
+    half_count = int(window_seconds / 2 * sample_fps)
+    times = (round(timestamp_seconds + offset / sample_fps, 6) for offset in range(-half_count, half_count + 1))
+    return [time_seconds for time_seconds in times if time_seconds >= 0]
+
+
+def _select_best_frame(timestamp_seconds, candidates):
+    """Pick the best of the decoded (time, frame) candidates, preferring the one closest to the timestamp on ties."""
+    if len(candidates) == 1:
+        return candidates[0][1]
+    scores = score_frame_quality([frame for _, frame in candidates])
+    best = max(range(len(candidates)), key=lambda idx: (scores[idx], -abs(candidates[idx][0] - timestamp_seconds)))
+    return candidates[best][1]
+
+
+def _expand_span(start, end, min_length, limit):
+    """Clamp the span [start, end) to [0, limit) and widen it around its centre to at least `min_length`."""
+    start, end = max(0, start), min(limit, end)
+    missing = min_length - (end - start)
+    if missing > 0:
+        start -= missing // 2
+        end += missing - missing // 2
+        if start < 0:
+            start, end = 0, end - start
+        if end > limit:
+            start, end = max(0, start - (end - limit)), limit
+    return int(start), int(end)
+
+
+def find_changed_region(frame, reference_frames, padding=48, min_fraction=0.4, threshold=0.05, block_size=8):
+    """
+    Find the part of a frame that changed compared to earlier frames.
+
+    The luminance change to each reference frame is averaged over
+    `block_size` squares so compression noise is ignored, and the bounding box
+    of every square that changed by more than `threshold` is padded and
+    widened to at least `min_fraction` of the frame in each dimension, so the
+    crop keeps enough surrounding context to recognize where it is on screen.
+
+    Args:
+        frame (np.ndarray): RGB frame to crop
+        reference_frames (List[np.ndarray]): RGB frames from the seconds before `frame`
+        padding (int): Pixels added around the changed region
+        min_fraction (float): Minimum crop size as a fraction of the frame's width and height
+        threshold (float): Minimum normalized (0-1) mean change of a block
+        block_size (int): Side of the squares the change is averaged over, in pixels
+
+    Returns:
+        Optional[Tuple[int, int, int, int]]: (top, bottom, left, right) of the crop, or None
+        when nothing changed or the changed region covers most of the frame
+    """
+    if not reference_frames:
+        return None
+    weights = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    current = np.asarray(frame, dtype=np.float32) @ weights
+    change = np.zeros_like(current)
+    for reference_frame in reference_frames:
+        np.maximum(change, np.abs(current - np.asarray(reference_frame, dtype=np.float32) @ weights), out=change)
+
+    height, width = current.shape
+    rows, columns = height // block_size, width // block_size
+    if rows == 0 or columns == 0:
+        return None
+    blocks = change[:rows * block_size, :columns * block_size].reshape(rows, block_size, columns, block_size)
+    changed = blocks.mean(axis=(1, 3)) / 255.0 > threshold
+    if not changed.any():
+        return None
+
+    changed_rows = np.flatnonzero(changed.any(axis=1))
+    changed_columns = np.flatnonzero(changed.any(axis=0))
+    top, bottom = _expand_span(
+        changed_rows[0] * block_size - padding, (changed_rows[-1] + 1) * block_size + padding,
+        int(min_fraction * height), height
+    )
+    left, right = _expand_span(
+        changed_columns[0] * block_size - padding, (changed_columns[-1] + 1) * block_size + padding,
+        int(min_fraction * width), width
+    )
+    # Cropping a few pixels off the edges is not worth losing the context
+    if (bottom - top) * (right - left) >= 0.9 * height * width:
+        return None
+    return top, bottom, left, right
+
+
+def save_screenshots(
+    video_path,
+    jobs,
+    frame_reader=None,
+    video_index=None,
+    window_seconds=0.0,
+    sample_fps=0.0,
+    encoding=None,
+    crop_lookback_seconds=0,
+    crop_padding=48,
+    crop_min_fraction=0.4
+):
+    """
+    Decode and save screenshots for many timestamps with a single forward pass.
+
+    Each frame is written to disk as soon as it is decoded, so only one frame
+    is held in memory at a time. With a sampling window, the frames sampled
+    within `window_seconds` around each timestamp are scored with
+    score_frame_quality and the sharpest, most stable one is saved; only the
+    frames of windows still being sampled are held in memory. With a crop
+    lookback, the frames of the preceding seconds are decoded in the same pass
+    and the screenshot is cropped to the region that changed since then
+    (see find_changed_region).
+
+    Args:
+        video_path (str): Path to the MP4 video file
+        jobs (List[Tuple[int, List[str]]]): (timestamp_seconds, output_paths) pairs; the
+            frame at each timestamp is saved to every listed path
+        frame_reader (VideoFrameReader, optional): Reader whose open decoders should be
+            reused. If omitted, the video is opened and closed for this call only.
+        video_index (VideoIndex, optional): Keyframe index used to decide when to seek
+        window_seconds (float): Width of the window sampled around each timestamp; 0 saves the exact frame
+        sample_fps (float): Frames sampled per second within the window; 0 saves the exact frame
+        encoding (Dict[str, Any], optional): Keyword arguments of encode_screenshot. Defaults to PNG.
+        crop_lookback_seconds (int): Seconds before each timestamp compared against to find the
+            changed region; 0 disables cropping
+        crop_padding (int): Pixels kept around the changed region
+        crop_min_fraction (float): Minimum crop size as a fraction of the frame's width and height
+
+    Returns:
+        Dict[str, Optional[str]]: Error message per output path, or None if it was saved
+    """
+    encoding = encoding or {}
+    errors: Dict[str, Optional[str]] = {}
+    paths_by_time = {}
+    for timestamp_seconds, output_paths in jobs:
+        paths_by_time.setdefault(timestamp_seconds, []).extend(output_paths)
+        for output_path in output_paths:
+            errors[output_path] = "frame was not decoded"
+
+    # Sample times of every timestamp's window and the earlier frames it is compared against
+    candidate_times = {
+        timestamp_seconds: _candidate_times(timestamp_seconds, window_seconds, sample_fps)
+        for timestamp_seconds in paths_by_time
+    }
+    reference_times = {
+        timestamp_seconds: [
+            timestamp_seconds - offset for offset in range(crop_lookback_seconds, 0, -1)
+            if timestamp_seconds - offset >= 0
+        ]
+        for timestamp_seconds in paths_by_time
+    }
+    needed_times = {
+        timestamp_seconds: sorted(set(candidate_times[timestamp_seconds]) | set(reference_times[timestamp_seconds]))
+        for timestamp_seconds in paths_by_time
+    }
+    # Timestamps are processed in order of their last sample
+    pending = sorted(paths_by_time, key=lambda timestamp_seconds: needed_times[timestamp_seconds][-1])
+    all_times = {time_seconds for times in needed_times.values() for time_seconds in times}
+    decoded = {}
+
+    reader = frame_reader or VideoFrameReader(max_open=1)
+    if video_index is not None:
+        reader.attach_index(video_path, video_index)
     try:
-        # Load the video silently
-        with open(os.devnull, 'w') as devnull:
-            with redirect_stdout(devnull), redirect_stderr(devnull):
-                clip = VideoFileClip(video_path)
-        
-        # Check if the requested time exceeds video duration
-        if time_seconds > clip.duration:
-            duration_hours = int(clip.duration // 3600)
-            duration_minutes = int((clip.duration % 3600) // 60)
-            duration_seconds = int(clip.duration % 60)
-            duration_str = f"{duration_hours:02d}:{duration_minutes:02d}:{duration_seconds:02d}"
-            raise ValueError(f"Requested time {time_str} exceeds video duration of {duration_str}")
-        
-        # Get the frame at the specified time
-        with open(os.devnull, 'w') as devnull:
-            with redirect_stdout(devnull), redirect_stderr(devnull):
-                frame = clip.get_frame(time_seconds)
-        
-        # Convert the numpy array to a PIL Image
-        screenshot = Image.fromarray(np.uint8(frame))
-        
-        # Close the video file
-        clip.close()
-        
-        return screenshot
-    
+        for time_seconds, frame in reader.iter_frames(video_path, all_times):
+            decoded[time_seconds] = frame
+            while pending and needed_times[pending[0]][-1] <= time_seconds:
+                timestamp_seconds = pending.pop(0)
+                candidates = [
+                    (candidate_time, decoded[candidate_time]) for candidate_time in candidate_times[timestamp_seconds]
+                    if decoded.get(candidate_time) is not None
+                ]
+                output_paths = paths_by_time[timestamp_seconds]
+                if not candidates:
+                    for output_path in output_paths:
+                        errors[output_path] = "timestamp exceeds video duration"
+                    continue
+                try:
+                    best_frame = _select_best_frame(timestamp_seconds, candidates)
+                    reference_frames = [
+                        decoded[reference_time] for reference_time in reference_times[timestamp_seconds]
+                        if decoded.get(reference_time) is not None
+                    ]
+                    region = find_changed_region(
+                        best_frame, reference_frames, padding=crop_padding, min_fraction=crop_min_fraction
+                    )
+                    if region is not None:
+                        top, bottom, left, right = region
+                        best_frame = best_frame[top:bottom, left:right]
+                except Exception as e:
+                    for output_path in output_paths:
+                        errors[output_path] = str(e)
+                    continue
+                for output_path in output_paths:
+                    try:
+                        encode_screenshot(best_frame, output_path, **encoding)
+                        errors[output_path] = None
+                    except Exception as e:
+                        errors[output_path] = str(e)
+            # Drop frames that no remaining timestamp needs
+            earliest_needed = min((needed_times[remaining][0] for remaining in pending), default=None)
+            for stale_time in [t for t in decoded if earliest_needed is None or t < earliest_needed]:
+                del decoded[stale_time]
     except Exception as e:
-        raise Exception(f"Error extracting screenshot: {str(e)}")
+        for output_path, error in errors.items():
+            if error == "frame was not decoded":
+                errors[output_path] = str(e)
+    finally:
+        if frame_reader is None:
+            reader.close()
+
+    return errors
+
+
+# Frame reader owned by a screenshot worker process, reused across the jobs it receives
+_worker_frame_reader = None
+
+
+def _save_screenshots_in_worker(video_path, jobs, save_options):
+    """Process-pool entry point for save_screenshots using a per-process frame reader."""
+    global _worker_frame_reader
+    if _worker_frame_reader is None:
+        _worker_frame_reader = VideoFrameReader(max_open=1)
+    return save_screenshots(video_path, jobs, frame_reader=_worker_frame_reader, **save_options)
+
+
+def save_screenshots_parallel(video_path, jobs, executor, max_workers, **save_options):
+    """
+    Split screenshot jobs into contiguous time ranges and save them across a process pool.
+
+    Every worker receives a sorted, contiguous slice of the timestamps so it can
+    still decode its share of frames with a single forward pass.
+
+    Args:
+        video_path (str): Path to the MP4 video file
+        jobs (List[Tuple[int, List[str]]]): (timestamp_seconds, output_paths) pairs
+        executor (concurrent.futures.Executor): Process pool to submit the slices to
+        max_workers (int): Number of slices to split the jobs into
+        **save_options: Keyword arguments of save_screenshots shipped to the workers,
+            e.g. video_index, window_seconds, sample_fps, encoding or crop_lookback_seconds
+
+    Returns:
+        Dict[str, Optional[str]]: Error message per output path, or None if it was saved
+    """
+    jobs = sorted(jobs, key=lambda job: job[0])
+    chunk_count = max(1, min(max_workers, len(jobs)))
+    chunk_size = -(-len(jobs) // chunk_count)
+    futures = [
+        executor.submit(_save_screenshots_in_worker, video_path, jobs[start:start + chunk_size], save_options)
+        for start in range(0, len(jobs), chunk_size)
+    ]
+
+    errors: Dict[str, Optional[str]] = {}
+    for future, start in zip(futures, range(0, len(jobs), chunk_size)):
+        try:
+            errors.update(future.result())
+        except Exception as e:
+            # The worker itself failed, so every screenshot in its slice is lost
+            for _, output_paths in jobs[start:start + chunk_size]:
+                for output_path in output_paths:
+                    errors[output_path] = str(e)
+    return errors
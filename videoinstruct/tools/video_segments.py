@@ -0,0 +1,250 @@
+import json
+import os
+import re
+import string
+import subprocess
+from typing import List, NamedTuple, Tuple
+
+from videoinstruct.utils.hashing import file_content_hash
+
+
+# Default location of the cached segment files
+DEFAULT_SEGMENT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "videoinstruct", "segments")
+
+# HH:MM:SS or MM:SS, not part of a longer run of digits and colons
+TIMESTAMP_PATTERN = re.compile(r"(?<![\d:])(?:(\d{1,2}):)?(\d{1,2}):(\d{2})(?![\d:])")
+
+
+class VideoSegment(NamedTuple):
+    """A time range of a video, in seconds from its start."""
+    index: int
+    start_seconds: float
+    end_seconds: float
+
+
+def get_video_duration(video_path):
+    """Return the duration of a video in seconds, read from its container metadata."""
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+    return ffmpeg_parse_infos(video_path)["duration"]
+
+
+def plan_segments(duration, segment_seconds=600, overlap_seconds=30):
+    """
+    Split a duration into segments of `segment_seconds` that overlap by `overlap_seconds`.
+
+    The overlap keeps an action that crosses a boundary whole in at least one segment.
+
+    Args:
+        duration (float): Length of the video in seconds
+        segment_seconds (float): Length of each segment; the last one may be shorter
+        overlap_seconds (float): Seconds shared by consecutive segments
+
+    Returns:
+        List[VideoSegment]: Segments covering [0, duration], in order
+    """
+    if overlap_seconds >= segment_seconds:
+        raise ValueError("overlap_seconds must be smaller than segment_seconds")
+
+    segments = []
+    start = 0.0
+    while True:
+        end = min(start + segment_seconds, duration)
+        segments.append(VideoSegment(len(segments), start, end))
+        if end >= duration:
+            return segments
+        start = end - overlap_seconds
+
+
+def cut_segment(video_path, segment, cache_dir=None):
+    """
+    Write one segment of a video to its own file, cached by the source's content hash.
+
+    The segment is re-encoded rather than stream-copied so it starts exactly at
+    `segment.start_seconds` instead of at the preceding keyframe, which keeps
+    offsets applied to its timestamps exact.
+
+    Args:
+        video_path (str): Path to the source video
+        segment (VideoSegment): Time range to cut
+        cache_dir (str, optional): Directory of cached segments. Defaults to ~/.cache/videoinstruct/segments
+
+    Returns:
+        str: Path of the segment file
+    """
+    from moviepy.config import FFMPEG_BINARY
+
+    cache_dir = cache_dir or DEFAULT_SEGMENT_DIR
+    segment_path = os.path.join(
+        cache_dir,
+        f"{file_content_hash(video_path)}-{segment.start_seconds:.3f}-{segment.end_seconds:.3f}.mp4"
+    )
+    if os.path.exists(segment_path):
+        return segment_path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = f"{segment_path}.{os.getpid()}.tmp.mp4"
+    command = [
+        FFMPEG_BINARY, "-hide_banner", "-nostats", "-loglevel", "error", "-y",
+        "-ss", f"{segment.start_seconds:.3f}", "-i", video_path,
+        "-t", f"{segment.end_seconds - segment.start_seconds:.3f}",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", "23", "-pix_fmt", "yuv420p",
+        "-c:a", "aac",
+        "-movflags", "+faststart",
+        temp_path,
+    ]
+    try:
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+        os.replace(temp_path, segment_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return segment_path
+
+
+def format_timestamp(seconds):
+    """Format seconds as HH:MM:SS."""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def shift_timestamps(text, offset_seconds):
+    """
+    Add `offset_seconds` to every HH:MM:SS or MM:SS timestamp in a text.
+
+    Turns timestamps a model read off a segment into timestamps of the full
+    video. Shifted timestamps are always written as HH:MM:SS.
+    """
+    if not offset_seconds:
+        return text
+
+    def shift(match):
+        return format_timestamp(_match_seconds(match) + offset_seconds)
+
+    return TIMESTAMP_PATTERN.sub(shift, text)
+
+
+def _match_seconds(match):
+    """Return the seconds of a TIMESTAMP_PATTERN match."""
+    hours, minutes, seconds = match.groups()
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def _parse_json_object(text):
+    """Return the JSON object in a text, ignoring code fences and surrounding text, or None."""
+    json_start = text.find("{")
+    json_end = text.rfind("}")
+    if json_start == -1 or json_end < json_start:
+        return None
+    try:
+        parsed = json.loads(text[json_start:json_end + 1])
+    except ValueError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _is_unavailable(answer, unavailable_answer):
+    """Return True if an answer is `unavailable_answer`, ignoring case, quotes and surrounding punctuation."""
+    return answer.strip(string.punctuation + string.whitespace).lower() == unavailable_answer.lower()
+
+
+def merge_segment_answers(
+    answers: List[Tuple[VideoSegment, str]],
+    unavailable_answer="screenshot_not_available",
+    query_type="question"
+):
+    """
+    Merge the answers of several segments, most relevant segment first, into one answer.
+
+    Timestamps are shifted by each segment's start. Answers that are
+    `unavailable_answer` (ignoring case, quotes and punctuation) are dropped
+    unless every segment gave one. If every answer is a JSON object, the
+    objects are merged key by key, keeping the first value that is not
+    `unavailable_answer`. For timestamp queries, the first timestamp found in
+    the answers is returned on its own (JSON objects among them are merged
+    instead), so callers reading the answer as a timestamp never see segment
+    headings. Otherwise, if every answer is a bare timestamp the first is kept,
+    and other answers are concatenated under a heading naming each segment's
+    time range.
+
+    Args:
+        answers (List[Tuple[VideoSegment, str]]): Segment and answer pairs, most relevant first
+        unavailable_answer (str): Answer meaning the segment does not show what was asked for
+        query_type (str): "description", "question" or "timestamp"
+
+    Returns:
+        str: The merged answer
+    """
+    shifted = [(segment, shift_timestamps(answer.strip(), segment.start_seconds)) for segment, answer in answers]
+    available = [(segment, answer) for segment, answer in shifted if not _is_unavailable(answer, unavailable_answer)]
+    if not available:
+        return unavailable_answer
+
+    objects = [parsed for parsed in (_parse_json_object(answer) for _, answer in available) if parsed is not None]
+    if objects and (len(objects) == len(available) or query_type == "timestamp"):
+        if len(available) == 1:
+            return available[0][1]
+        merged = {}
+        for parsed in objects:
+            for key, value in parsed.items():
+                current = merged.get(key)
+                if current is None or (isinstance(current, str) and _is_unavailable(current, unavailable_answer)):
+                    merged[key] = value
+        return json.dumps(merged, indent=2)
+
+    if query_type == "timestamp":
+        for _, answer in available:
+            match = TIMESTAMP_PATTERN.search(answer)
+            if match:
+                return format_timestamp(_match_seconds(match))
+        return unavailable_answer
+
+    if len(available) == 1 or all(TIMESTAMP_PATTERN.fullmatch(answer) for _, answer in available):
+        return available[0][1]
+    return "\n\n".join(
+        f"From {format_timestamp(segment.start_seconds)} to {format_timestamp(segment.end_seconds)}:\n{answer}"
+        for segment, answer in available
+    )
+
+
+def route_to_segments(
+    segments: List[VideoSegment],
+    transcript_index,
+    query,
+    max_segments=2,
+    min_score=4.0,
+    top_k=5
+) -> List[VideoSegment]:
+    """
+    Pick the segments a query should be asked against, most relevant first.
+
+    The query is matched against the transcript, and segments containing the
+    best-scoring lines are chosen. Queries without a confident transcript match
+    (or without a transcript) go to every segment.
+
+    Args:
+        segments (List[VideoSegment]): Segments of the video
+        transcript_index (TranscriptIndex, optional): BM25 index of the timestamped transcript
+        query (str): The question or lookup prompt
+        max_segments (int): Maximum number of segments to route a matched query to
+        min_score (float): BM25 score a transcript line needs to route the query
+        top_k (int): Transcript lines considered
+
+    Returns:
+        List[VideoSegment]: The segments to ask
+    """
+    if transcript_index is None:
+        return list(segments)
+
+    routed: List[VideoSegment] = []
+    for line, score in transcript_index.search(query, top_k=top_k):
+        if score < min_score:
+            break
+        midpoint = (line.start_seconds + line.end_seconds) / 2
+        for segment in segments:
+            if segment.start_seconds <= midpoint <= segment.end_seconds and segment not in routed:
+                routed.append(segment)
+                break
+        if len(routed) >= max_segments:
+            break
+    return routed or list(segments)
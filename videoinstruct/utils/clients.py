@@ -0,0 +1,60 @@
+"""
+Process-wide registry of provider clients.
+
+Clients are created the first time an agent actually calls its provider and
+are then shared by every agent using the same provider and API key, so
+constructing agents never requires keys or network setup, and runs that never
+reach a provider (e.g. transcription-only or PDF-only runs) never create its client.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# {(provider, api_key): client}
+_clients: Dict[Tuple[str, str], Any] = {}
+_lock = threading.Lock()
+
+
+def get_client(provider: str, api_key: str, factory: Callable[[str], Any]) -> Any:
+    """
+    Return the shared client for a provider and API key, creating it with `factory` on first use.
+    """
+    key = (provider, api_key)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = factory(api_key)
+            _clients[key] = client
+        return client
+
+
+def _resolve_api_key(api_key: Optional[str], env_var: str) -> str:
+    """Return the given API key or the one in `env_var`, raising if neither is set."""
+    api_key = api_key or os.getenv(env_var)
+    if not api_key:
+        raise ValueError(f"API key must be provided in config or set as {env_var} environment variable")
+    return api_key
+
+
+def get_gemini_client(api_key: Optional[str] = None) -> Any:
+    """Return the shared google-genai client, falling back to the GEMINI_API_KEY environment variable."""
+    def create(key):
+        from google import genai
+        return genai.Client(api_key=key)
+
+    return get_client("gemini", _resolve_api_key(api_key, "GEMINI_API_KEY"), create)
+
+
+def get_openai_client(api_key: Optional[str] = None) -> Any:
+    """Return the shared OpenAI client, falling back to the OPENAI_API_KEY environment variable."""
+    def create(key):
+        from openai import OpenAI
+        return OpenAI(api_key=key)
+
+    return get_client("openai", _resolve_api_key(api_key, "OPENAI_API_KEY"), create)
+
+
+def clear_clients() -> None:
+    """Drop every shared client, e.g. after rotating API keys."""
+    with _lock:
+        _clients.clear()
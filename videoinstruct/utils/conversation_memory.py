@@ -0,0 +1,180 @@
+"""
+Token-budgeted conversation memory for the VideoInterpreter.
+
+Every question to the VideoInterpreter resends the whole conversation next to
+the video, so without a budget the prompt grows with each turn and the tokens
+sent over a session grow quadratically. ConversationMemory keeps the most
+recent turns verbatim and, once the prompt would exceed its token budget,
+folds the oldest turns into a running summary of one short line per turn.
+"""
+import functools
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+# Prefix of the running summary in the prompt
+SUMMARY_PREFIX = "summary of earlier conversation:"
+
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of English text as one token per four characters."""
+    return (len(text) + 3) // 4
+
+
+@functools.lru_cache(maxsize=None)
+def default_token_counter() -> Callable[[str], int]:
+    """
+    Return a token counter using tiktoken's cl100k_base encoding.
+
+    tiktoken downloads its encodings on first use, so when the encoding cannot
+    be loaded (e.g. offline) the counter falls back to `estimate_tokens`.
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"tiktoken encoding unavailable ({type(e).__name__}), estimating tokens from text length")
+        return estimate_tokens
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def summarize_turn(turn: str, max_words: int = 40) -> str:
+    """Shorten a turn to its role and first sentence, cut to `max_words` words."""
+    role, separator, text = turn.partition(": ")
+    if not separator:
+        role, text = "", turn
+    text = SENTENCE_END_PATTERN.split(" ".join(text.split()), maxsplit=1)[0]
+    words = text.split(" ")
+    if len(words) > max_words:
+        text = " ".join(words[:max_words]) + " ..."
+    return f"{role}: {text}" if role else text
+
+
+class ConversationMemory:
+    """
+    Conversation turns kept within a token budget.
+
+    The last `keep_recent_turns` turns are always kept verbatim. When the
+    prompt exceeds `token_budget`, older turns are moved into the running
+    summary with `summarizer`, and if the summary alone still does not fit,
+    its oldest lines are dropped. With `token_budget=None` nothing is ever
+    compacted and tokens are not counted.
+
+    Args:
+        token_budget (int, optional): Maximum tokens of the rendered conversation
+        keep_recent_turns (int): Number of most recent turns never summarized
+        token_counter (Callable[[str], int], optional): Counts the tokens of a text. Defaults to tiktoken
+        summarizer (Callable[[str], str], optional): Turns an old turn into a summary line. Defaults to summarize_turn
+        separator (str): Separator between turns in the rendered conversation
+
+    Example:
+        memory = ConversationMemory(token_budget=8000)
+        memory.append("user: When is the settings page opened?")
+        prompt = memory.render()
+        memory.append("assistant: At 00:42.")
+        print(memory.stats()["tokens_saved"])
+    """
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        keep_recent_turns: int = 6,
+        token_counter: Optional[Callable[[str], int]] = None,
+        summarizer: Optional[Callable[[str], str]] = None,
+        separator: str = ", "
+    ):
+        self.token_budget = token_budget
+        self.keep_recent_turns = keep_recent_turns
+        self._token_counter = token_counter
+        self.summarizer = summarizer or summarize_turn
+        self.separator = separator
+
+        # Turns kept verbatim and their token counts
+        self.turns: List[str] = []
+        self._turn_tokens: List[int] = []
+        # Running summary of compacted turns, one line per turn
+        self.summary_lines: List[str] = []
+        self._summary_tokens: List[int] = []
+
+        self.summarized_turns = 0
+        self.dropped_summary_lines = 0
+        # Tokens the conversation would take if every turn were sent verbatim
+        self.full_tokens = 0
+        # Totals over every render, kept across clear()
+        self.tokens_sent = 0
+        self.tokens_saved = 0
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens of a text with the configured counter."""
+        if self._token_counter is None:
+            self._token_counter = default_token_counter()
+        return self._token_counter(text)
+
+    def append(self, turn: str) -> None:
+        """Add a turn such as "user: ..." and compact older turns if the budget is exceeded."""
+        self.turns.append(turn)
+        if self.token_budget is None:
+            return
+        tokens = self.count_tokens(turn)
+        self._turn_tokens.append(tokens)
+        self.full_tokens += tokens
+        self._compact()
+
+    def prompt_tokens(self) -> int:
+        """Return the tokens of the conversation as currently rendered."""
+        tokens = sum(self._turn_tokens) + sum(self._summary_tokens)
+        if self.summary_lines:
+            tokens += self.count_tokens(SUMMARY_PREFIX)
+        return tokens
+
+    def render(self) -> str:
+        """
+        Return the conversation to send with the next request.
+
+        Every render is counted as one request in the token metrics.
+        """
+        parts = list(self.turns)
+        if self.summary_lines:
+            parts.insert(0, f"{SUMMARY_PREFIX} {' '.join(self.summary_lines)}")
+
+        if self.token_budget is not None:
+            prompt_tokens = self.prompt_tokens()
+            self.tokens_sent += prompt_tokens
+            self.tokens_saved += max(self.full_tokens - prompt_tokens, 0)
+        return self.separator.join(parts)
+
+    def clear(self) -> None:
+        """Forget the conversation; the cumulative token metrics are kept."""
+        self.turns = []
+        self._turn_tokens = []
+        self.summary_lines = []
+        self._summary_tokens = []
+        self.full_tokens = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the size of the conversation and the tokens sent and saved so far."""
+        return {
+            "token_budget": self.token_budget,
+            "verbatim_turns": len(self.turns),
+            "summarized_turns": self.summarized_turns,
+            "dropped_summary_lines": self.dropped_summary_lines,
+            "prompt_tokens": self.prompt_tokens() if self.token_budget is not None else None,
+            "tokens_sent": self.tokens_sent,
+            "tokens_saved": self.tokens_saved,
+        }
+
+    def _compact(self) -> None:
+        """Summarize the oldest turns, then drop the oldest summary lines, until the budget is met."""
+        while self.prompt_tokens() > self.token_budget and len(self.turns) > self.keep_recent_turns:
+            turn = self.turns.pop(0)
+            self._turn_tokens.pop(0)
+            line = self.summarizer(turn)
+            self.summary_lines.append(line)
+            self._summary_tokens.append(self.count_tokens(line))
+            self.summarized_turns += 1
+
+        while self.prompt_tokens() > self.token_budget and self.summary_lines:
+            self.summary_lines.pop(0)
+            self._summary_tokens.pop(0)
+            self.dropped_summary_lines += 1
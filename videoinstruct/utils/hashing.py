@@ -0,0 +1,31 @@
+import hashlib
+import os
+import threading
+from typing import Dict, Tuple
+
+# Digests already computed in this process: {(absolute_path, size, mtime_ns): digest}
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+_digest_lock = threading.Lock()
+
+
+def file_content_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Return the SHA-256 hex digest of a file's contents.
+
+    Digests are memoized per (path, size, modification time), so hashing a
+    large video costs one full read per process.
+    """
+    stat = os.stat(file_path)
+    memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    with _digest_lock:
+        if memo_key in _digest_memo:
+            return _digest_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+
+    with _digest_lock:
+        _digest_memo[memo_key] = digest.hexdigest()
+    return _digest_memo[memo_key]
@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers in one process are still serialized by the thread lock
+    fcntl = None
+
+
+class JournaledCache(MutableMapping):
+    """
+    Dictionary persisted as a JSON snapshot plus an append-only journal.
+
+    Changes are kept in memory until `flush`, which appends them to the journal
+    in a single write and fsync instead of rewriting the whole file. Every
+    flush holds an exclusive file lock, merges the changes other processes
+    flushed in the meantime (the last flush of a key wins), and once the
+    journal holds more than `compact_after` entries, folds it into a new
+    snapshot that replaces the old one atomically. A crash can at worst lose
+    a torn final journal line, which is skipped on load.
+
+    The snapshot is a plain JSON object, so caches written before the journal
+    existed load unchanged.
+
+    Args:
+        path (str): Path of the JSON snapshot; the journal and lock file sit next to it
+        compact_after (int): Journal entries after which a flush compacts it into the snapshot
+
+    Example:
+        cache = JournaledCache("output/screenshot_cache.json")
+        cache["search_results"] = "output/screenshots/search_results.png"
+        cache.flush()
+    """
+
+    def __init__(self, path: str, compact_after: int = 256):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.lock_path = f"{path}.lock"
+        self.compact_after = compact_after
+        self._lock = threading.RLock()
+        # Changes not flushed yet, in order: (key, value, deleted)
+        self._pending: List[Tuple[str, Any, bool]] = []
+        with self._file_lock(exclusive=False):
+            self._data, self._journal_entries = self._read()
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            if key in self._data and self._data[key] == value:
+                return
+            self._data[key] = value
+            self._pending.append((key, value, False))
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            del self._data[key]
+            self._pending.append((key, None, True))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def flush(self) -> None:
+        """Append pending changes to the journal, merge other writers' changes and compact if needed."""
+        with self._lock, self._file_lock(exclusive=True):
+            if self._pending:
+                lines = "".join(
+                    json.dumps({"key": key, "deleted": True} if deleted else {"key": key, "value": value}) + "\n"
+                    for key, value, deleted in self._pending
+                )
+                self._append_to_journal(lines)
+                self._pending = []
+            self._data, self._journal_entries = self._read()
+            if self._journal_entries > self.compact_after:
+                self._compact()
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Hold a lock shared by every process using this cache."""
+        directory = os.path.dirname(self.lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _append_to_journal(self, lines: str) -> None:
+        """Append complete lines to the journal and make them durable; the caller must hold the file lock."""
+        fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # Start on a fresh line if a crashed writer left a torn one behind
+            size = os.fstat(fd).st_size
+            if size:
+                with open(self.journal_path, "rb") as f:
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n":
+                        lines = "\n" + lines
+            os.write(fd, lines.encode("utf-8"))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _read(self) -> Tuple[Dict[str, Any], int]:
+        """Load the snapshot and replay the journal over it, returning the data and the journal length."""
+        data: Dict[str, Any] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                print(f"Error loading cache snapshot from {self.path}, replaying the journal only")
+                data = {}
+
+        journal_entries = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crashed session
+                        continue
+                    journal_entries += 1
+                    if entry.get("deleted"):
+                        data.pop(entry["key"], None)
+                    else:
+                        data[entry["key"]] = entry["value"]
+        return data, journal_entries
+
+    def _compact(self) -> None:
+        """Fold the journal into a new snapshot; the caller must hold the exclusive file lock."""
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self._data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        # Entries still in the journal after a crash here are already in the snapshot, so replaying them is harmless
+        with open(self.journal_path, "w"):
+            pass
+        self._journal_entries = 0
@@ -0,0 +1,42 @@
+import importlib
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def lazy_module_attrs(
+    module_name: str,
+    attributes: Dict[str, str],
+    public_names: Optional[Iterable[str]] = None
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build the PEP 562 `__getattr__` and `__dir__` of a package whose attributes are imported on first access.
+
+    Each attribute is imported from its module the first time it is looked up
+    and then stored on the package, so later lookups skip `__getattr__`.
+
+    Args:
+        module_name (str): `__name__` of the package
+        attributes (Dict[str, str]): {attribute: module that defines it}
+        public_names (Iterable[str], optional): Names listed by `dir()` besides the package's globals.
+            Defaults to the lazy attributes.
+
+    Returns:
+        Tuple[Callable, Callable]: The package's `__getattr__` and `__dir__`
+
+    Example:
+        __getattr__, __dir__ = lazy_module_attrs(__name__, {'VideoInstructor': 'videoinstruct.videoinstructor'})
+    """
+    public_names = list(attributes if public_names is None else public_names)
+
+    def __getattr__(name: str) -> Any:
+        attribute_module = attributes.get(name)
+        if attribute_module is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(attribute_module), name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[module_name])) | set(public_names))
+
+    return __getattr__, __dir__
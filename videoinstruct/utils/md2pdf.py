@@ -1,6 +1,5 @@
 import os
 import markdown
-from xhtml2pdf import pisa
 import re
 
 def fix_list_indentation(line: str, in_list: bool) -> tuple[str, bool]:
@@ -251,6 +250,8 @@ def convert_html_to_pdf(source_html, output_filename, link_callback_func):
     """
     Convert HTML content to a PDF file using xhtml2pdf.
     """
+    from xhtml2pdf import pisa
+
     with open(output_filename, "w+b") as result_file:
         pisa_status = pisa.CreatePDF(source_html, dest=result_file, link_callback=link_callback_func)
     return pisa_status.err
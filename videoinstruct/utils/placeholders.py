@@ -0,0 +1,89 @@
+"""
+Parse-once/render-once handling of [SCREENSHOT_PLACEHOLDER] blocks in markdown.
+
+A document is tokenized a single time into a list of plain-text segments and
+Placeholder segments. Callers decide what each placeholder becomes by setting
+its `replacement`, and the document is rebuilt with one join, so the cost is
+linear in the document size regardless of how many placeholders it holds.
+"""
+import re
+from typing import List, Optional, Tuple, Union
+
+PLACEHOLDER_PATTERN = re.compile(r'\[SCREENSHOT_PLACEHOLDER\](.*?)\[/SCREENSHOT_PLACEHOLDER\]', re.DOTALL)
+FIELD_PATTERN = re.compile(r'(Name|Purpose|Content|Value):\s*(.*?)(?:\n|$)')
+CODE_BLOCK_PATTERN = re.compile(r'```.*?```', re.DOTALL)
+IMAGE_PATTERN = re.compile(r'!\[.*?\]\(.*?\)')
+
+
+class Placeholder:
+    """A parsed screenshot placeholder and the text it should be rendered as."""
+
+    __slots__ = ("raw", "body", "name", "purpose", "content", "value", "replacement")
+
+    def __init__(self, raw: str, body: str) -> None:
+        """Parse the Name, Purpose, Content and Value fields of a placeholder body."""
+        self.raw = raw
+        self.body = body
+        fields = {}
+        for match in FIELD_PATTERN.finditer(body):
+            fields.setdefault(match.group(1), match.group(2).strip())
+        self.name: Optional[str] = fields.get("Name")
+        self.purpose: Optional[str] = fields.get("Purpose")
+        self.content: Optional[str] = fields.get("Content")
+        self.value: Optional[str] = fields.get("Value")
+        # Text that replaces the placeholder when rendering; None keeps the original block
+        self.replacement: Optional[str] = None
+
+    @property
+    def has_additional_content(self) -> bool:
+        """Whether the placeholder describes a screenshot beyond its name."""
+        return self.purpose is not None or self.content is not None or self.value is not None
+
+    @property
+    def description(self) -> str:
+        """Description used for the image alt text and the timestamp lookup."""
+        description_parts = [part for part in (self.purpose, self.content, self.value) if part]
+        return " - ".join(description_parts) if description_parts else (self.name or "")
+
+    @property
+    def signature(self) -> Tuple[str, str, str, str]:
+        """All fields of the placeholder, used to detect unchanged placeholders across versions."""
+        return (self.name or "", self.purpose or "", self.content or "", self.value or "")
+
+    def render(self) -> str:
+        """Return the text this placeholder should be rendered as."""
+        return self.raw if self.replacement is None else self.replacement
+
+
+Segment = Union[str, Placeholder]
+
+
+def parse_placeholders(markdown: str) -> List[Segment]:
+    """Split markdown into plain-text segments and Placeholder segments in document order."""
+    segments: List[Segment] = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(markdown):
+        if match.start() > position:
+            segments.append(markdown[position:match.start()])
+        segments.append(Placeholder(match.group(0), match.group(1)))
+        position = match.end()
+    if position < len(markdown):
+        segments.append(markdown[position:])
+    return segments
+
+
+def render_segments(segments: List[Segment]) -> str:
+    """Rebuild the markdown from its segments in a single join."""
+    return "".join(segment if isinstance(segment, str) else segment.render() for segment in segments)
+
+
+def move_images_out_of_code_blocks(markdown: str) -> str:
+    """Move every image found inside a fenced code block to just after that block."""
+    def _move_images(match: "re.Match") -> str:
+        block = match.group(0)
+        images = IMAGE_PATTERN.findall(block)
+        if not images:
+            return block
+        return IMAGE_PATTERN.sub('', block) + ''.join('\n\n' + image for image in images)
+
+    return CODE_BLOCK_PATTERN.sub(_move_images, markdown)
@@ -1,7 +1,7 @@
 import os
 from dotenv import load_dotenv
-from moviepy.video.io.VideoFileClip import VideoFileClip
-from openai import OpenAI
+
+from videoinstruct.utils.clients import get_openai_client
 
 # Load environment variables
 load_dotenv()
@@ -11,6 +11,8 @@ def extract_audio(video_path, output_path):
     Extract audio from a video file and save it as an MP3.
     """
     try:
+        from moviepy.video.io.VideoFileClip import VideoFileClip
+        
         # Ensure output directory exists
         output_dir = os.path.dirname(output_path)
         if output_dir and not os.path.exists(output_dir):
@@ -77,11 +79,8 @@ def transcribe_audio(file_path):
     """
     Transcribe audio file using OpenAI's API
     """
-    # Get API key from environment variable
-    api_key = os.getenv("OPENAI_API_KEY")
-    
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    # Get the shared OpenAI client, using the API key from the environment
+    client = get_openai_client()
     
     with open(file_path, "rb") as audio_file:
         transcription = client.audio.transcriptions.create(
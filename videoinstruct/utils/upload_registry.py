@@ -0,0 +1,82 @@
+import hashlib
+import os
+import time
+from typing import Any, Dict, Optional
+
+from videoinstruct.utils.journaled_cache import JournaledCache
+
+# Default location of the registry shared by every session on the machine
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.expanduser("~"), ".cache", "videoinstruct", "uploads.json")
+
+# Gemini keeps uploaded files for 48 hours; used when the API does not report an expiry
+DEFAULT_FILE_LIFETIME_SECONDS = 48 * 3600
+
+
+class UploadRegistry:
+    """
+    Persistent registry of videos already uploaded to the Gemini files API.
+
+    Entries are keyed by the video's content hash and a fingerprint of the API
+    key (uploaded files are only visible to the project that uploaded them),
+    and record the remote file name and when it expires. Entries that expire
+    within `min_remaining_seconds` are treated as missing, so a session never
+    starts on a file that disappears halfway through.
+
+    Args:
+        path (str, optional): Registry file. Defaults to ~/.cache/videoinstruct/uploads.json
+        min_remaining_seconds (float): Minimum lifetime left for an entry to be reused
+
+    Example:
+        registry = UploadRegistry()
+        key = registry.make_key(file_content_hash("my_video.mp4"), api_key)
+        entry = registry.get(key)
+        if entry is None:
+            ...  # upload, then
+            registry.put(key, uploaded_file.name, expires_at)
+    """
+
+    def __init__(self, path: Optional[str] = None, min_remaining_seconds: float = 3600):
+        self.path = path or DEFAULT_REGISTRY_PATH
+        self.min_remaining_seconds = min_remaining_seconds
+        # {key: {"name": remote_file_name, "expires_at": unix_time, "uploaded_at": unix_time}}
+        self._entries = JournaledCache(self.path)
+
+    @staticmethod
+    def make_key(content_hash: str, api_key: Optional[str]) -> str:
+        """Build the registry key of a video for the project behind `api_key`."""
+        key_fingerprint = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+        return f"{content_hash}:{key_fingerprint}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for `key` if it is still live, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires_at"] - time.time() < self.min_remaining_seconds:
+            self.remove(key)
+            return None
+        return entry
+
+    def put(self, key: str, file_name: str, expires_at: Optional[float] = None) -> None:
+        """Record an uploaded file and persist the registry."""
+        now = time.time()
+        self._entries[key] = {
+            "name": file_name,
+            "expires_at": expires_at or now + DEFAULT_FILE_LIFETIME_SECONDS,
+            "uploaded_at": now,
+        }
+        self._entries.flush()
+
+    def remove(self, key: str) -> None:
+        """Forget an entry, e.g. after the remote file turned out to be gone."""
+        if key in self._entries:
+            del self._entries[key]
+            self._entries.flush()
+
+    def remove_file(self, file_name: str) -> None:
+        """Forget every entry pointing at a remote file, e.g. after deleting it."""
+        keys = [key for key, entry in self._entries.items() if entry["name"] == file_name]
+        for key in keys:
+            del self._entries[key]
+        if keys:
+            self._entries.flush()
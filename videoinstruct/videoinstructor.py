@@ -3,7 +3,10 @@ import datetime
 import json
 import re
 import shutil
-from typing import Optional, Tuple
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from videoinstruct.agents.VideoInterpreter import VideoInterpreter
 from videoinstruct.agents.DocGenerator import DocGenerator
@@ -68,6 +71,12 @@ class VideoInstructor:
         # Track document versions
         self.doc_version = 0
         
+        # Startup stages: seconds spent per stage, and the initial description requested in the background
+        self.stage_timings: Dict[str, float] = {}
+        self._startup_started: Optional[float] = None
+        self._initial_description: Optional[Future] = None
+        self._description_cancelled: Optional[threading.Event] = None
+        
         # Load video and transcription if provided
         if video_path:
             self.load_video(video_path)
@@ -83,12 +92,79 @@ class VideoInstructor:
         # Update video path for ScreenshotAgent
         self.screenshot_agent.set_video_path(video_path)
         
-        # Load video into VideoInterpreter
-        self.video_interpreter.load_video(video_path)
+        self.stage_timings = {}
+        self._startup_started = time.monotonic()
+        upload = None
+        if self.config.concurrent_startup:
+            # Upload the video and describe it in the background; the description is joined before the first DocGenerator call
+            upload = self._start_background_description(video_path)
+        else:
+            self._initial_description = None
+            self._timed("upload", self.video_interpreter.load_video, video_path)
         
-        # Extract transcription if not already provided
-        if not self.transcription:
-            self._extract_transcription()
+        # Extract transcription if not already provided, while the upload runs
+        try:
+            if not self.transcription:
+                self._timed("transcription", self._extract_transcription)
+        except BaseException:
+            if upload is not None:
+                # Skip the description and report an upload error first, as sequential loading would
+                self._cancel_background_description()
+                upload.result()
+            raise
+        
+        if upload is not None:
+            # Upload errors surface here, as with sequential loading; the description continues in the background
+            try:
+                upload.result()
+            except BaseException:
+                self._cancel_background_description()
+                raise
+    
+    def _timed(self, stage: str, function: Callable[..., Any], *args: Any) -> Any:
+        """Run a startup stage and record how long it took."""
+        started = time.monotonic()
+        try:
+            return function(*args)
+        finally:
+            self.stage_timings[stage] = time.monotonic() - started
+    
+    def _start_background_description(self, video_path: str) -> Future:
+        """Start uploading the video and, once it is processed, requesting its initial description; return the upload's Future."""
+        upload_started = time.monotonic()
+        upload = self.video_interpreter.load_video_in_background(video_path)
+        upload.add_done_callback(
+            lambda _: self.stage_timings.__setitem__("upload", time.monotonic() - upload_started)
+        )
+        cancelled = threading.Event()
+        
+        def describe_when_uploaded() -> Optional[str]:
+            upload.result()
+            if cancelled.is_set():
+                return None
+            return self._timed("initial_description", self._request_initial_description)
+        
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="VideoInstructor-startup")
+        self._description_cancelled = cancelled
+        self._initial_description = executor.submit(describe_when_uploaded)
+        executor.shutdown(wait=False)
+        return upload
+    
+    def _cancel_background_description(self) -> None:
+        """Stop a background initial description from being requested once the upload finishes."""
+        if self._description_cancelled is not None:
+            self._description_cancelled.set()
+        self._initial_description = None
+    
+    def _report_stage_timings(self) -> None:
+        """Print how long each startup stage took and the wall-clock time until the first draft request."""
+        if self._startup_started is None or not self.stage_timings:
+            return
+        wall_clock = time.monotonic() - self._startup_started
+        stages = ", ".join(f"{stage.replace('_', ' ')} {seconds:.1f}s" for stage, seconds in self.stage_timings.items())
+        print(f"Startup stage timings: {stages}")
+        print(f"Startup wall-clock time: {wall_clock:.1f}s (stages in sequence: {sum(self.stage_timings.values()):.1f}s)")
+        self._startup_started = None
     
     def load_transcription(self, transcription_path: str) -> None:
         """Load an existing transcription file."""
@@ -98,8 +174,10 @@ class VideoInstructor:
         with open(transcription_path, 'r') as file:
             self.transcription = file.read()
         
-        # Set transcription in DocGenerator
+        # Set transcription in DocGenerator, ScreenshotAgent and VideoInterpreter
         self.doc_generator.set_transcription(self.transcription)
+        self.screenshot_agent.set_transcription(self.transcription)
+        self.video_interpreter.set_transcription(self.transcription)
     
     def _extract_transcription(self) -> None:
         """Extract transcription from the loaded video."""
@@ -129,6 +207,8 @@ class VideoInstructor:
             with open(self.transcription_path, 'r') as file:
                 self.transcription = file.read()
             self.doc_generator.set_transcription(self.transcription)
+            self.screenshot_agent.set_transcription(self.transcription)
+            self.video_interpreter.set_transcription(self.transcription)
         else:
             raise ValueError("Failed to extract transcription from video.")
     
@@ -274,18 +354,28 @@ class VideoInstructor:
         
         return user_answer
     
+    def _request_initial_description(self) -> str:
+        """Ask the VideoInterpreter for a detailed description of the video."""
+        return self.video_interpreter.respond(
+            "Please provide a detailed step-by-step description of what is happening in this video. "
+            "Focus on the actions being performed, the sequence of steps, and any important visual details. "
+            "Be as specific and comprehensive as possible.",
+            query_type="description"
+        )
+    
     def _prepare_initial_prompt(self) -> str:
         """Prepare the initial prompt for documentation generation."""
         print("\n" + "="*50)
         print("PREPARING INITIAL PROMPT")
         print("="*50)
         
-        # Get initial description from VideoInterpreter
-        initial_description = self.video_interpreter.respond(
-            "Please provide a detailed step-by-step description of what is happening in this video. "
-            "Focus on the actions being performed, the sequence of steps, and any important visual details. "
-            "Be as specific and comprehensive as possible."
-        )
+        # Get initial description from VideoInterpreter, joining the background request if one was started
+        if self._initial_description is not None:
+            initial_description = self._initial_description.result()
+            self._initial_description = None
+        else:
+            initial_description = self._timed("initial_description", self._request_initial_description)
+        self._report_stage_timings()
         
         # Prepare the prompt
         initial_prompt = f"""
@@ -337,94 +427,105 @@ class VideoInstructor:
         print("-"*100)
         print("\nStarting the process...\n")
 
-        # Reset DocEvaluator memory and document version counter
-        self.doc_evaluator.reset_memory()
-        self.doc_version = 0
-        
-        # Prepare the initial prompt
-        initial_prompt = self._prepare_initial_prompt()
-        
-        # Initialize counters
-        iteration_count = 0
-        question_count = 0
-        current_documentation = None
-        current_documentation_path = None
-        is_satisfied = False
-        
-        # Start the documentation generation process
-        response = self.doc_generator.generate_documentation_with_description(initial_prompt)
-        structured_response = self._get_structured_response(response)
-        
-        while iteration_count < self.config.max_iterations and not is_satisfied:
-            iteration_count += 1
+        try:
+            # Reset DocEvaluator memory and document version counter
+            self.doc_evaluator.reset_memory()
+            self.doc_version = 0
             
-            if structured_response.type == ResponseType.QUESTION:
-                question_count += 1
-                question = structured_response.content
-                
-                print(f"\nQuestion from DocGenerator ({question_count}):")
-                print(question)
-                answer = self.video_interpreter.respond(question)
-                print(f"Answer from VideoInterpreter:")
-                print(answer)
-                
-                # Send the answer back to DocGenerator
-                response = self.doc_generator.refine_documentation(f"ANSWER: {answer}")
-                structured_response = self._get_structured_response(response)
+            # Prepare the initial prompt
+            initial_prompt = self._prepare_initial_prompt()
             
-            elif structured_response.type == ResponseType.DOCUMENTATION:
-                current_documentation = structured_response.content
-                
-                print("\n" + "="*50)
-                print(f"DOCUMENTATION VERSION {self.doc_version + 1}")
-                print("="*50)
-                print(current_documentation)
+            # Initialize counters
+            iteration_count = 0
+            question_count = 0
+            current_documentation = None
+            current_documentation_path = None
+            is_satisfied = False
+            
+            # Start the documentation generation process
+            response = self.doc_generator.generate_documentation_with_description(initial_prompt)
+            structured_response = self._get_structured_response(response)
+            
+            while iteration_count < self.config.max_iterations and not is_satisfied:
+                iteration_count += 1
                 
-                # Save the current version of the documentation
-                processed_documentation_path, raw_documentation_path, current_unavailable_screenshots = self._save_documentation(current_documentation)
-
-                # Let the DocEvaluator evaluate the documentation
-                is_approved, feedback = self._evaluate_documentation(raw_documentation_path, current_unavailable_screenshots)
+                if structured_response.type == ResponseType.QUESTION:
+                    question_count += 1
+                    question = structured_response.content
+                    
+                    print(f"\nQuestion from DocGenerator ({question_count}):")
+                    print(question)
+                    answer = self.video_interpreter.respond(question)
+                    print(f"Answer from VideoInterpreter:")
+                    print(answer)
+                    
+                    # Send the answer back to DocGenerator
+                    response = self.doc_generator.refine_documentation(f"ANSWER: {answer}")
+                    structured_response = self._get_structured_response(response)
                 
-                print(f"Evaluator's feedback: {feedback}")
-
-                # Check if we should escalate to user due to repeated rejections
-                if not is_approved and self.doc_evaluator.should_escalate_to_user():
+                elif structured_response.type == ResponseType.DOCUMENTATION:
+                    current_documentation = structured_response.content
+                    
                     print("\n" + "="*50)
-                    print("ESCALATING TO USER: DocEvaluator has rejected the documentation multiple times.")
+                    print(f"DOCUMENTATION VERSION {self.doc_version + 1}")
                     print("="*50)
-                    user_feedback, is_satisfied = self._get_user_feedback()
+                    print(current_documentation)
                     
-                    # Reset the rejection count after user intervention
-                    self.doc_evaluator.reset_rejection_count()
+                    # Save the current version of the documentation
+                    processed_documentation_path, raw_documentation_path, current_unavailable_screenshots = self._save_documentation(current_documentation)
+
+                    # Let the DocEvaluator evaluate the documentation
+                    is_approved, feedback = self._evaluate_documentation(raw_documentation_path, current_unavailable_screenshots)
                     
-                    if not is_satisfied and user_feedback:
-                        # Refine documentation based on user feedback
-                        response = self.doc_generator.refine_documentation(user_feedback)
-                        structured_response = self._get_structured_response(response)
-                    elif is_satisfied:
-                        # User is satisfied, break the loop
-                        break
-                
-                # If DocEvaluator approved or we're continuing after rejection
-                elif is_approved:
-                    # DocEvaluator approved, now get user feedback
-                    user_feedback, is_satisfied = self._get_user_feedback()
+                    print(f"Evaluator's feedback: {feedback}")
+
+                    # Check if we should escalate to user due to repeated rejections
+                    if not is_approved and self.doc_evaluator.should_escalate_to_user():
+                        print("\n" + "="*50)
+                        print("ESCALATING TO USER: DocEvaluator has rejected the documentation multiple times.")
+                        print("="*50)
+                        user_feedback, is_satisfied = self._get_user_feedback()
+                        
+                        # Reset the rejection count after user intervention
+                        self.doc_evaluator.reset_rejection_count()
+                        
+                        if not is_satisfied and user_feedback:
+                            # Refine documentation based on user feedback
+                            response = self.doc_generator.refine_documentation(user_feedback)
+                            structured_response = self._get_structured_response(response)
+                        elif is_satisfied:
+                            # User is satisfied, break the loop
+                            break
                     
-                    if not is_satisfied and user_feedback:
-                        # Refine documentation based on user feedback
-                        response = self.doc_generator.refine_documentation(user_feedback)
+                    # If DocEvaluator approved or we're continuing after rejection
+                    elif is_approved:
+                        # DocEvaluator approved, now get user feedback
+                        user_feedback, is_satisfied = self._get_user_feedback()
+                        
+                        if not is_satisfied and user_feedback:
+                            # Refine documentation based on user feedback
+                            response = self.doc_generator.refine_documentation(user_feedback)
+                            structured_response = self._get_structured_response(response)
+                        elif is_satisfied:
+                            break
+                    else:
+                        # DocEvaluator rejected, refine based on feedback
+                        response = self.doc_generator.refine_documentation(feedback)
                         structured_response = self._get_structured_response(response)
-                    elif is_satisfied:
-                        break
+                
                 else:
-                    # DocEvaluator rejected, refine based on feedback
-                    response = self.doc_generator.refine_documentation(feedback)
-                    structured_response = self._get_structured_response(response)
-            
-            else:
-                raise ValueError(f"Unknown response type: {structured_response.type}")
-        
+                    raise ValueError(f"Unknown response type: {structured_response.type}")
+        finally:
+            # Release the video decoders, worker processes and sweeper thread held by the ScreenshotAgent
+            self.screenshot_agent.close()
+
+        memory_stats = self.video_interpreter.memory.stats()
+        if memory_stats["tokens_saved"]:
+            print(
+                f"VideoInterpreter history: {memory_stats['tokens_sent']} tokens sent, "
+                f"{memory_stats['tokens_saved']} saved by summarizing {memory_stats['summarized_turns']} turns"
+            )
+
         if iteration_count >= self.config.max_iterations:
             print("\nReached maximum number of iterations without achieving satisfaction.")
         else: